@@ -1,21 +1,19 @@
 from math import sqrt, log10, floor
 import numpy as np
 
+from src.eqroot.horner import synthetic_division
+
 
 _DEFAULT_MAX_ITER = 500
 _DEFAULT_TOLER = 1e-4
 
 
 def briot_ruffini(poly, a):
-    quot = []
-    aux = 0
-    for coef in poly:
-        aux *= a
-        aux += coef
-        quot.append(aux)
-    remainder = quot[-1]
-    quot = quot[:-1]
-    return np.poly1d(quot), remainder
+    # divide poly por (x - a); veja src.eqroot.horner para muitos pontos.
+    coef = poly.coeffs if isinstance(poly, np.poly1d) else poly
+    quot, remainder = synthetic_division(coef, a)
+    # com a escalar, o resto é um escalar e não um array de dimensão 0.
+    return np.poly1d(quot), remainder[()]
 
 
 def _sign(x):
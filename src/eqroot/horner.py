@@ -0,0 +1,82 @@
+from math import factorial
+
+import numpy as np
+
+
+# Os polinômios são dados pelos coeficientes em ordem decrescente (como em
+# np.poly1d), no último eixo de coef. Com coef de formato B + (n + 1,), os
+# pontos x têm formato B + P: x[i] é avaliado no polinômio coef[i]. Com um
+# só polinômio (B = ()), x pode ter qualquer formato.
+
+
+def _coef_column(coef, j, x):
+    # coeficiente j de cada polinômio, pronto para operar com x.
+    batch = coef.shape[:-1]
+    if x.shape[:len(batch)] != batch:
+        raise ValueError(f'x must have shape {batch} + points, '
+                         f'not {x.shape}.')
+    return coef[..., j].reshape(batch + (1,) * (x.ndim - len(batch)))
+
+
+def _prepare(coef, x, exact=False):
+    # coeficientes e pontos no mesmo tipo. Inteiros viram float, a não ser
+    # com exact=True (só somas e produtos, sem perda).
+    coef, x = np.asarray(coef), np.asarray(x)
+    dtype = np.result_type(coef, x) if exact else \
+        np.result_type(coef, x, float)
+    return coef.astype(dtype, copy=False), x.astype(dtype, copy=False)
+
+
+def horner(coef, x, derivatives=0):
+    '''
+    Avalia os polinômios de coeficientes coef nos pontos x pelo método de
+    Horner, com operações de array sobre todos os pontos (e polinômios) de
+    uma vez. Com derivatives = k > 0, calcula na mesma passada também as k
+    primeiras derivadas e retorna um array de formato (k + 1,) + x.shape com
+    p(x), p'(x), ..., p⁽ᵏ⁾(x).
+
+    Uso:
+    >>> p, dp = horner([1, -5, 6], np.array([0., 2., 4.]), derivatives=1)
+    >>> p.tolist(), dp.tolist()
+    ([6.0, 0.0, 2.0], [-5.0, -1.0, 3.0])
+
+    Complexidade: O(n·(k + 1)) operações de array de tamanho x.size.
+    '''
+    coef, x = _prepare(coef, x)
+    n = coef.shape[-1] - 1
+    # values[k] acumula o k-ésimo coeficiente de Taylor, p⁽ᵏ⁾(x) / k!.
+    values = np.zeros((derivatives + 1,) + x.shape, dtype=x.dtype)
+    values[0] = _coef_column(coef, 0, x)
+    for j in range(1, n + 1):
+        for k in range(min(derivatives, j), 0, -1):
+            values[k] = values[k] * x + values[k - 1]
+        values[0] = values[0] * x + _coef_column(coef, j, x)
+    if not derivatives:
+        return values[0]
+    for k in range(2, derivatives + 1):
+        values[k] *= factorial(k)
+    return values
+
+
+def synthetic_division(coef, a):
+    '''
+    Divide os polinômios de coeficientes coef por (x - a) (algoritmo de
+    Briot-Ruffini) para todos os valores de a de uma vez. Retorna
+    (quociente, resto): o quociente tem formato a.shape + (n,), com os
+    coeficientes em ordem decrescente, e o resto, igual a p(a), tem o
+    formato de a. Coeficientes e a inteiros dão resultados inteiros.
+
+    Uso:
+    >>> q, r = synthetic_division([1, -5, 6], [2., 3., 1.])
+    >>> q.tolist(), r.tolist()
+    ([[1.0, -3.0], [1.0, -2.0], [1.0, -4.0]], [0.0, 0.0, 2.0])
+
+    Complexidade: O(n) operações de array de tamanho a.size.
+    '''
+    coef, a = _prepare(coef, a, exact=True)
+    n = coef.shape[-1] - 1
+    out = np.empty(a.shape + (n + 1,), dtype=a.dtype)
+    out[..., 0] = _coef_column(coef, 0, a)
+    for j in range(1, n + 1):
+        out[..., j] = out[..., j - 1] * a + _coef_column(coef, j, a)
+    return out[..., :-1], out[..., -1]
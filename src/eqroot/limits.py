@@ -50,8 +50,7 @@ class Limits:
         try:
             return -self._upper_positive_limit(coef)
         except ValueError as e:
-            e.message = self.coef + ' has no real negative roots.'
-            raise e
+            raise ValueError(self.coef, 'has no real negative roots.') from e
 
     def _upper_negative_limit(self, coef=None):
         if coef is None:
@@ -0,0 +1,142 @@
+import numpy as np
+
+from src.eqroot.horner import horner
+from src.eqroot.limits import Limits
+
+
+def _as_coef(poly):
+    # coeficientes em ordem decrescente (como em np.poly1d), um polinômio
+    # por linha.
+    if isinstance(poly, np.poly1d):
+        poly = poly.coeffs
+    coef = np.asarray(poly)
+    if coef.dtype.kind not in 'fc':
+        coef = coef.astype(float)
+    if coef.ndim == 1:
+        coef = np.trim_zeros(coef, 'f')
+    if not coef.shape[-1]:
+        raise ValueError('The zero polynomial has no roots.')
+    if (coef[..., 0] == 0).any():
+        raise ValueError('Leading coefficients must not be 0.')
+    return np.atleast_2d(coef)
+
+
+def _rounding_bound(coef, z):
+    # p(z) não é distinguível de 0 (o erro de arredondamento de Horner é da
+    # ordem de ε Σ|aᵢ||z|ⁱ) se |p(z)| for menor que essa cota.
+    p = horner(abs(coef), abs(z))
+    return np.finfo(float).eps * p
+
+
+def _root_bound(coef):
+    # todas as raízes têm |z| menor que a cota de Cauchy 1 + max |aᵢ / aₙ|
+    # e que a de Fujiwara 2 max |aₙ₋ᵢ / aₙ|^(1/i); usa a menor das duas.
+    ratios = abs(coef[:, 1:] / coef[:, :1])
+    cauchy = 1 + ratios.max(axis=1, initial=0)
+    i = np.arange(1, coef.shape[1])
+    fujiwara = 2 * (ratios ** (1 / i)).max(axis=1, initial=0)
+    return np.minimum(cauchy, fujiwara)
+
+
+def _limits_radius(coef):
+    # maior módulo entre os limites das raízes reais dados por Limits, ou
+    # nan se eles não existirem (raízes reais em 0 são ignoradas).
+    coef = np.trim_zeros(coef, 'b')
+    if np.iscomplexobj(coef) or len(coef) < 2:
+        return np.nan
+    limits = Limits(coef[::-1].astype(float))
+    bounds = []
+    for name in ('pos', 'neg'):
+        try:
+            with np.errstate(all='ignore'):
+                bounds += getattr(limits, name)
+        except (ValueError, ZeroDivisionError):
+            pass
+    bounds = np.abs(bounds)
+    bounds = bounds[np.isfinite(bounds)]
+    return bounds.max() if bounds.size else np.nan
+
+
+def initial_radius(coef):
+    '''
+    Raio do círculo em que aberth_ehrlich distribui as aproximações iniciais
+    das raízes de cada polinômio (coeficientes em ordem decrescente, um por
+    linha): o maior limite das raízes reais dado por Limits ou, se o
+    polinômio não tiver raízes reais (ou tiver coeficientes complexos), uma
+    cota do módulo de todas as raízes (Cauchy ou Fujiwara), que também é
+    usada se for menor.
+    '''
+    coef = _as_coef(coef)
+    radius = np.array([_limits_radius(c) for c in coef])
+    bound = _root_bound(coef)
+    return np.where(np.isnan(radius), bound, np.minimum(radius, bound))
+
+
+def aberth_ehrlich(poly, max_iter=100, toler=1e-14):
+    '''
+    Calcula todas as raízes de um polinômio pelo método de Aberth-Ehrlich,
+    que corrige todas as aproximações ao mesmo tempo:
+        zᵢ ← zᵢ - wᵢ,  wᵢ = r / (1 - r Σⱼ≠ᵢ 1 / (zᵢ - zⱼ)),  r = p(zᵢ) / p'(zᵢ),
+    com p e p' calculados por Horner para todas as raízes de uma vez. Cada
+    raiz para de ser corrigida quando |wᵢ| <= toler·|zᵢ| ou quando |p(zᵢ)|
+    fica no nível do erro de arredondamento de Horner (a partir daí as
+    correções são só ruído).
+
+    poly pode ser um np.poly1d, os coeficientes em ordem decrescente ou uma
+    matriz com os coeficientes de vários polinômios do mesmo grau, um por
+    linha, resolvidos juntos.
+
+    Retorna (raízes, err, iters), com uma linha por polinômio (ou vetores,
+    para um só polinômio). As raízes são complexas e vêm ordenadas pela
+    parte real; partes reais ou imaginárias menores que a precisão são
+    zeradas.
+
+    Uso:
+    >>> roots, err, iters = aberth_ehrlich(np.poly1d([1, 2, -13, -14, 24]))
+    >>> roots.real.round(10).tolist()
+    [-4.0, -2.0, 1.0, 3.0]
+
+    Complexidade: O(n²) por iteração para cada polinômio de grau n; a
+    convergência é cúbica para raízes simples.
+    '''
+    single = np.ndim(poly.coeffs if isinstance(poly, np.poly1d) else poly) == 1
+    coef = _as_coef(poly)
+    m, n = coef.shape[0], coef.shape[1] - 1
+    # pontos em um círculo, com um deslocamento angular que evita começar
+    # sobre o eixo real (simétrico para coeficientes reais).
+    angles = 2 * np.pi * np.arange(n) / n + 0.4
+    z = initial_radius(coef)[:, None] * np.exp(1j * angles)
+    err = np.full((m, n), np.inf)
+    iters = np.zeros((m, n), dtype=int)
+    active = np.ones((m, n), dtype=bool)
+    for i in range(max_iter):
+        if not active.any():
+            break
+        p, dp = horner(coef, z, derivatives=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff = z[:, :, None] - z[:, None, :]
+            diff[:, range(n), range(n)] = np.inf
+            ratio = p / dp
+            w = ratio / (1 - ratio * (1 / diff).sum(axis=2))
+        active &= abs(p) > _rounding_bound(coef, z)
+        w = np.where(active, w, 0)
+        z -= w
+        err = np.where(active, abs(w), err)
+        iters[active] = i + 1
+        active &= abs(w) > toler * abs(z)
+    noise = 10 * toler * np.maximum(abs(z), 1)
+    z.real[abs(z.real) <= noise] = 0
+    z.imag[abs(z.imag) <= noise] = 0
+    z = np.sort_complex(z)
+    if single:
+        return z[0], err[0], iters[0]
+    return z, err, iters
+
+
+def polyroots(poly, max_iter=100, toler=1e-14):
+    '''
+    Raízes de poly (veja aberth_ehrlich), reais se todas tiverem parte
+    imaginária nula.
+    '''
+    roots = aberth_ehrlich(poly, max_iter, toler)[0]
+    return roots.real if not roots.imag.any() else roots
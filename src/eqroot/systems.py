@@ -0,0 +1,218 @@
+import numpy as np
+
+from src.eqroot.core import _DEFAULT_MAX_ITER, _DEFAULT_TOLER
+from src.linalg.lu import LU
+from src.linalg.norms import norm_inf
+from src.linalg.sparse import CSR
+
+
+def _pattern(sparsity):
+    # padrão de esparsidade como um np.array 2d de bool.
+    if isinstance(sparsity, CSR):
+        sparsity = sparsity.toarray()
+    return np.asarray(sparsity) != 0
+
+
+def _sparse_pattern(sparsity):
+    # padrão de esparsidade como CSR, sem zeros guardados explicitamente.
+    if not isinstance(sparsity, CSR):
+        return CSR.from_dense(np.asarray(sparsity) != 0)
+    keep = sparsity.data != 0
+    return CSR.from_coo(sparsity.row_ids[keep], sparsity.indices[keep],
+                        np.ones(keep.sum()), sparsity.shape)
+
+
+def column_groups(sparsity):
+    '''
+    Agrupa as colunas de um jacobiano com o padrão de esparsidade dado
+    (np.array 2d ou CSR) de forma que colunas do mesmo grupo não tenham
+    elementos não nulos na mesma linha (Curtis, Powell e Reid). Cada grupo
+    pode então ser estimado com uma só avaliação da função. Retorna o grupo
+    de cada coluna.
+
+    A coloração é gulosa e trabalha direto sobre as linhas da CSR: as
+    colunas vizinhas da coluna j são as das linhas em que j aparece.
+
+    Uso:
+    >>> import numpy as np
+    >>> tridiagonal = np.eye(6) + np.eye(6, k=1) + np.eye(6, k=-1)
+    >>> column_groups(tridiagonal).tolist()
+    [0, 1, 2, 0, 1, 2]
+
+    Complexidade: O(nnz·r), onde r é o número médio de não nulos por linha
+    (mais O(mn) para converter um padrão denso).
+    '''
+    s = _sparse_pattern(sparsity)
+    m, n = s.shape
+    # transposta: as linhas em que cada coluna aparece.
+    t = CSR.from_coo(s.indices, s.row_ids, s.data, (n, m))
+    counts = np.diff(s.indptr)
+    colors = np.full(n, -1)
+    for j in range(n):
+        rows = t.indices[t.indptr[j]:t.indptr[j + 1]]
+        starts, lengths = s.indptr[rows], counts[rows]
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        neighbors = s.indices[np.arange(lengths.sum()) + offsets]
+        used = colors[neighbors]
+        taken = np.zeros(len(neighbors) + 1, dtype=bool)
+        taken[used[(used >= 0) & (used <= len(neighbors))]] = True
+        colors[j] = taken.argmin()
+    return colors
+
+
+def fd_jacobian(func, x, fx=None, sparsity=None, groups=None):
+    '''
+    Jacobiano de func em x por diferenças progressivas, com passo
+    √ε·max(|x_j|, 1) na coluna j. fx = func(x) pode ser passado para evitar
+    uma avaliação.
+
+    Se o padrão de esparsidade for dado, as colunas são perturbadas em
+    grupos (veja column_groups), com uma avaliação de func por grupo em vez
+    de uma por coluna; groups pode ser passado para não recalculá-los.
+
+    Retorna (jacobiano, número de avaliações de func).
+    '''
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    if fx is None:
+        fx = np.asarray(func(x), dtype=float)
+    h = np.sqrt(np.finfo(float).eps) * np.maximum(abs(x), 1)
+    if sparsity is None:
+        pattern, groups = None, np.arange(n)
+    else:
+        pattern = _pattern(sparsity)
+        if groups is None:
+            groups = column_groups(pattern)
+    jac = np.zeros((fx.size, n))
+    for cols in [np.flatnonzero(groups == g) for g in np.unique(groups)]:
+        dx = np.zeros(n)
+        dx[cols] = h[cols]
+        df = np.asarray(func(x + dx), dtype=float) - fx
+        block = df[:, None] / h[cols]
+        jac[:, cols] = block if pattern is None else \
+            np.where(pattern[:, cols], block, 0)
+    return jac, len(np.unique(groups))
+
+
+class NewtonSystem:
+    '''
+    Método de Newton-Raphson para sistemas não lineares F(x) = 0, com F de
+    Rⁿ em Rⁿ. Cada passo resolve J(x) Δx = -F(x) com os fatores de uma LU
+    do jacobiano.
+
+    Parâmetros:
+    func: F(x), que recebe e retorna np.array 1d.
+    jac: J(x), que retorna np.array 2d (padrão None)
+        Se None, o jacobiano é estimado por diferenças finitas (veja
+        fd_jacobian), em grupos de colunas se sparsity for dado.
+    refactor_every: int (padrão 1)
+        O jacobiano é recalculado e refatorado a cada refactor_every passos
+        (1 é o Newton completo; k > 1 é o Newton com jacobiano congelado,
+        em que os outros passos reaproveitam os fatores e custam O(n²)). Ele
+        também é refatorado quando |F| não diminui em um passo.
+
+    O método para quando ||Δx|| e ||F(x)|| (norma infinito) ficam menores
+    que toler. Depois de solve, iter guarda o número de passos, err o
+    último ||Δx||, evaluations as avaliações de func (inclusive as das
+    diferenças finitas) e factorizations o número de LUs calculadas.
+
+    Uso:
+    >>> import numpy as np
+    >>> def F(x): return np.array([x[0]**2 + x[1]**2 - 4, x[0] - x[1]])
+    >>> x = NewtonSystem(F, toler=1e-12).solve([1., 2.])
+    >>> (x**2).round(10).tolist()
+    [2.0, 2.0]
+
+    Complexidade: O(n³) por fatoração e O(n²) por passo.
+    '''
+
+    def __init__(self, func, jac=None, sparsity=None, refactor_every=1,
+                 debug=False, max_iter=_DEFAULT_MAX_ITER,
+                 toler=_DEFAULT_TOLER):
+        self.func = func
+        self.jac = jac
+        self.sparsity = sparsity
+        self.groups = None if sparsity is None else column_groups(sparsity)
+        self.refactor_every = refactor_every
+        self.debug = debug
+        self.max_iter = max_iter
+        self.toler = toler
+
+    def _debug(self):
+        if self.debug:
+            print(self.iter, self.err, norm_inf(self.fx), sep='\t')
+
+    def _eval(self, x):
+        self.evaluations += 1
+        return np.asarray(self.func(x), dtype=float)
+
+    def _factor(self):
+        if self.jac is not None:
+            jac = np.asarray(self.jac(self.x), dtype=float)
+        else:
+            jac, count = fd_jacobian(self.func, self.x, self.fx,
+                                     self.sparsity, self.groups)
+            self.evaluations += count
+        self.lu = LU(jac)
+        self.factorizations += 1
+        self._age = 0
+
+    def _needs_factor(self, improved):
+        return self.lu is None or not improved or \
+            (self.refactor_every and self._age >= self.refactor_every)
+
+    def _update(self, dx, df):
+        # Newton não atualiza os fatores entre as fatorações.
+        pass
+
+    def solve(self, x0):
+        self.x = np.array(x0, dtype=float)
+        self.evaluations = self.factorizations = 0
+        self.fx = self._eval(self.x)
+        self.lu = None
+        self.err = np.inf
+        self.iter = 0
+        improved = True
+        while self.iter < self.max_iter:
+            if self._needs_factor(improved):
+                self._factor()
+            dx = self.lu.solve(-self.fx)
+            self.x += dx
+            fx = self._eval(self.x)
+            improved = norm_inf(fx) < norm_inf(self.fx)
+            self._update(dx, fx - self.fx)
+            self.fx = fx
+            self.err = norm_inf(dx)
+            self._age += 1
+            self.iter += 1
+            self._debug()
+            if self.err < self.toler and norm_inf(self.fx) < self.toler:
+                break
+        return self.x
+
+
+class Broyden(NewtonSystem):
+    '''
+    Método de Broyden ("bom" Broyden): quase-Newton em que, depois de cada
+    passo, a aproximação do jacobiano recebe a correção de posto um
+        J ← J + (ΔF - J Δx) Δxᵀ / (ΔxᵀΔx),
+    aplicada diretamente aos fatores LU (LU.update, O(n²)) em vez de
+    refatorar. O jacobiano só é recalculado no início, quando |F| não
+    diminui, quando a atualização encontra um pivô nulo ou, se
+    refactor_every for dado, a cada refactor_every passos.
+
+    Parâmetros: os de NewtonSystem, com refactor_every padrão None.
+    '''
+
+    def __init__(self, func, jac=None, sparsity=None, refactor_every=None,
+                 *args, **kwargs):
+        super().__init__(func, jac, sparsity, refactor_every, *args, **kwargs)
+
+    def _update(self, dx, df):
+        if not dx.any():
+            return
+        u = df - self.lu.a @ dx
+        try:
+            self.lu.update(u / (dx @ dx), dx)
+        except ZeroDivisionError:
+            self.lu = None
@@ -0,0 +1,288 @@
+import numpy as np
+
+from src.eqroot.core import _DEFAULT_MAX_ITER, _DEFAULT_TOLER
+
+
+# Versões vetorizadas dos métodos de src.eqroot.core: cada elemento de a e b
+# define uma equação independente ("pista"), e todas avançam juntas com
+# operações de array. func deve ser vetorizada: func(x, *args) recebe um
+# array x e os args correspondentes (só das pistas ainda ativas) e retorna
+# um array do mesmo tamanho. As pistas que convergem são retiradas, então
+# func é chamada com cada vez menos elementos.
+#
+# Todas retornam (x, err, iters): as raízes, o erro final e o número de
+# iterações de cada pista, com o formato de a, b e args combinados.
+
+
+def _setup(func, a, b, args):
+    # achata a, b e args em vetores do mesmo tamanho e avalia os extremos.
+    shape = np.broadcast_shapes(np.shape(a), np.shape(b),
+                                *(np.shape(p) for p in args))
+    a = np.broadcast_to(np.asarray(a, dtype=float), shape).ravel().copy()
+    b = np.broadcast_to(np.asarray(b, dtype=float), shape).ravel().copy()
+    args = [np.broadcast_to(p, shape).ravel() for p in args]
+    Fa, Fb = func(a, *args), func(b, *args)
+    Fa, Fb = np.array(Fa, dtype=float), np.array(Fb, dtype=float)
+    if (Fa * Fb > 0).any():
+        raise ValueError('f(a)*f(b) must be less than 0.')
+    return shape, a, b, Fa, Fb, args
+
+
+def _call(func, x, args, lanes):
+    return np.asarray(func(x, *(p[lanes] for p in args)), dtype=float)
+
+
+def _orient(a, b, Fa, Fb):
+    # troca os extremos das pistas em que Fa > 0, para que Fa <= 0 <= Fb.
+    flip = Fa > 0
+    a[flip], b[flip] = b[flip], a[flip]
+    Fa[flip], Fb[flip] = Fb[flip], Fa[flip]
+
+
+def _result(shape, x, err, iters):
+    return x.reshape(shape), err.reshape(shape), iters.reshape(shape)
+
+
+def bissection(func, a, b, args=(), max_iter=_DEFAULT_MAX_ITER,
+               toler=_DEFAULT_TOLER):
+    '''
+    Bisseção em cada par (a, b). err é a metade do intervalo final.
+
+    Uso:
+    >>> import numpy as np
+    >>> x, err, iters = bissection(lambda x, c: x**2 - c, 0, 10,
+    ...                            args=(np.array([4., 9.]),), toler=1e-8)
+    >>> x.round(6).tolist(), iters.tolist()
+    ([2.0, 3.0], [30, 30])
+
+    Complexidade: O(log2(|b - a| / toler)) iterações de O(pistas ativas).
+    '''
+    shape, a, b, Fa, Fb, args = _setup(func, a, b, args)
+    _orient(a, b, Fa, Fb)
+    x = (a + b) / 2
+    err = abs(b - a) / 2
+    iters = np.zeros(x.size, dtype=int)
+    active = np.arange(x.size)
+    for i in range(max_iter):
+        if not active.size:
+            break
+        A, B = a[active], b[active]
+        X, E = (A + B) / 2, abs(B - A) / 2
+        Fx = _call(func, X, args, active)
+        x[active], err[active], iters[active] = X, E, i + 1
+        neg = Fx < 0
+        a[active[neg]] = X[neg]
+        b[active[~neg]] = X[~neg]
+        active = active[(E >= toler) & (Fx != 0)]
+    return _result(shape, x, err, iters)
+
+
+def _false_position(func, a, b, args, max_iter, toler, pegasus):
+    shape, a, b, Fa, Fb, args = _setup(func, a, b, args)
+    if not pegasus:
+        _orient(a, b, Fa, Fb)
+    x = b.copy()
+    err = abs(b - a)
+    iters = np.zeros(x.size, dtype=int)
+    active = np.arange(x.size)
+    for i in range(max_iter):
+        if not active.size:
+            break
+        A, B, FA, FB = a[active], b[active], Fa[active], Fb[active]
+        X = B - FB * (B - A) / (FB - FA)
+        delta = X - x[active]
+        Fx = _call(func, X, args, active)
+        x[active], err[active], iters[active] = X, abs(delta), i + 1
+        if pegasus:
+            # se o sinal não mudou, o extremo antigo tem seu valor reduzido
+            # (em vez de ficar preso, como na falsa posição).
+            changed = Fx * FB < 0
+            a[active] = np.where(changed, B, A)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                Fa[active] = np.where(changed, FB, FA * FB / (FB + Fx))
+            b[active], Fb[active] = X, Fx
+        else:
+            neg = Fx < 0
+            a[active[neg]], Fa[active[neg]] = X[neg], Fx[neg]
+            b[active[~neg]], Fb[active[~neg]] = X[~neg], Fx[~neg]
+        done = (abs(delta) < toler) & (abs(Fx) < toler) | (Fx == 0)
+        active = active[~done]
+    return _result(shape, x, err, iters)
+
+
+def regula_falsi(func, a, b, args=(), max_iter=_DEFAULT_MAX_ITER,
+                 toler=_DEFAULT_TOLER):
+    '''
+    Método da falsa posição em cada par (a, b). Uma pista para quando o
+    passo |Δx| (retornado em err) e |f(x)| ficam menores que toler.
+
+    Complexidade: O(pistas ativas) por iteração; convergência linear.
+    '''
+    return _false_position(func, a, b, args, max_iter, toler, pegasus=False)
+
+
+def pegasus(func, a, b, args=(), max_iter=_DEFAULT_MAX_ITER,
+            toler=_DEFAULT_TOLER):
+    '''
+    Método Pégaso em cada par (a, b), com o critério de parada de
+    regula_falsi.
+
+    Uso:
+    >>> import numpy as np
+    >>> x, err, iters = pegasus(lambda x: np.cos(x) - x, [0., 0.], [1., 2.],
+    ...                         toler=1e-12)
+    >>> x.round(10).tolist()
+    [0.7390851332, 0.7390851332]
+
+    Complexidade: O(pistas ativas) por iteração; convergência superlinear.
+    '''
+    return _false_position(func, a, b, args, max_iter, toler, pegasus=True)
+
+
+def wijngaarden_dekker_brent(func, a, b, args=(), max_iter=_DEFAULT_MAX_ITER,
+                             toler=_DEFAULT_TOLER):
+    '''
+    Método de van Wijngaarden-Dekker-Brent em cada par (a, b): interpolação
+    quadrática inversa ou linear quando ela reduz o intervalo o bastante, e
+    bisseção caso contrário, escolhidas pista a pista. err é a metade do
+    intervalo final, que fica abaixo de toler / 2 + 2ε|x|.
+
+    Complexidade: O(pistas ativas) por iteração; convergência superlinear,
+    nunca pior que a da bisseção.
+    '''
+    shape, a, b, Fa, Fb, args = _setup(func, a, b, args)
+    c, Fc = b.copy(), Fb.copy()
+    d = b - a
+    e = d.copy()
+    err = abs(d) / 2
+    iters = np.zeros(b.size, dtype=int)
+    active = np.arange(b.size)
+    eps = np.finfo(float).eps
+    for i in range(max_iter + 1):
+        if not active.size:
+            break
+        s = active
+        A, B, C, FA, FB, FC = a[s], b[s], c[s], Fa[s], Fb[s], Fc[s]
+        D, E = d[s], e[s]
+        # mantém a raiz entre B e C, com B o melhor extremo.
+        same = FB * FC > 0
+        C, FC = np.where(same, A, C), np.where(same, FA, FC)
+        D, E = np.where(same, B - A, D), np.where(same, B - A, E)
+        swap = abs(FC) < abs(FB)
+        A, FA = np.where(swap, B, A), np.where(swap, FB, FA)
+        B, C = np.where(swap, C, B), np.where(swap, A, C)
+        FB, FC = np.where(swap, FC, FB), np.where(swap, FA, FC)
+        tol = 2 * eps * abs(B) + toler / 2
+        z = (C - B) / 2
+        b[s], Fb[s], c[s], Fc[s] = B, FB, C, FC
+        err[s], iters[s] = abs(z), i
+        done = (abs(z) <= tol) | (FB == 0)
+        if done.all() or i == max_iter:
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            S = FB / FA
+            linear = A == C
+            Q, R = FA / FC, FB / FC
+            P = np.where(linear, 2 * z * S,
+                         S * (2 * z * Q * (Q - R) - (B - A) * (R - 1)))
+            Q = np.where(linear, 1 - S, (Q - 1) * (R - 1) * (S - 1))
+            Q = np.where(P > 0, -Q, Q)
+            P = abs(P)
+            interp = (abs(E) >= tol) & (abs(FA) > abs(FB)) & \
+                (2 * P < np.minimum(3 * z * Q - abs(tol * Q), abs(E * Q)))
+            E = np.where(interp, D, z)
+            D = np.where(interp, P / Q, z)
+        A, FA = B, FB
+        B = B + np.where(abs(D) > tol, D, np.copysign(tol, z))
+        keep = ~done
+        s = s[keep]
+        a[s], Fa[s], d[s], e[s] = A[keep], FA[keep], D[keep], E[keep]
+        b[s] = B[keep]
+        Fb[s] = _call(func, b[s], args, s)
+        active = s
+    return _result(shape, b, err, iters)
+
+
+def _call_fused(f_and_df, x, args, lanes):
+    F, DF = f_and_df(x, *(p[lanes] for p in args))
+    return np.asarray(F, dtype=float), np.asarray(DF, dtype=float)
+
+
+def schroder(f_and_df, x0, m, args=(), damping=1., line_search=False,
+             max_halvings=10, max_iter=_DEFAULT_MAX_ITER, toler=_DEFAULT_TOLER):
+    '''
+    Método de Schröder (Newton para raízes de multiplicidade m) em cada
+    elemento de x0. f_and_df(x, *args) retorna (f(x), f'(x)) de uma só vez,
+    para que as subexpressões comuns às duas sejam calculadas uma vez.
+
+    Parâmetros:
+    damping: float ou array (padrão 1.)
+        Fração do passo -m f/f' dada em cada pista.
+    line_search: bool (padrão False)
+        Se True, o passo de uma pista é dividido por 2 (até max_halvings
+        vezes) enquanto não reduzir |f|. Só as pistas rejeitadas são
+        avaliadas de novo.
+
+    Uma pista para quando |Δx| (retornado em err) e |f(x)| ficam menores
+    que toler. Pistas em que f'(x) = 0 param com err = inf.
+
+    Complexidade: uma chamada de f_and_df por iteração (mais as da busca
+    linear) sobre as pistas ativas.
+    '''
+    shape = np.broadcast_shapes(np.shape(x0), np.shape(damping),
+                                *(np.shape(p) for p in args))
+    x = np.broadcast_to(np.asarray(x0, dtype=float), shape).ravel().copy()
+    # fator do passo -m·damping: escalar, ou um valor por pista.
+    scale = -m * np.asarray(damping, dtype=float)
+    if scale.ndim:
+        scale = np.broadcast_to(scale, shape).ravel()
+    args = [np.broadcast_to(p, shape).ravel() for p in args]
+    err = np.full(x.size, np.inf)
+    iters = np.zeros(x.size, dtype=int)
+    active = np.arange(x.size)
+    F, DF = _call_fused(f_and_df, x, args, active)
+    for i in range(max_iter):
+        flat = DF == 0
+        if flat.any():
+            err[active[flat]] = np.inf
+            keep = ~flat
+            active, F, DF = active[keep], F[keep], DF[keep]
+        if not active.size:
+            break
+        x0 = x[active]
+        step = (scale[active] if scale.ndim else scale) * F / DF
+        X = x0 + step
+        FX, DFX = _call_fused(f_and_df, X, args, active)
+        if line_search:
+            bad = ~(abs(FX) < abs(F))
+            for _ in range(max_halvings):
+                if not bad.any():
+                    break
+                step[bad] /= 2
+                X[bad] = x0[bad] + step[bad]
+                FX[bad], DFX[bad] = _call_fused(f_and_df, X[bad], args,
+                                                active[bad])
+                bad[bad] = ~(abs(FX[bad]) < abs(F[bad]))
+        x[active], err[active], iters[active] = X, abs(step), i + 1
+        keep = ~((abs(step) < toler) & (abs(FX) < toler))
+        if keep.all():
+            F, DF = FX, DFX
+        else:
+            active, F, DF = active[keep], FX[keep], DFX[keep]
+    return _result(shape, x, err, iters)
+
+
+def newton(f_and_df, x0, args=(), damping=1., line_search=False,
+           max_halvings=10, max_iter=_DEFAULT_MAX_ITER, toler=_DEFAULT_TOLER):
+    '''
+    Método de Newton em cada elemento de x0 (veja schroder).
+
+    Uso:
+    >>> import numpy as np
+    >>> x, err, iters = newton(lambda x, c: (x**2 - c, 2 * x), 1.,
+    ...                        args=(np.array([4., 9.]),), toler=1e-12)
+    >>> x.tolist()
+    [2.0, 3.0]
+    '''
+    return schroder(f_and_df, x0, 1, args, damping, line_search, max_halvings,
+                    max_iter, toler)
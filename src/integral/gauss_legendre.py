@@ -3,7 +3,8 @@ from math import sqrt
 import numpy as np
 
 from src.integral.newton_cotes import NewtonCotes
-from src.eqroot.core import newton, briot_ruffini
+from src.eqroot.horner import horner
+from src.eqroot.polyroots import aberth_ehrlich
 
 
 def legendre_poly():
@@ -21,23 +22,13 @@ def legendre_poly():
 
 
 def legendre_roots():
-    for n, poly in enumerate(legendre_poly()):
-        A = []
-        roots = []
-        p = poly
-        if n % 2 == 1:
-            roots.append(0)
-            p, zero = briot_ruffini(p, 0)
-            A.append(2 / (poly.deriv()(0)**2))
-        for i in range(n // 2):
-            r, err = newton(p, p.deriv(), 0.1, toler=1e-14)
-            roots.append(r)
-            roots.append(-r)
-            p, zero = briot_ruffini(p, r)
-            p, zero = briot_ruffini(p, -r)
-            A.append(2 / ((1 - r**2) * poly.deriv()(r)**2))
-            A.append(2 / ((1 - r**2) * poly.deriv()(r)**2))
-        yield roots, A
+    # as raízes de Pn são reais e estão em (-1, 1); todas são calculadas
+    # juntas, sem deflação, e os pesos vêm da derivada de Pn.
+    for poly in legendre_poly():
+        roots = aberth_ehrlich(poly)[0].real
+        dp = horner(poly.coeffs, roots, derivatives=1)[1]
+        A = 2 / ((1 - roots**2) * dp**2)
+        yield roots.tolist(), A.tolist()
 
 
 coefs = {}
@@ -1,6 +1,6 @@
 import numpy as np
 
-from src.linalg.gauss_decomp import gauss
+from src.linalg.banded import Banded, solve_banded
 from src.interpolation.core import CoreInterp
 
 
@@ -16,36 +16,30 @@ class NaturalSpline(CoreInterp):
 
     def _setUp(self):
         self.n = len(self.x)
-        self.dely = np.zeros(self.n - 1)
-        self.h = np.zeros(self.n - 1)
-        for i in range(self.n - 1):
-            self.h[i] = self.x[i+1] - self.x[i]
-            self.dely[i] = (self.y[i+1] - self.y[i]) / self.h[i]
+        self.h = np.diff(self.x).astype(float)
+        self.dely = np.diff(self.y) / self.h
         self.s2 = np.zeros(self.n)
 
-    def _set_arbitrary_s2(self):
-        self.s2[0] = 0
-        self.s2[-1] = 0
-
     def _build_matrix(self):
-        m = np.zeros((self.n - 2, self.n))
-        for i in range(self.n - 2):
-            m[i, i] = self.h[i]
-            m[i, i+1] = 2 * (self.h[i] + self.h[i+1])
-            m[i, i+2] = self.h[i+1]
-        return m
+        # sistema tridiagonal n x n das segundas derivadas. As linhas das
+        # pontas impõem s2[0] = s2[-1] = 0.
+        diag = np.ones(self.n)
+        diag[1:-1] = 2 * (self.h[:-1] + self.h[1:])
+        sub = np.zeros(self.n - 1)
+        sub[:-1] = self.h[:-1]
+        sup = np.zeros(self.n - 1)
+        sup[1:] = self.h[1:]
+        return Banded.from_diagonals(sub, diag, sup)
 
     def _build_b(self):
-        b = np.zeros(self.n - 2)
-        for i in range(self.n - 2):
-            b[i] = self.dely[i+1] - self.dely[i]
+        b = np.zeros(self.n)
+        b[1:-1] = np.diff(self.dely)
         return b
 
     def _solve_system(self):
         m = self._build_matrix()
         b = self._build_b()
-        self.s2[1:-1], det = gauss(m[:, 1:-1], 6 * b, pivoting=False)
-        self._set_arbitrary_s2()
+        self.s2 = solve_banded(m, 6 * b)
 
     def _calculate_coeficients(self):
         self.splines = []
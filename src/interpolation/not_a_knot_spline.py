@@ -1,20 +1,23 @@
+import numpy as np
+
 from src.interpolation.natural_spline import NaturalSpline
+from src.linalg.banded import Banded
 
 
 class NotAKnotSpline(NaturalSpline):
-    def _set_arbitrary_s2(self):
-        n = self.n
-        self.s2[0] = ((self.h[0] + self.h[1]) * self.s2[1] -
-                      self.h[0] * self.s2[2]) / self.h[1]
-        self.s2[-1] = ((self.h[-1] + self.h[-2]) * self.s2[-1] -
-                       self.h[-1] * self.s2[-2]) / self.h[-2]
+    def _setUp(self):
+        if len(self.x) < 4:
+            raise ValueError('Not-a-knot splines need at least 4 points.')
+        super()._setUp()
 
     def _build_matrix(self):
+        # as linhas das pontas impõem a continuidade da terceira derivada em
+        # x[1] e x[-2] e têm três elementos cada, formando uma faixa com duas
+        # diagonais de cada lado da principal (faixa com borda).
+        h = self.h
         m = super()._build_matrix()
-        m[0, 0] = (self.h[0] + self.h[1]) * \
-            (self.h[0] + 2 * self.h[1]) / self.h[1]
-        m[0, 1] = (self.h[1]**2 - self.h[0]**2) / self.h[1]
-        m[-1, -2] = (self.h[-2]**2 - self.h[-1]**2) / self.h[-2]
-        m[-1, -1] = (self.h[-1] + self.h[-2]) * \
-            (self.h[-1] + 2 * self.h[-2]) / self.h[-2]
-        return m
+        ab = np.zeros((5, self.n))
+        ab[1:4] = m.ab
+        ab[2, 0], ab[1, 1], ab[0, 2] = h[1], -(h[0] + h[1]), h[0]
+        ab[4, -3], ab[3, -2], ab[2, -1] = h[-1], -(h[-2] + h[-1]), h[-2]
+        return Banded(ab, 2, 2)
@@ -5,8 +5,14 @@ from src.linalg.lu import LU
 
 
 class Vandermonde:
-    def __init__(self, x, y, rank=1):
+    def __init__(self, x, y, rank=1, cache=None):
+        '''
+        cache: FactorizationCache (padrão None)
+            Se passado, as decomposições LU das submatrizes de Vandermonde
+            são reaproveitadas entre as chamadas.
+        '''
         self.x, self.y = np.array(x), np.array(y)
+        self.cache = cache
         self.rank = rank
         self._sort()
         self.validate_points()
@@ -40,7 +46,8 @@ class Vandermonde:
                 'Please pass x and y as separate one-dimensional arrays.')
 
     def coefs(self, slc):
-        lu = LU(self.V[slc, :self.rank + 1])
+        V = self.V[slc, :self.rank + 1]
+        lu = LU(V) if self.cache is None else self.cache.get(LU, V)
         out = lu.solve(self.y[slc])
         out = list(reversed(out))
         out = np.array(out)
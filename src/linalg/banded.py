@@ -0,0 +1,183 @@
+import numpy as np
+
+from src.linalg.core import Decomposition
+from src.linalg.norms import inv_norm_estimate
+from src.typing import Array1D, Array2D
+
+
+class Banded:
+    '''
+    Matriz em faixa com kl diagonais abaixo e ku diagonais acima da principal,
+    guardada no formato do LAPACK: um array ab de formato (kl + ku + 1, n) com
+
+        ab[ku + i - j, j] = a[i, j]
+
+    Ocupa O(n(kl + ku)) de memória em vez de O(n²).
+
+    Uso:
+    >>> m = Banded.from_diagonals([1, 1], [4, 4, 4], [2, 2])
+    >>> m.toarray()
+    array([[4., 2., 0.],
+           [1., 4., 2.],
+           [0., 1., 4.]])
+    '''
+
+    def __init__(self, ab, kl, ku):
+        self.ab = np.asarray(ab, dtype=float)
+        self.kl, self.ku = kl, ku
+        if self.ab.ndim != 2 or self.ab.shape[0] != kl + ku + 1:
+            raise ValueError('ab must have kl + ku + 1 rows.')
+        n = self.ab.shape[1]
+        self.shape = (n, n)
+
+    @classmethod
+    def from_diagonals(cls, sub: Array1D, diag: Array1D, sup: Array1D):
+        '''Monta uma matriz tridiagonal (kl = ku = 1).'''
+        n = len(diag)
+        ab = np.zeros((3, n))
+        ab[0, 1:] = sup
+        ab[1] = diag
+        ab[2, :-1] = sub
+        return cls(ab, 1, 1)
+
+    @classmethod
+    def from_dense(cls, a: Array2D, kl, ku):
+        a = np.asarray(a)
+        n = a.shape[0]
+        ab = np.zeros((kl + ku + 1, n))
+        for k in range(-kl, ku + 1):
+            ab[ku - k, max(k, 0):n + min(k, 0)] = a.diagonal(k)
+        return cls(ab, kl, ku)
+
+    def diagonal(self, k=0):
+        '''Retorna a k-ésima diagonal (k > 0 acima, k < 0 abaixo).'''
+        n = self.shape[0]
+        return self.ab[self.ku - k, max(k, 0):n + min(k, 0)]
+
+    def __matmul__(self, x):
+        x = np.asarray(x)
+        n = self.shape[0]
+        out = np.zeros(x.shape, dtype=np.result_type(self.ab, x))
+        for k in range(-self.kl, self.ku + 1):
+            d = self.diagonal(k).reshape((-1,) + (1,) * (x.ndim - 1))
+            if k >= 0:
+                out[:n - k] += d * x[k:]
+            else:
+                out[-k:] += d * x[:n + k]
+        return out
+
+    def toarray(self):
+        n = self.shape[0]
+        out = np.zeros((n, n))
+        for k in range(-self.kl, self.ku + 1):
+            idx = np.arange(max(-k, 0), n + min(-k, 0))
+            out[idx, idx + k] = self.diagonal(k)
+        return out
+
+
+def thomas(sub: Array1D, diag: Array1D, sup: Array1D, b: Array1D):
+    '''
+    Resolve um sistema tridiagonal pelo algoritmo de Thomas (eliminação de
+    Gauss sem pivotação restrita às três diagonais).
+    sub: diagonal abaixo da principal (n - 1 elementos)
+    diag: diagonal principal (n elementos)
+    sup: diagonal acima da principal (n - 1 elementos)
+    b: vetor de coeficientes independentes, ou matriz n x k
+
+    Complexidade: O(n)
+    '''
+    n = len(diag)
+    c = np.zeros(n)
+    x = np.array(b, dtype=float)
+    pivot = diag[0]
+    if pivot == 0:
+        raise ZeroDivisionError('0 as a pivot found in tridiagonal system.')
+    x[0] /= pivot
+    for i in range(1, n):
+        c[i - 1] = sup[i - 1] / pivot
+        pivot = diag[i] - sub[i - 1] * c[i - 1]
+        if pivot == 0:
+            raise ZeroDivisionError('0 as a pivot found in tridiagonal system.')
+        x[i] = (x[i] - sub[i - 1] * x[i - 1]) / pivot
+    for i in range(n - 2, -1, -1):
+        x[i] -= c[i] * x[i + 1]
+    return x
+
+
+class BandedLU(Decomposition):
+    '''
+    Decomposição LU sem pivotação de uma matriz em faixa, feita dentro do
+    próprio formato de faixa (L e U não saem da faixa original).
+
+    Complexidade: O(n·kl·ku) para decompor e O(n(kl + ku)) para resolver.
+    '''
+
+    def __init__(self, a: Banded):
+        self.a = a
+        self.n = a.shape[0]
+        self._execute()
+
+    def _execute(self):
+        kl, ku = self.a.kl, self.a.ku
+        ab = self.a.ab.copy()
+        I = np.arange(1, kl + 1)[:, None]
+        J = np.arange(1, ku + 1)[None, :]
+        for k in range(self.n):
+            pivot = ab[ku, k]
+            if pivot == 0:
+                raise ZeroDivisionError(
+                    '0 as a pivot found in banded system.')
+            m, u = min(kl, self.n - 1 - k), min(ku, self.n - 1 - k)
+            ab[ku + 1:ku + m + 1, k] /= pivot
+            if m and u:
+                rows = ku + I[:m] - J[:, :u]
+                cols = k + J[:, :u]
+                ab[rows, cols] -= np.outer(ab[ku + 1:ku + m + 1, k],
+                                           ab[ku - J[0, :u], k + J[0, :u]])
+        self.ab = ab
+
+    @property
+    def det(self):
+        if not hasattr(self, '_det'):
+            self._det = self.ab[self.a.ku].prod()
+        return self._det
+
+    def solve(self, b):
+        kl, ku = self.a.kl, self.a.ku
+        x = np.array(b, dtype=float)
+        for k in range(self.n - 1):
+            m = min(kl, self.n - 1 - k)
+            x[k + 1:k + m + 1] -= np.multiply.outer(
+                self.ab[ku + 1:ku + m + 1, k], x[k])
+        for k in range(self.n - 1, -1, -1):
+            x[k] /= self.ab[ku, k]
+            u = min(ku, k)
+            x[k - u:k] -= np.multiply.outer(self.ab[ku - u:ku, k], x[k])
+        return x
+
+    def solve_transposed(self, b):
+        # Aᵀ = UᵀLᵀ: Uᵀ é triangular inferior com a linha k de Uᵀ na coluna
+        # k de ab, e Lᵀ é triangular superior com diagonal unitária.
+        kl, ku = self.a.kl, self.a.ku
+        x = np.array(b, dtype=float)
+        for k in range(self.n):
+            u = min(ku, k)
+            x[k] -= self.ab[ku - u:ku, k] @ x[k - u:k]
+            x[k] /= self.ab[ku, k]
+        for k in range(self.n - 2, -1, -1):
+            m = min(kl, self.n - 1 - k)
+            x[k] -= self.ab[ku + 1:ku + m + 1, k] @ x[k + 1:k + m + 1]
+        return x
+
+    def cond(self, max_iter: int = 5):
+        # a coluna j de A é a coluna j de ab, então a norma não precisa da
+        # matriz densa.
+        return abs(self.a.ab).sum(axis=0).max() * \
+            inv_norm_estimate(self, max_iter)
+
+
+def solve_banded(a: Banded, b):
+    '''Resolve ax = b, usando o algoritmo de Thomas se a for tridiagonal.'''
+    if a.kl == a.ku == 1:
+        return thomas(a.diagonal(-1), a.diagonal(), a.diagonal(1), b)
+    return BandedLU(a).solve(b)
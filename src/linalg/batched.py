@@ -0,0 +1,160 @@
+import numpy as np
+
+
+def _as_batch(b, batch, n):
+    # devolve b como (batch, n, k) e se era um lote de vetores.
+    b = np.array(b, dtype=float)
+    if b.ndim not in (2, 3) or b.shape[:2] != (batch, n):
+        raise ValueError(f'b must have shape ({batch}, {n}) or '
+                         f'({batch}, {n}, k), got {b.shape}.')
+    if b.ndim == 2:
+        return b[:, :, None], True
+    return b, False
+
+
+def _forward(L, x, unit_diagonal=False):
+    # substituições sucessivas em todo o lote: L (batch, n, n), x (batch, n, k).
+    for i in range(x.shape[1]):
+        x[:, i] -= np.matmul(L[:, i:i + 1, :i], x[:, :i])[:, 0]
+        if not unit_diagonal:
+            x[:, i] /= L[:, i, i, None]
+    return x
+
+
+def _backward(U, x, unit_diagonal=False):
+    # substituições retroativas em todo o lote.
+    for i in range(x.shape[1] - 1, -1, -1):
+        x[:, i] -= np.matmul(U[:, i:i + 1, i + 1:], x[:, i + 1:])[:, 0]
+        if not unit_diagonal:
+            x[:, i] /= U[:, i, i, None]
+    return x
+
+
+def _finish(x, singular, vector):
+    # as soluções das matrizes singulares não têm significado.
+    x[singular] = np.nan
+    return x[:, :, 0] if vector else x
+
+
+class BatchedLU:
+    '''
+    Decomposição LU com pivotação parcial de um lote de matrizes pequenas,
+    guardado em um array (batch, n, n). Cada passo da eliminação é feito de
+    uma só vez para todas as matrizes do lote, evitando criar um objeto LU
+    por matriz.
+
+    Uma matriz singular não interrompe a decomposição: singular[i] fica True
+    e a solução correspondente sai com nan.
+
+    Uso:
+    >>> import numpy as np
+    >>> A = np.array([[[2., 1.], [1., 3.]], [[1., 2.], [2., 4.]]])
+    >>> dec = BatchedLU(A)
+    >>> dec.singular
+    array([False,  True])
+    >>> dec.solve([[3., 4.], [1., 1.]])[0]
+    array([1., 1.])
+
+    Complexidade: O(batch·n³), com n passos vetorizados.
+    '''
+
+    def __init__(self, a, pivoting=True):
+        self.LU = np.array(a, dtype=float)
+        if self.LU.ndim != 3 or self.LU.shape[1] != self.LU.shape[2]:
+            raise ValueError('a must have shape (batch, n, n).')
+        self.batch, self.n = self.LU.shape[:2]
+        self.pivoting = pivoting
+        self.perm = np.tile(np.arange(self.n), (self.batch, 1))
+        self.swap_count = np.zeros(self.batch, dtype=int)
+        self.singular = np.zeros(self.batch, dtype=bool)
+        self._execute()
+
+    def _swap(self, j, i):
+        # troca as linhas j e i[b] de cada matriz b do lote.
+        items = np.arange(self.batch)
+        for m in (self.LU, self.perm):
+            row = m[items, i].copy()
+            m[items, i] = m[:, j]
+            m[:, j] = row
+        self.swap_count += i != j
+
+    def _execute(self):
+        LU = self.LU
+        for j in range(self.n):
+            if self.pivoting:
+                self._swap(j, j + abs(LU[:, j:, j]).argmax(axis=1))
+            pivot = LU[:, j, j]
+            zero = pivot == 0
+            self.singular |= zero
+            LU[:, j + 1:, j] /= np.where(zero, 1, pivot)[:, None]
+            LU[:, j + 1:, j + 1:] -= LU[:, j + 1:, j, None] * LU[:, None, j, j + 1:]
+
+    @property
+    def det(self):
+        return self.LU.diagonal(axis1=1, axis2=2).prod(axis=1) * \
+            (-1.) ** self.swap_count
+
+    def solve(self, b):
+        '''b: array (batch, n) ou (batch, n, k).'''
+        x, vector = _as_batch(b, self.batch, self.n)
+        x = np.take_along_axis(x, self.perm[:, :, None], axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _forward(self.LU, x, unit_diagonal=True)
+            _backward(self.LU, x)
+        return _finish(x, self.singular, vector)
+
+
+class BatchedCholesky:
+    '''
+    Decomposição de Cholesky de um lote de matrizes simétricas (batch, n, n).
+    Ao contrário de Cholesky, L continua sempre real: as matrizes que não
+    são definidas positivas ficam marcadas em singular e suas soluções
+    saem com nan.
+
+    Complexidade: O(batch·n³), com n passos vetorizados.
+    '''
+
+    def __init__(self, a):
+        self.L = np.array(a, dtype=float)
+        if self.L.ndim != 3 or self.L.shape[1] != self.L.shape[2]:
+            raise ValueError('a must have shape (batch, n, n).')
+        self.batch, self.n = self.L.shape[:2]
+        self.singular = np.zeros(self.batch, dtype=bool)
+        self._execute()
+
+    def _execute(self):
+        L = self.L
+        for j in range(self.n):
+            row = L[:, j, :j]
+            d = L[:, j, j] - (row * row).sum(axis=1)
+            bad = ~(d > 0)
+            self.singular |= bad
+            L[:, j, j] = np.sqrt(np.where(bad, 1, d))
+            below = L[:, j + 1:]
+            below[:, :, j] -= np.matmul(below[:, :, :j], row[:, :, None])[:, :, 0]
+            below[:, :, j] /= L[:, j, j, None]
+            L[:, j, j + 1:] = 0
+
+    @property
+    def det(self):
+        return self.L.diagonal(axis1=1, axis2=2).prod(axis=1)**2
+
+    def solve(self, b):
+        '''b: array (batch, n) ou (batch, n, k).'''
+        x, vector = _as_batch(b, self.batch, self.n)
+        _forward(self.L, x)
+        _backward(self.L.transpose(0, 2, 1), x)
+        return _finish(x, self.singular, vector)
+
+
+def batched_gauss(a, b, pivoting=True):
+    '''
+    Eliminação de Gauss em um lote de sistemas: a (batch, n, n) e
+    b (batch, n) ou (batch, n, k). Retorna (x, det, singular), como gauss,
+    mais um array de booleanos marcando os sistemas singulares (cujas
+    soluções saem com nan) em vez de lançar ZeroDivisionError.
+
+    Complexidade: O(batch·n²(n + k))
+    '''
+    dec = BatchedLU(a, pivoting)
+    return dec.solve(b), dec.det, dec.singular
@@ -0,0 +1,122 @@
+import copy
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from src.linalg.policy import record_copy
+
+
+_DEFAULT_MAX_ENTRIES = 32
+_DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def fingerprint(a):
+    '''
+    Identifica o conteúdo de uma matriz: formato, tipo e um hash (blake2b)
+    dos seus bytes. Custa O(n²), bem menos que uma decomposição O(n³).
+    '''
+    a = np.ascontiguousarray(a)
+    digest = hashlib.blake2b(a.reshape(-1).view(np.uint8), digest_size=16)
+    return a.shape, a.dtype.str, digest.hexdigest()
+
+
+def _nbytes(dec):
+    # memória ocupada pelos arrays guardados em uma decomposição.
+    return sum(v.nbytes for v in vars(dec).values() if isinstance(v, np.ndarray))
+
+
+class FactorizationCache:
+    '''
+    Cache opcional de decomposições (LU, Cholesky, LDLt, ...) indexado pelo
+    conteúdo da matriz e pelas opções passadas ao construtor. Quando a mesma
+    matriz aparece de novo, a decomposição já feita é reaproveitada.
+
+    As entradas menos usadas recentemente são descartadas quando o número de
+    entradas passa de max_entries ou quando a memória ocupada pelos fatores
+    passa de max_bytes.
+
+    Uso:
+    >>> import numpy as np
+    >>> from src.linalg.lu import LU
+    >>> cache = FactorizationCache()
+    >>> A = np.array([[1, 5], [2, 3]])
+    >>> lu = cache.get(LU, A)
+    >>> cache.get(LU, A.copy()).LU is lu.LU
+    True
+    >>> cache.stats['hits'], cache.stats['misses']
+    (1, 1)
+
+    Cada chamada recebe uma cópia rasa da decomposição guardada: os fatores
+    são compartilhados (sem custo de cópia), mas update, downdate e o
+    refinamento com outra precisão trocam os arrays só da cópia, então a
+    entrada do cache continua sendo a decomposição da sua matriz. Pelo mesmo
+    motivo, uma decomposição nova é feita sobre uma cópia de a, que pode
+    então ser modificada por quem chamou.
+    '''
+
+    def __init__(self, max_entries=_DEFAULT_MAX_ENTRIES,
+                 max_bytes=_DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, cls, a, options):
+        return (cls, fingerprint(a), tuple(sorted(options.items())))
+
+    def get(self, cls, a, **options):
+        '''
+        Retorna cls(a, **options), reaproveitando a decomposição se ela já
+        estiver no cache.
+        '''
+        key = self._key(cls, a, options)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return copy.copy(self.entries[key][0])
+        self.misses += 1
+        # a decomposição guarda uma cópia própria de a: se quem chamou
+        # modificar a depois, a entrada continua valendo para a chave.
+        owned = np.array(a)
+        record_copy(owned.nbytes)
+        dec = cls(owned, **options)
+        size = _nbytes(dec)
+        if size <= self.max_bytes:
+            self.entries[key] = (dec, size)
+            self.nbytes += size
+            self._evict()
+            return copy.copy(dec)
+        return dec
+
+    def _evict(self):
+        while len(self.entries) > self.max_entries or \
+                self.nbytes > self.max_bytes:
+            _key, (_dec, size) = self.entries.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def invalidate(self, a=None):
+        '''
+        Remove do cache todas as decomposições da matriz a (com quaisquer
+        classes e opções), ou todas as entradas se a for None.
+        '''
+        if a is None:
+            self.entries.clear()
+            self.nbytes = 0
+            return
+        target = fingerprint(a)
+        for key in [k for k in self.entries if k[1] == target]:
+            self.nbytes -= self.entries.pop(key)[1]
+
+    @property
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self.entries),
+                'nbytes': self.nbytes}
+
+    def __len__(self):
+        return len(self.entries)
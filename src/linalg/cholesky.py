@@ -1,7 +1,8 @@
 import numpy as np
 
-from src.linalg.core import Decomposition, successive_substitutions, \
-    retroactive_substitutions
+from src.linalg.core import Decomposition
+from src.linalg.policy import as_float_array, writable_array
+from src.linalg.triangular import solve_triangular
 
 
 class Cholesky(Decomposition):
@@ -19,10 +20,13 @@ class Cholesky(Decomposition):
     [[1. 0.]
      [2. 1.]]
 
-    A matriz L pode ser de números complexos caso A não seja definida positiva.
+    A decomposição é feita coluna a coluna, in-place, em uma única matriz
+    real (float64 por padrão). A matriz L só passa a ser de números complexos caso A não seja
+    definida positiva.
     '''
 
-    def __init__(self, a, precision=None):
+    def __init__(self, a, precision=None, dtype=np.float64, overwrite_a=False,
+                 check_finite=False):
         '''
         Parâmetros:
         a: np.array 2d
@@ -30,62 +34,110 @@ class Cholesky(Decomposition):
         precision: int (padrão None)
             Use se quiser arredondar para x casas decimais ao final de cada 
             iteração (para comparar com exercícios durante estudos).
+        dtype: tipo dos fatores (padrão np.float64)
+            Use np.float32 para decompor com metade da memória e usar refine
+            para recuperar a precisão dupla.
+        overwrite_a: bool (padrão False)
+            Permite decompor in-place, sobre o próprio a (veja LU).
+        check_finite: bool (padrão False)
+            Lança ValueError se a tiver inf ou nan.
         '''
 
-        self.a = np.array(a)
+        self.a = as_float_array(a, check_finite=check_finite)
+        self.overwrite_a = overwrite_a
         self.precision = precision
+        self.dtype = dtype
         self._setUp()
         self._execute()
 
     def _setUp(self):
+        # L começa como uma cópia real de A; cada coluna é sobrescrita
+        # in-place pelo fator. Só vira complexa se A não for definida positiva.
         self.n = self.a.shape[0]
-        self.L = np.zeros_like(self.a).astype(complex)
+        self.L = writable_array(self.a, self.dtype, self.overwrite_a)
+        self.a_overwritten = self.L is self.a
 
     def _set_diagonal_element(self, j):
-        part_sum = self.a[j, j] - sum(self.L[j]**2)
+        row = self.L[j, :j]
+        part_sum = self.L[j, j] - row @ row
         if part_sum == 0:
             raise ZeroDivisionError(
                 'Can\'t decompose singular matrix (det = 0).')
+        if part_sum.real < 0 and self.L.dtype.kind != 'c':
+            self.L = self.L.astype(np.result_type(self.L, np.complex64))
+            part_sum = complex(part_sum)
         self.L[j, j] = part_sum ** 0.5
 
-    def _set_non_diagonal_element(self, i, j):
-        pivot = self.L[j, j]
-        row = self.L[i, :i]
-        col = self.L[j, :i]
-        part_sum = row @ col
-        self.L[i, j] = (self.a[i, j] - part_sum) / pivot
+    def _set_column(self, j):
+        # calcula toda a coluna j abaixo da diagonal de uma só vez.
+        below = self.L[j + 1:]
+        below[:, j] -= below[:, :j] @ self.L[j, :j]
+        below[:, j] /= self.L[j, j]
+        self.L[j, j + 1:] = 0
 
-    def _round(self):
+    def _round(self, j):
         if self.precision is not None:
-            self.L = self.L.round(self.precision)
+            self.L[j:, j] = self.L[j:, j].round(self.precision)
 
     def _execute(self):
         for j in range(self.n):
             self._set_diagonal_element(j)
-            for i in range(j+1, self.n):
-                self._set_non_diagonal_element(i, j)
-            self._round()
-        if (self.L.real == self.L).all():
-            self.L = self.L.real
+            self._set_column(j)
+            self._round(j)
+
+    def update(self, x):
+        '''
+        Atualiza L para a matriz A + x xᵀ sem refazer a decomposição. x pode
+        ser um vetor ou uma matriz n x k, para uma modificação de posto k.
+
+        Complexidade: O(n²k)
+        '''
+        self._modify(x, 1)
+
+    def downdate(self, x):
+        '''
+        Atualiza L para a matriz A - x xᵀ. Gera ValueError se o resultado não
+        for definido positivo.
+        '''
+        self._modify(x, -1)
+
+    def _modify(self, x, sign):
+        if self.L.dtype.kind == 'c':
+            raise ValueError('Only real (positive definite) factors can be updated.')
+        a = self._original()
+        x = np.asarray(x, dtype=float).reshape(self.n, -1)
+        L = self.L.copy()
+        for col in x.T:
+            self._rank_one_update(L, col.copy(), sign)
+        self.L = L
+        self.a = a + sign * x @ x.T
+        self._invalidate()
+
+    def _rank_one_update(self, L, x, sign):
+        # LLᵀ ± x xᵀ, aplicando uma rotação por coluna.
+        for k in range(self.n):
+            r2 = L[k, k]**2 + sign * x[k]**2
+            if r2 <= 0:
+                raise ValueError(
+                    'Downdate would make the matrix not positive definite.')
+            r = r2 ** 0.5
+            c, s = r / L[k, k], x[k] / L[k, k]
+            L[k, k] = r
+            L[k + 1:, k] += sign * s * x[k + 1:]
+            L[k + 1:, k] /= c
+            x[k + 1:] *= c
+            x[k + 1:] -= s * L[k + 1:, k]
 
     def solve(self, b):
-        b = np.array(b)
-        t = successive_substitutions(self.L, b)
-        x = retroactive_substitutions(self.L.T, t)
-        return x
-
-    def inv(self):
-        e = np.identity(self.n)
-        out = np.zeros_like(self.a).astype(float)
-        for i in range(self.n):
-            out[:, i] = self.solve(e[:, i])
-        return out
+        t = solve_triangular(self.L, b, lower=True)
+        return solve_triangular(self.L.T, t, lower=False, overwrite_b=True)
+
+    def solve_transposed(self, b):
+        # A é simétrica.
+        return self.solve(b)
 
     @property
     def det(self):
         if not hasattr(self, '_det'):
-            prod = 1
-            for i in range(self.n):
-                prod *= self.L[i, i]
-            self._det = prod**2
+            self._det = self.L.diagonal().prod()**2
         return self._det
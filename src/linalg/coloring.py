@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.linalg.sparse import CSR
+
+
+def red_black(grid):
+    '''
+    Coloração vermelho-preto de uma grade estruturada de formato `grid`
+    (tupla com o número de pontos em cada dimensão), com as incógnitas
+    numeradas na ordem natural (C). Retorna a cor (0 ou 1) de cada incógnita.
+
+    Para discretizações de 5 pontos (2d) ou 7 pontos (3d), pontos vizinhos
+    sempre têm cores diferentes.
+    '''
+    return np.indices(grid).sum(axis=0).ravel() % 2
+
+
+def _symmetric_pattern(a):
+    # padrão de esparsidade de A + Aᵀ, sem a diagonal, no formato CSR.
+    if not isinstance(a, CSR):
+        a = CSR.from_dense(a)
+    rows = np.concatenate([a.row_ids, a.indices])
+    cols = np.concatenate([a.indices, a.row_ids])
+    keep = rows != cols
+    return CSR.from_coo(rows[keep], cols[keep], np.ones(keep.sum()), a.shape)
+
+
+def greedy_coloring(a):
+    '''
+    Coloração gulosa das incógnitas de uma matriz qualquer (np.array 2d ou
+    CSR): duas incógnitas i e j recebem cores diferentes sempre que a[i, j]
+    ou a[j, i] for não nulo. Retorna a cor de cada incógnita.
+
+    Complexidade: O(nnz)
+    '''
+    pattern = _symmetric_pattern(a)
+    n = pattern.shape[0]
+    colors = np.full(n, -1)
+    for i in range(n):
+        neighbors = pattern.indices[pattern.indptr[i]:pattern.indptr[i + 1]]
+        used = colors[neighbors]
+        taken = np.zeros(len(neighbors) + 1, dtype=bool)
+        taken[used[(used >= 0) & (used <= len(neighbors))]] = True
+        colors[i] = taken.argmin()
+    return colors
+
+
+def is_valid_coloring(a, colors):
+    '''Testa se nenhum elemento não nulo fora da diagonal liga duas
+    incógnitas da mesma cor. Complexidade: O(nnz)'''
+    pattern = _symmetric_pattern(a)
+    return not (colors[pattern.row_ids] == colors[pattern.indices]).any()
+
+
+def color_classes(colors):
+    '''Retorna os índices das incógnitas de cada cor, em ordem de cor.'''
+    return [np.flatnonzero(colors == c) for c in np.unique(colors)]
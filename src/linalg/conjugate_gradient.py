@@ -0,0 +1,65 @@
+import numpy as np
+
+from src.linalg.operator import aslinearoperator
+
+
+class ConjugateGradient:
+    '''
+    Método dos gradientes conjugados para sistemas simétricos definidos
+    positivos, opcionalmente precondicionado (PCG).
+
+    A matriz pode ser um np.array 2d, uma CSR ou um LinearOperator, já que só
+    o produto matriz-vetor é usado. O precondicionador é qualquer objeto com
+    um método solve(r) que aproxima A⁻¹r (veja src.linalg.preconditioners).
+
+    Depois de solve, iter guarda o número de iterações, err o resíduo
+    relativo ||b - Ax|| / ||b|| e residuals o histórico desse resíduo.
+
+    Complexidade: O(nnz) por iteração.
+    '''
+
+    def __init__(self, a, preconditioner=None, debug=False, max_iter=500,
+                 max_err=1e-5):
+        self.a = aslinearoperator(a)
+        self.n = self.a.shape[0]
+        self.preconditioner = preconditioner
+        self.debug = debug
+        self.max_iter = max_iter
+        self.max_err = max_err
+
+    def _precondition(self, r):
+        if self.preconditioner is None:
+            return r.copy()
+        return self.preconditioner.solve(r)
+
+    def _debug(self):
+        if self.debug:
+            print(self.iter, self.err, sep='\t')
+
+    def _log_err(self, r):
+        self.err = np.linalg.norm(r) / self.b_norm
+        self.residuals.append(self.err)
+        self._debug()
+
+    def solve(self, b, x0=None):
+        b = np.asarray(b, dtype=float)
+        self.b_norm = np.linalg.norm(b) or 1
+        self.x = np.zeros(self.n) if x0 is None else np.array(x0, dtype=float)
+        self.iter = 0
+        self.residuals = []
+        r = b - self.a @ self.x
+        self._log_err(r)
+        z = self._precondition(r)
+        p = z.copy()
+        rz = r @ z
+        while self.iter < self.max_iter and self.err >= self.max_err:
+            ap = self.a @ p
+            alpha = rz / (p @ ap)
+            self.x += alpha * p
+            r -= alpha * ap
+            self.iter += 1
+            self._log_err(r)
+            z = self._precondition(r)
+            rz, old_rz = r @ z, rz
+            p = z + (rz / old_rz) * p
+        return self.x
@@ -1,9 +1,11 @@
 import abc
 import logging
-from typing import Callable
 
 import numpy as np
 
+from src.linalg.norms import condition_estimate, condition_number, \
+    matrix_norm_1, matrix_norm_frobenius, matrix_norm_inf, norm_inf, norm_p
+from src.linalg.triangular import solve_triangular
 from src.typing import Array1D, Array2D
 
 logger = logging.getLogger(__name__)
@@ -11,72 +13,132 @@ logger = logging.getLogger(__name__)
 
 class Decomposition(abc.ABC):
     a: Array2D
+    dtype = np.float64
+    # True quando os fatores foram gravados sobre o próprio a (overwrite_a).
+    a_overwritten = False
 
     @abc.abstractmethod
     def solve(self, b: Array1D) -> Array1D:
         pass
 
     @abc.abstractmethod
-    def det(self):
+    def solve_transposed(self, b: Array1D) -> Array1D:
+        '''Resolve Aᵀx = b com os mesmos fatores usados por solve.'''
         pass
 
     @abc.abstractmethod
-    def inv(self):
+    def det(self):
         pass
 
+    def inv(self):
+        '''
+        Calcula a inversa resolvendo AX = I para todas as colunas de uma vez.
+        '''
+        return self.solve(np.identity(self.a.shape[0]))
+
+    def cond(self, max_iter: int = 5):
+        '''
+        Estimativa do número de condição na norma 1 (colunas), em O(n²),
+        sem formar a inversa. Veja norms.condition_estimate.
+        '''
+        self._original()
+        return condition_estimate(self, max_iter)
+
     @abc.abstractmethod
     def _execute(self):
         pass
 
-    def refine(self, b: Array1D, x0: Array1D, tol: float = 1e-5, max_iter: int = 500, new_precision=None):
+    def _original(self):
+        # a matriz A original, usada por refine, cond e update.
+        if self.a_overwritten:
+            raise ValueError(
+                f'{type(self).__name__} was computed with overwrite_a=True, '
+                'so the original matrix is no longer available.')
+        return self.a
+
+    def _invalidate(self):
+        # descarta valores calculados a partir dos fatores antigos.
+        for attr in ('_det', '_inv'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+    @property
+    def _low_precision(self):
+        return np.finfo(self.dtype).eps > np.finfo(np.float64).eps
+
+    def _refactor(self, dtype):
+        # refaz a decomposição com os fatores em outro tipo.
+        self._original()
+        self.dtype = dtype
+        self._invalidate()
+        self._setUp()
+        self._execute()
+
+    def refine(self, b: Array1D, x0: Array1D = None, tol: float = 1e-5,
+               max_iter: int = 500, new_precision=None,
+               residual_dtype=np.float64, stall_ratio: float = 0.5):
         '''
         Faz o refinamento do sistema de forma iterativa.
-            - b: Valor na equação Ax = b
-            - x0: Solução inicial
+            - b: Valor na equação Ax = b (vetor ou matriz n x k)
+            - x0: Solução inicial (padrão: self.solve(b))
             - tol (float): tolerância máxima do erro
             - max_iter (int): máximo de iterações permitidas caso a o erro alvo não seja atingido
+            - residual_dtype: tipo usado no cálculo do resíduo b - Ax
+              (np.float64 ou np.longdouble)
+
+        Com fatores em precisão menor (dtype=np.float32), o resíduo calculado
+        em residual_dtype recupera a precisão dupla (refinamento em precisão
+        mista). Se o erro parar de cair (erro > stall_ratio * erro anterior)
+        já abaixo da precisão dos fatores, o refinamento terminou; se parar
+        acima dela, a matriz é decomposta de novo em float64 e o refinamento
+        continua.
+
+        Ao final, refine_iter guarda o número de correções aplicadas e
+        refine_err o último erro relativo (0 e inf se nenhuma correção foi
+        feita, como com max_iter=0). x0 complexo dá um x complexo.
         '''
         if new_precision is not None: self.precision = new_precision
-        x = x0.copy()
+        self._original()
+        b = np.asarray(b)
+        if x0 is None:
+            x = self.solve(b)
+        else:
+            x0 = np.asarray(x0)
+            x = np.array(x0, dtype=np.result_type(self.dtype, x0))
+        if x0 is None and np.iscomplexobj(x) and \
+                not np.iscomplexobj(self.a) and self._low_precision:
+            # a matriz deixou de ser definida positiva nos fatores em
+            # precisão menor.
+            self._refactor(np.float64)
+            x = self.solve(b)
+        # resíduo complexo quando x ou b forem complexos.
+        wide = np.result_type(residual_dtype, x, b)
+        narrow = np.result_type(np.float64, x, b)
+        # outros formatos (como Banded) só precisam de a @ x.
+        a = self.a
+        if isinstance(a, np.ndarray):
+            a = a.astype(wide, copy=False)
+        b_wide = b.astype(wide)
+        self.refine_iter, self.refine_err = 0, np.inf
+        last_err = np.inf
         i = 0
         while i < max_iter:
-            r = b - self.a @ x
-            c = self.solve(r)
-            err = norm_inf(c) / norm_inf(x)
+            r = b_wide - a @ x.astype(wide)
+            c = self.solve(r.astype(narrow))
+            err = norm_inf(c, axis=None) / norm_inf(x, axis=None)
             x += c
+            self.refine_iter, self.refine_err = i + 1, err
             if err < tol: break
+            if err > stall_ratio * last_err:
+                if err < np.finfo(self.dtype).eps:
+                    break
+                if self._low_precision:
+                    self._refactor(np.float64)
+            last_err = err
             i += 1
         return x
 
 
-def norm_p(x: Array1D, p: int):
-    return (sum([abs(xi)**p for xi in x]))**(1/p)
-
-
-def norm_inf(x: Array1D):
-    return max([abs(xi) for xi in x])
-
-
-def matrix_norm_1(A: Array2D):
-    return max([norm_p(A[i, :], 1) for i in range(A.shape[0])])
-
-
-def matrix_norm_inf(A: Array2D):
-    return max([norm_p(A[:, i], 1) for i in range(A.shape[1])])
-
-
-def matrix_norm_frobenius(A: Array2D):
-    acc = 0
-    for row in A:
-        for x in row:
-            acc += x * x
-    return acc**(1/2)
-
-
-def condition_number(A: Array2D, A_inv: Array2D, norm: Callable[[Array2D], float]):
-    return norm(A) * norm(A_inv)
-
-
 def square(a: Array2D):
     '''Testa se um array é matriz quadrada.'''
     return a.ndim == 2 and a.shape[0] == a.shape[1]
@@ -113,32 +175,21 @@ def successive_substitutions(A: Array2D, b: Array1D, diag: bool = True):
     '''
     Faz substituições sucessivas em uma matriz escalonada triangular inferior.
     A: matriz triangular inferior
-    b: vetor de coeficientes independentes
+    b: vetor de coeficientes independentes, ou matriz n x k com k lados
+        direitos resolvidos de uma só vez
+    diag: se False, considera a diagonal de A igual a 1
 
-    Complexidade: O(n²)'''
-    A, b = np.array(A), np.array(b)
-    b = b.astype(float)
-    x = np.zeros_like(b)
-    for i in range(A.shape[0]):
-        x[i] = (b[i] - (x[:i] @ A[i, :i]))
-        if diag:
-            x[i] /= A[i, i]
-    return x
+    Complexidade: O(n²k)'''
+    return solve_triangular(A, b, lower=True, unit_diagonal=not diag)
 
 
 def retroactive_substitutions(a: Array2D, b: Array1D, diag: bool = True):
     '''
     Faz substituições retroativas em uma matriz escalonada triangular superior.
     a: matriz triangula superiorr
-    b: vetor de coeficientes independentes
-
-    Complexidade: O(n²)'''
+    b: vetor de coeficientes independentes, ou matriz n x k com k lados
+        direitos resolvidos de uma só vez
+    diag: se False, considera a diagonal de a igual a 1
 
-    a, b = np.array(a), np.array(b)
-    b = b.astype(float)
-    x = np.zeros_like(b)
-    for i in range(a.shape[0] - 1, -1, -1):
-        x[i] = (b[i] - (x[i:] @ a[i, i:]))
-        if diag:
-            x[i] /= a[i, i]
-    return x
+    Complexidade: O(n²k)'''
+    return solve_triangular(a, b, lower=False, unit_diagonal=not diag)
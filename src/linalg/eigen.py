@@ -0,0 +1,272 @@
+import numpy as np
+
+from src.linalg.gmres import GMRES
+from src.linalg.lu import LU
+from src.linalg.operator import LinearOperator, aslinearoperator
+from src.linalg.sparse import CSR
+
+
+def _start(n, x0):
+    # vetor inicial unitário. Sem x0, usa um vetor aleatório (com semente
+    # fixa), que dificilmente é ortogonal a algum autovetor. Um x0 n x k
+    # (autovetores de uma execução anterior) é somado em um só vetor.
+    if x0 is None:
+        x = np.random.default_rng(0).standard_normal(n)
+    else:
+        x = np.asarray(x0)
+        if x.ndim == 2:
+            x = x.sum(axis=1)
+        x = x.real + x.imag if np.iscomplexobj(x) else np.array(x, dtype=float)
+    return x / np.linalg.norm(x)
+
+
+class PowerMethod:
+    '''
+    Método das potências: aproxima o autovalor de maior módulo de a e o seu
+    autovetor. a pode ser um np.array 2d, uma CSR ou um LinearOperator.
+
+    Depois de solve, value guarda o autovalor, vector o autovetor unitário,
+    iter o número de iterações e err o resíduo relativo ||Av - λv|| / |λ|.
+    Passar o vector de uma execução anterior como x0 (warm start) reaproveita
+    o trabalho já feito quando a matriz muda pouco.
+
+    Uso:
+    >>> import numpy as np
+    >>> pm = PowerMethod(np.array([[2., 1.], [1., 2.]]))
+    >>> round(float(pm.solve()), 6)
+    3.0
+
+    Complexidade: O(nnz) por iteração; converge com razão |λ₂ / λ₁|.
+    '''
+
+    def __init__(self, a, debug=False, max_iter=1000, max_err=1e-8):
+        self.a = aslinearoperator(a)
+        self.n = self.a.shape[0]
+        self.debug = debug
+        self.max_iter = max_iter
+        self.max_err = max_err
+
+    def _debug(self):
+        if self.debug:
+            print(self.iter, self.value, self.err, sep='\t')
+
+    def _apply(self, x):
+        # retorna y e o autovalor correspondente ao quociente de Rayleigh.
+        y = self.a @ x
+        return y, x @ y
+
+    def _eigenvalue(self, mu):
+        return mu
+
+    def solve(self, x0=None):
+        x = _start(self.n, x0)
+        self.iter = 0
+        while True:
+            y, mu = self._apply(x)
+            self.err = np.linalg.norm(y - mu * x) / (abs(mu) or 1)
+            self.value = self._eigenvalue(mu)
+            self.vector = x
+            self._debug()
+            if self.err < self.max_err or self.iter >= self.max_iter:
+                break
+            x = y / np.linalg.norm(y)
+            self.iter += 1
+        return self.value
+
+
+class InverseIteration(PowerMethod):
+    '''
+    Iteração inversa com deslocamento: o método das potências aplicado a
+    (A - σI)⁻¹, que converge para o autovalor de a mais próximo de σ (shift).
+
+    A - σI é decomposta uma única vez com LU (ou buscada em cache, um
+    FactorizationCache) e cada iteração custa só um solve, O(n²). Se a for
+    um LinearOperator ou uma CSR, cada iteração resolve o sistema com GMRES.
+
+    Complexidade: O(n³) para decompor e O(n²) por iteração.
+    '''
+
+    def __init__(self, a, shift=0., cache=None, *args, **kwargs):
+        super().__init__(a, *args, **kwargs)
+        self.shift = shift
+        if isinstance(a, (LinearOperator, CSR)):
+            shifted = LinearOperator(self.a.shape,
+                                     lambda x: self.a @ x - shift * x)
+            self.lu = None
+            self.inner = GMRES(shifted, max_err=self.max_err / 10)
+        else:
+            shifted = np.array(a, dtype=float) - shift * np.identity(self.n)
+            self.lu = LU(shifted) if cache is None else cache.get(LU, shifted)
+
+    def _apply(self, x):
+        y = self.lu.solve(x) if self.lu is not None else self.inner.solve(x)
+        return y, x @ y
+
+    def _eigenvalue(self, mu):
+        return self.shift + 1 / mu
+
+
+class Arnoldi:
+    '''
+    Método de Arnoldi com reinício: aproxima os k autovalores de a
+    (que não precisa ser simétrica) de maior módulo e seus autovetores. Só o
+    produto a @ x é usado, então a pode ser um np.array 2d, uma CSR ou um
+    LinearOperator.
+
+    Cada ciclo constrói uma base ortonormal V de ncv vetores do espaço de
+    Krylov (Gram-Schmidt clássico com reortogonalização, como em GMRES) e
+    calcula os autovalores da matriz H = VᵀAV, pequena (ncv x ncv). Se algum
+    dos k pares ainda não convergiu, o ciclo seguinte mantém os vetores de
+    Ritz procurados e só completa a base (reinício grosso).
+
+    which escolhe os autovalores procurados: 'LM' (maior módulo), 'LA'
+    (maior valor) ou 'SA' (menor valor).
+
+    Depois de solve, values guarda os autovalores, vectors os autovetores
+    (colunas), iter o número de ciclos e err o maior resíduo relativo
+    ||Av - λv|| / |λ|. Os vectors podem ser passados como x0 (warm start).
+
+    Como a base parte de um único vetor, um autovalor repetido pode aparecer
+    só uma vez entre os k encontrados.
+
+    Complexidade: O(ncv·nnz + ncv²·n) por ciclo.
+    '''
+
+    def __init__(self, a, k=6, ncv=None, which='LM', debug=False,
+                 max_iter=100, max_err=1e-8):
+        self.a = aslinearoperator(a)
+        self.n = self.a.shape[0]
+        self.k = k
+        self.ncv = min(self.n, ncv or max(2 * k + 1, 20))
+        if not 0 < k <= self.ncv:
+            raise ValueError('k must be between 1 and ncv.')
+        if which not in ('LM', 'LA', 'SA'):
+            raise ValueError(f'Unknown which {which!r}.')
+        self.which = which
+        self.debug = debug
+        self.max_iter = max_iter
+        self.max_err = max_err
+
+    def _debug(self):
+        if self.debug:
+            print(self.iter, *self.values, self.err, sep='\t')
+
+    def _expand(self, V, H, j):
+        # acrescenta V[j + 1] à base e preenche a coluna j de H.
+        w = self.a @ V[j]
+        for _ in range(2):
+            h = V[:j + 1] @ w
+            w -= V[:j + 1].T @ h
+            H[:j + 1, j] += h
+        H[j + 1, j] = np.linalg.norm(w)
+        if H[j + 1, j] > 0:
+            V[j + 1] = w / H[j + 1, j]
+
+    def _ritz(self, H):
+        return np.linalg.eig(H)
+
+    def _wanted(self, theta):
+        if self.which == 'LM':
+            order = np.argsort(-abs(theta))
+        elif self.which == 'LA':
+            order = np.argsort(-theta.real)
+        else:
+            order = np.argsort(theta.real)
+        return order
+
+    def _restart(self, V, H, S, m):
+        # reinício grosso (thick restart): a base passa a ser formada pelos
+        # vetores de Ritz em S (em uma base real e ortonormal Q do
+        # espaço gerado por eles) mais o último vetor de Arnoldi, que
+        # continua a expansão. Retorna quantos vetores foram mantidos.
+        U, sv, _ = np.linalg.svd(np.hstack([S.real, S.imag]),
+                                 full_matrices=False)
+        Q = U[:, sv > 1e-10 * sv[0]][:, :m - 1]
+        p = Q.shape[1]
+        beta = H[m, m - 1]
+        V[:p], V[p] = Q.T @ V[:m], V[m]
+        T = Q.T @ H[:m, :m] @ Q
+        H[:] = 0
+        H[:p, :p] = T
+        H[p, :p] = beta * Q[-1]
+        return p
+
+    def solve(self, x0=None):
+        m = self.ncv
+        V = np.zeros((m + 1, self.n))
+        H = np.zeros((m + 1, m))
+        V[0] = _start(self.n, x0)
+        p = 0
+        self.iter = 0
+        while True:
+            m = self.ncv
+            for j in range(p, m):
+                self._expand(V, H, j)
+                if H[j + 1, j] <= 1e-12 * abs(H[:j + 2, j]).max():
+                    m = j + 1  # subespaço invariante: os valores de Ritz são exatos
+                    H[m, m - 1] = 0
+                    break
+            theta, S = self._ritz(H[:m, :m])
+            order = self._wanted(theta)
+            S = S[:, order]
+            theta, Sk = theta[order[:self.k]], S[:, :self.k]
+            residuals = abs(H[m, m - 1] * Sk[-1]) / np.maximum(abs(theta), 1e-300)
+            self.values, self.vectors = theta, V[:m].T @ Sk
+            self.err = residuals.max()
+            self.iter += 1
+            self._debug()
+            if self.err < self.max_err or self.iter >= self.max_iter or \
+                    m < self.ncv:
+                break
+            # mantém também alguns vetores de Ritz além dos k procurados,
+            # o que evita que o reinício fique preso em valores espúrios.
+            p = self._restart(V, H, S[:, :self.k + (m - self.k) // 2], m)
+        if not self.values.imag.any():
+            self.values = self.values.real
+            self.vectors = self.vectors.real
+        return self.values
+
+
+class Lanczos(Arnoldi):
+    '''
+    Método de Lanczos para matrizes simétricas, com o mesmo reinício grosso
+    de Arnoldi. Cada vetor novo da base vem da recorrência de três termos
+
+        β_j v_{j+1} = A v_j - α_j v_j - β_{j-1} v_{j-1}
+
+    e H é a matriz tridiagonal T dos α e β (logo depois de um reinício, o
+    primeiro vetor novo ainda é acoplado a todos os vetores mantidos). Os
+    valores de Ritz vêm de uma decomposição simétrica, sempre reais.
+
+    Em ponto flutuante a base perde a ortogonalidade justamente na direção
+    dos vetores de Ritz que já convergiram, o que gera cópias falsas dos
+    autovalores. Por isso a reortogonalização é seletiva (Parlett e Scott):
+    w só é ortogonalizado contra os vetores de Ritz cuja cota de erro
+    |β_j s_ji| já está abaixo de √ε‖T‖.
+
+    Complexidade: O(ncv·nnz + ncv·n) por ciclo, mais O(ncv·n) por vetor de
+    Ritz usado na reortogonalização e O(ncv⁴) para as decomposições de T.
+    '''
+
+    def _expand(self, V, H, j):
+        # acoplamentos de v_j: só β_{j-1}, ou a linha toda após o reinício.
+        w = self.a @ V[j]
+        coupled = np.flatnonzero(H[j, :j])
+        H[coupled, j] = H[j, coupled]
+        w -= V[coupled].T @ H[j, coupled]
+        H[j, j] = V[j] @ w
+        w -= H[j, j] * V[j]
+        beta = np.linalg.norm(w)
+        theta, S = self._ritz(H[:j + 1, :j + 1])
+        good = beta * abs(S[-1]) <= np.sqrt(np.finfo(float).eps) * \
+            abs(theta).max()
+        if good.any():
+            Y = V[:j + 1].T @ S[:, good]
+            w -= Y @ (Y.T @ w)
+            beta = np.linalg.norm(w)
+        H[j + 1, j] = beta
+        if beta > 0:
+            V[j + 1] = w / beta
+
+    def _ritz(self, H):
+        return np.linalg.eigh((H + H.T) / 2)
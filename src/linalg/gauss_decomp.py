@@ -3,7 +3,9 @@ import logging
 import numpy as np
 from src.typing import Array1D, Array2D
 
-from src.linalg.core import retroactive_substitutions
+from src.linalg.pivoting import GrowthMonitor, PartialPivoting, get_strategy
+from src.linalg.policy import check_finite_array, record_copy
+from src.linalg.triangular import solve_triangular
 
 
 logger = logging.getLogger(__name__)
@@ -17,32 +19,65 @@ def swap(m, i, j):
 
 
 def swap_pivot(m, pivot_index):
-    col = m[pivot_index:, pivot_index]
-    new_index = col.argmax() + pivot_index
-    if pivot_index != new_index:
-        swap(m, pivot_index, new_index)
+    '''
+    Troca a linha pivot_index de m pela linha do pivô da pivotação parcial
+    (maior valor absoluto da coluna pivot_index, a partir da diagonal).
+    Retorna -1 se houve troca e 1 caso contrário (o sinal do determinante).
+
+    Até a introdução das estratégias de pivotação (src.linalg.pivoting), o
+    pivô era o maior valor com sinal, que podia ser nulo.
+    '''
+    i, _ = PartialPivoting().choose(m, pivot_index)
+    if i != pivot_index:
+        swap(m, pivot_index, i)
         return -1
-    else:
-        return 1
+    return 1
+
 
+def gauss(a: Array2D, b: Array1D, pivoting=True, precision=None,
+          check_finite=False):
+    '''
+    Eliminação de Gauss sobre a matriz aumentada [a | b], que é a única
+    cópia feita (a e b não são modificados). Retorna (x, det).
 
-def gauss(a: Array2D, b: Array1D, pivoting=True, precision=None):
-    a, b = a.copy(), b.copy()
+    pivoting: estratégia de pivotação, como em LU: True ('partial'), False
+        ('none'), 'rook', 'complete', 'adaptive' ou uma PivotingStrategy.
+        As trocas de colunas são desfeitas em x. O fator de crescimento da
+        eliminação é registrado no log (nível INFO).
+    check_finite: se True, lança ValueError caso a ou b tenham inf ou nan.
+    '''
     det = 1
     n = len(a)
-    M = np.zeros((n, n+1))
-    M[:, :-1] = a.copy().astype(float)
-    M[:, -1] = b.copy().astype(float)
+    M = np.empty((n, n+1))
+    M[:, :-1] = a
+    M[:, -1] = b
+    record_copy(M.nbytes)
+    if check_finite:
+        check_finite_array(M)
+    strategy = get_strategy(pivoting)
+    strategy.reset()
+    monitor = GrowthMonitor(M[:, :n])
+    cperm = np.arange(n)
     for pivot in range(n):
-        if pivoting:
-            det *= swap_pivot(M, pivot)
-        logger.info(f'\n{M}')
-        logger.info(f'\n{"-" * 80}')
+        i, j = strategy.choose(M[:, :n], pivot, monitor)
+        if i != pivot:
+            swap(M, pivot, i)
+            det = -det
+        if j != pivot:
+            M[:, [pivot, j]] = M[:, [j, pivot]]
+            cperm[[pivot, j]] = cperm[[j, pivot]]
+            det = -det
+        monitor.update(M[pivot, pivot:n])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f'\n{M}')
+            logger.info(f'\n{"-" * 80}')
         det *= M[pivot, pivot]
-        m = - 1 / M[pivot, pivot]
-        for i in range(pivot + 1, n):
-            M[i] += m * M[i, pivot] * M[pivot]
+        # atualização de posto 1 de todas as linhas abaixo do pivô.
+        mult = M[pivot + 1:, pivot] / M[pivot, pivot]
+        M[pivot + 1:, pivot:] -= np.outer(mult, M[pivot, pivot:])
         if precision is not None:
             M = M.round(precision)
-    x = retroactive_substitutions(M[:, :-1], M[:, -1])
+    logger.info('growth factor: %.4g', monitor.growth)
+    x = np.empty(n)
+    x[cperm] = solve_triangular(M[:, :-1], M[:, -1], lower=False)
     return x, det
@@ -1,26 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
+from src.linalg.coloring import color_classes, greedy_coloring, \
+    is_valid_coloring, red_black
 from src.linalg.jacobi import Jacobi
+from src.linalg.norms import norm_inf
+
+
+_DEFAULT_CHUNK_SIZE = 1 << 14
 
 
 class GaussSeidel(Jacobi):
+    def __init__(self, a, *args, ordering=None, grid=None, workers=1,
+                 chunk_size=_DEFAULT_CHUNK_SIZE, **kwargs):
+        '''
+        Parâmetros (além dos de Jacobi):
+        ordering: None, 'red-black', 'greedy' ou np.array 1d (padrão None)
+            None atualiza x[i] em sequência, uma incógnita por vez. As outras
+            opções colorem as incógnitas de forma que incógnitas da mesma cor
+            não dependam umas das outras; cada cor é então atualizada de uma
+            só vez, com uma operação vetorizada. 'red-black' serve para
+            grades estruturadas (veja grid), 'greedy' para qualquer padrão de
+            esparsidade, e um array dá a cor de cada incógnita.
+        grid: tupla (padrão None)
+            Formato da grade usada por 'red-black'. Se None, usa (n,).
+        workers: int (padrão 1)
+            Número de threads usadas para atualizar as cores com mais de
+            chunk_size incógnitas, dividindo-as em pedaços.
+        chunk_size: int (padrão 16384)
+            Tamanho dos pedaços de cada cor.
+        '''
+        super().__init__(a, *args, **kwargs)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.colors = self._build_colors(ordering, grid)
+        self._build_classes()
+
+    def _build_colors(self, ordering, grid):
+        if ordering is None:
+            return None
+        if isinstance(ordering, str):
+            if ordering == 'red-black':
+                colors = red_black((self.n,) if grid is None else grid)
+            elif ordering == 'greedy':
+                return greedy_coloring(self.M)
+            else:
+                raise ValueError(f'Unknown ordering {ordering!r}.')
+        else:
+            colors = np.asarray(ordering)
+        if colors.shape != (self.n,):
+            raise ValueError('There must be one color per unknown.')
+        if not is_valid_coloring(self.M, colors):
+            raise ValueError('Unknowns of the same color depend on each other.')
+        return colors
+
+    def _rows(self, idx):
+        return self.M.take_rows(idx) if self.sparse else self.M[idx]
+
+    def _build_classes(self):
+        # para cada cor, uma lista de pedaços (índices, linhas de M).
+        self._classes = []
+        if self.colors is None:
+            return
+        for idx in color_classes(self.colors):
+            chunks = [idx[i:i + self.chunk_size]
+                      for i in range(0, len(idx), self.chunk_size)]
+            self._classes.append([(c, self._rows(c)) for c in chunks])
+
+    def _row_dot(self, i):
+        # produto da linha i de M por x; se M for esparsa, só toca nos não nulos.
+        if self.sparse:
+            return self.M.row_dot(i, self.x)
+        return self.M[i] @ self.x
+
     def _calc_xi(self, i):
-        self.x[i] = self.M[i] @ self.x + self.b[i]
+        self.x[i] = self._row_dot(i) + self.b[i]
+
+    def _calc_block(self, idx, rows):
+        # atualiza todas as incógnitas idx (de uma mesma cor) de uma só vez.
+        self.x[idx] = rows @ self.x + self.b[idx]
+
+    def _sweep(self, pool):
+        if self.colors is None:
+            for i in range(self.n):
+                self._calc_xi(i)
+            return
+        for chunks in self._classes:
+            if pool is None or len(chunks) == 1:
+                for idx, rows in chunks:
+                    self._calc_block(idx, rows)
+            else:
+                list(pool.map(lambda chunk: self._calc_block(*chunk), chunks))
+
+    def _tune(self):
+        # chamado ao fim de cada iteração que não convergiu (veja SOR).
+        pass
 
     def solve(self, b, x0=None):
         self.err = None
-        self.b = np.array(b)
+        self.b = b
         self._build_b()
         self.x = self._build_x0() if x0 is None else x0.copy()
         self.iter = 0
-        while self.iter < self.max_iter:
-            old_x = self.x.copy()
-            self._debug()
-            for i in range(self.n):
-                self._calc_xi(i)
-            corr = self.x - old_x
-            self.err = max(abs(corr)) / max(abs(self.x))
-            if self.err < self.max_err:
-                break
-            self.iter += 1
+        pool = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            while self.iter < self.max_iter:
+                old_x = self.x.copy()
+                self._debug()
+                self._sweep(pool)
+                corr = self.x - old_x
+                self.err = norm_inf(corr) / norm_inf(self.x)
+                if self.err < self.max_err:
+                    break
+                self._tune()
+                self.iter += 1
+        finally:
+            if pool is not None:
+                pool.shutdown()
         return self.x
@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.linalg.conjugate_gradient import ConjugateGradient
+from src.linalg.triangular import solve_triangular
+
+
+class GMRES(ConjugateGradient):
+    '''
+    Método GMRES(m) com reinício a cada m iterações, para sistemas quaisquer
+    (não precisam ser simétricos). O precondicionador é aplicado à direita,
+    então err é sempre o resíduo relativo verdadeiro ||b - Ax|| / ||b||.
+
+    A base de Krylov é ortogonalizada por Gram-Schmidt clássico com
+    reortogonalização e o problema de mínimos quadrados é resolvido com
+    rotações de Givens.
+
+    restart (m) e preconditioner só podem ser passados por nome. residuals
+    guarda o resíduo estimado a cada iteração e, ao fim de cada ciclo, o
+    resíduo verdadeiro recalculado.
+
+    Complexidade: O(nnz + n·m) por iteração, O(n·m) de memória.
+    '''
+
+    def __init__(self, a, *, restart=30, preconditioner=None, **kwargs):
+        self.restart = restart
+        super().__init__(a, preconditioner, **kwargs)
+
+    def _cycle(self, r, beta):
+        # um ciclo de até m iterações de Arnoldi. Retorna a correção de x.
+        m = self.restart
+        V = np.zeros((m + 1, self.n))
+        Z = np.zeros((m, self.n))
+        H = np.zeros((m + 1, m))
+        cs, sn = np.zeros(m), np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+        k = 0
+        while k < m and self.iter < self.max_iter:
+            Z[k] = self._precondition(V[k])
+            w = self.a @ Z[k]
+            for _ in range(2):
+                h = V[:k + 1] @ w
+                w -= V[:k + 1].T @ h
+                H[:k + 1, k] += h
+            H[k + 1, k] = np.linalg.norm(w)
+            if H[k + 1, k] != 0:
+                V[k + 1] = w / H[k + 1, k]
+            for i in range(k):
+                H[i, k], H[i + 1, k] = cs[i] * H[i, k] + sn[i] * H[i + 1, k], \
+                    -sn[i] * H[i, k] + cs[i] * H[i + 1, k]
+            denom = np.hypot(H[k, k], H[k + 1, k])
+            cs[k], sn[k] = H[k, k] / denom, H[k + 1, k] / denom
+            H[k, k], H[k + 1, k] = denom, 0
+            g[k + 1], g[k] = -sn[k] * g[k], cs[k] * g[k]
+            k += 1
+            self.iter += 1
+            self.err = abs(g[k]) / self.b_norm
+            self.residuals.append(self.err)
+            self._debug()
+            if self.err < self.max_err:
+                break
+        y = solve_triangular(H[:k, :k], g[:k], lower=False)
+        return Z[:k].T @ y
+
+    def solve(self, b, x0=None):
+        b = np.asarray(b, dtype=float)
+        self.b_norm = np.linalg.norm(b) or 1
+        self.x = np.zeros(self.n) if x0 is None else np.array(x0, dtype=float)
+        self.iter = 0
+        self.residuals = []
+        r = b - self.a @ self.x
+        self._log_err(r)
+        while self.iter < self.max_iter and self.err >= self.max_err:
+            self.x += self._cycle(r, np.linalg.norm(r))
+            r = b - self.a @ self.x
+            self._log_err(r)
+        return self.x
@@ -1,34 +1,58 @@
 import numpy as np
 
+from src.linalg.norms import norm_inf
+from src.linalg.policy import as_float_array, record_copy
+from src.linalg.sparse import CSR
+
 
 class Jacobi:
     def __init__(self, a, debug=False, precision=None, max_iter=500,
-                 max_err=1e-5):
-        self.a = np.array(a)
-        self.n = len(a)
+                 max_err=1e-5, check_finite=False):
+        '''
+        Parâmetros:
+        a: np.array 2d quadrado ou CSR
+            Matriz do sistema. Se for uma matriz CSR, as iterações só tocam
+            nos elementos não nulos. Não é copiada se já for de ponto
+            flutuante, mas a matriz de iteração M tem o tamanho de a (e
+            entra na contagem de count_copies).
+        check_finite: bool (padrão False)
+            Lança ValueError se a tiver inf ou nan.
+        '''
+        self.a = a if isinstance(a, CSR) else \
+            as_float_array(a, check_finite=check_finite)
+        self.n = self.a.shape[0]
         self._build_M()
         self.debug = debug
         self.max_iter = max_iter
         self.max_err = max_err
 
+    @property
+    def sparse(self):
+        return isinstance(self.a, CSR)
+
     @property
     def converges(self):
-        for i in range(self.n):
-            if self.a[i,i] <= abs(self.a[i,:i]).sum() + abs(self.a[i,i+1:]).sum():
-                return False
+        # critério das linhas (diagonal estritamente dominante), em O(nnz).
+        d = self.a.diagonal()
+        if self.sparse:
+            row_sums = self.a.abs_row_sums()
         else:
-            return True
+            row_sums = abs(self.a).sum(axis=1)
+        return bool((d > row_sums - abs(d)).all())
 
     def _build_M(self):
-        self.M = self.a.copy().astype(float)
-        for i in range(self.n):
-            self.M[i] /= -self.a[i,i]
-            self.M[i,i] = 0
+        if self.sparse:
+            d = self.a.diagonal()
+            self.M = self.a.without_diagonal().scale_rows(-1 / d)
+            record_copy(self.M.data.nbytes + self.M.indices.nbytes +
+                        self.M.indptr.nbytes)
+            return
+        self.M = self.a / -self.a.diagonal()[:, None]
+        np.fill_diagonal(self.M, 0)
+        record_copy(self.M.nbytes)
 
     def _build_b(self):
-        self.b = self.b.copy().astype(float)
-        for i in range(self.n):
-            self.b[i] /= self.a[i,i]
+        self.b = np.asarray(self.b, dtype=float) / self.a.diagonal()
 
     def _debug(self):
         if self.debug:
@@ -48,7 +72,7 @@ class Jacobi:
             new_x = self.M @ self.x + self.b
             corr = new_x - self.x
             self.x = new_x
-            self.err = max(abs(corr)) / max(abs(self.x))
+            self.err = norm_inf(corr) / norm_inf(self.x)
             if self.err < self.max_err: break
             self.iter += 1
         return self.x
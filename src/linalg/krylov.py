@@ -4,6 +4,13 @@ from src.linalg.lu import LU
 
 
 def krylov_poly(a):
+    '''
+    Polinômio característico de a pelo método de Krylov. A matriz de Krylov
+    fica mal condicionada rapidamente (n > ~15); para os autovalores de
+    matrizes maiores, use src.linalg.eigen.
+
+    Complexidade: O(n³)
+    '''
     a = np.array(a)
     n = len(a)
     y = np.array([1] + [0] * (n - 1))
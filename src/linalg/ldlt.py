@@ -1,57 +1,69 @@
 import numpy as np
 
-from src.linalg.core import Decomposition, successive_substitutions, \
-    retroactive_substitutions
+from src.linalg.core import Decomposition
+from src.linalg.policy import as_float_array, writable_array
+from src.linalg.triangular import solve_triangular
 
 
 class LDLt(Decomposition):
-    def __init__(self, a, precision=None):
-        self.a = np.array(a).astype(float)
-        self.n = len(a)
+    def __init__(self, a, precision=None, dtype=np.float64, overwrite_a=False,
+                 check_finite=False):
+        '''
+        Parâmetros:
+        a: np.array 2d
+            Matriz simétrica a ser decomposta
+        precision: int (padrão None)
+            Casas decimais do arredondamento a cada iteração.
+        dtype: tipo dos fatores (padrão np.float64)
+            Use np.float32 para decompor com metade da memória e usar refine
+            para recuperar a precisão dupla.
+        overwrite_a: bool (padrão False)
+            Permite decompor in-place, sobre o próprio a (veja LU).
+        check_finite: bool (padrão False)
+            Lança ValueError se a tiver inf ou nan.
+        '''
+        self.a = as_float_array(a, check_finite=check_finite)
+        self.n = len(self.a)
         self.precision = precision
+        self.dtype = dtype
+        self.overwrite_a = overwrite_a
         self._execute()
 
     def _execute(self):
-        out = self.a.copy()
-        n = len(self.a)
-        for j in range(n):
-            cum = 0
-            for k in range(j):
-                cum += out[j, k]**2 * out[k, k]
-            out[j, j] -= cum
-            r = 1 / out[j, j]
-            for i in range(j + 1, n):
-                cum = 0
-                for k in range(j):
-                    cum += out[i, k] * out[k, k] * out[j, k]
-                out[i, j] -= cum
-                out[i, j] *= r
-                out[j, i] = out[i, j]
+        # coluna a coluna: v = L[j, :j] * D[:j] é usado tanto no pivô quanto
+        # na coluna j abaixo dele. L e D ficam na mesma matriz (simétrica).
+        out = writable_array(self.a, self.dtype, self.overwrite_a)
+        self.a_overwritten = out is self.a
+        d = out.diagonal()
+        for j in range(self.n):
+            v = out[j, :j] * d[:j]
+            out[j, j] -= out[j, :j] @ v
+            out[j + 1:, j] -= out[j + 1:, :j] @ v
+            out[j + 1:, j] *= 1 / out[j, j]
+            out[j, j + 1:] = out[j + 1:, j]
             if self.precision is not None:
                 out = out.round(self.precision)
+                d = out.diagonal()
         self.ldlt = out
 
     @property
     def det(self):
         if not hasattr(self, '_det'):
-            prod = 1
-            for i in range(self.n):
-                prod *= self.ldlt[i, i]
-            self._det = prod
+            self._det = self.ldlt.diagonal().prod()
         return self._det
 
     def solve(self, b):
-        b = np.array(b)
-        t = successive_substitutions(self.ldlt, b, diag=False)
-        u = t / self.ldlt.diagonal()
-        x = retroactive_substitutions(self.ldlt, u, diag=False)
-        return x
+        t = solve_triangular(self.ldlt, b, lower=True, unit_diagonal=True)
+        d = self.ldlt.diagonal()
+        t /= d.reshape(d.shape + (1,) * (t.ndim - 1))
+        return solve_triangular(self.ldlt, t, lower=False, unit_diagonal=True,
+                                overwrite_b=True)
+
+    def solve_transposed(self, b):
+        # A é simétrica.
+        return self.solve(b)
 
     def inv(self):
         if not hasattr(self, '_inv'):
-            e = np.identity(self.n)
-            out = np.zeros_like(self.a).astype(float)
-            for i in range(self.n):
-                out[:, i] = self.solve(e[:, i])
-            self._inv = out
+            self._inv = super().inv()
         return self._inv
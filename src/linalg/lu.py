@@ -1,7 +1,44 @@
 import numpy as np
 
-from src.linalg.core import Decomposition, retroactive_substitutions, \
-    successive_substitutions
+from src.linalg.core import Decomposition
+from src.linalg.pivoting import NoPivoting, PartialPivoting, eliminate, \
+    get_strategy
+from src.linalg.policy import as_float_array, writable_array
+from src.linalg.triangular import solve_triangular
+
+
+_DEFAULT_BLOCK_SIZE = 64
+
+
+def lu_panel(a, k, kb, perm, pivoting=True):
+    '''
+    Fatora in-place as colunas k..k+kb de `a` (linhas k em diante), trocando
+    linhas inteiras de `a` e as entradas correspondentes de `perm`.
+    Retorna o número de trocas feitas.
+
+    A busca do pivô é vetorizada com argmax e cada coluna é eliminada com um
+    produto externo. Uma coluna nula (matriz singular) é pulada.
+    '''
+    swaps = 0
+    stop = k + kb
+    for j in range(k, stop):
+        if pivoting:
+            i = j + int(np.abs(a[j:, j]).argmax())
+        else:
+            i = j
+        pivot = a[i, j]
+        if pivot == 0:
+            if not pivoting:
+                raise ZeroDivisionError(
+                    '0 as a pivot found. Please try setting pivoting=True.')
+            continue
+        if i != j:
+            swaps += 1
+            a[[i, j]] = a[[j, i]]
+            perm[[i, j]] = perm[[j, i]]
+        a[j + 1:, j] /= pivot
+        a[j + 1:, j + 1:stop] -= np.outer(a[j + 1:, j], a[j, j + 1:stop])
+    return swaps
 
 
 class LU(Decomposition):
@@ -29,29 +66,82 @@ class LU(Decomposition):
     [[-1.41666667 -0.125       0.54166667]
      [-0.25        0.125       0.125     ]
      [ 0.83333333  0.25       -0.08333333]]
+
+    Por padrão a decomposição é feita em blocos (painel + atualização do
+    restante da matriz com produtos de matrizes). Se `debug` ou `precision`
+    forem usados, a decomposição é feita passo a passo, linha a linha (modo
+    didático), para que as etapas possam ser comparadas com exercícios.
     '''
 
-    def __init__(self, a, pivoting=True, debug=False, precision=None):
+    def __init__(self, a, pivoting=True, debug=False, precision=None,
+                 block_size=_DEFAULT_BLOCK_SIZE, dtype=np.float64,
+                 overwrite_a=False, check_finite=False):
         '''
         Parametros:
         a: np.array 2d quadrado
             Matriz a ser decomposta
-        pivoting: bool (padrão True)
-            Determina se deve usar pivotação parcial.
+        pivoting: bool, str ou PivotingStrategy (padrão True)
+            Estratégia de pivotação (veja src.linalg.pivoting): True ou
+            'partial' (parcial), False ou 'none', 'rook', 'complete' ou
+            'adaptive' (parcial até o fator de crescimento passar de um
+            limite, depois rook). A pivotação parcial usa a decomposição em
+            blocos; as outras trocam também colunas (veja q e cperm) e
+            eliminam uma coluna por vez. O modo didático só usa a parcial.
         debug: bool (padrão False)
             Determina se deve imprimir linhas das etapas da decomposição LU.
         precision: int (padrão None)
-            Determina quantas casas decimais usar no arredondamento a cada 
+            Determina quantas casas decimais usar no arredondamento a cada
             iteração externa.
+        block_size: int (padrão 64)
+            Número de colunas de cada painel na decomposição em blocos.
+        dtype: tipo dos fatores (padrão np.float64)
+            Use np.float32 para decompor com metade da memória e usar refine
+            para recuperar a precisão dupla.
+        overwrite_a: bool (padrão False)
+            Permite decompor in-place, sobre o próprio a, quando ele já é um
+            array C-contíguo do tipo dtype. a passa a guardar os fatores, então
+            refine, cond, growth e update lançam ValueError.
+        check_finite: bool (padrão False)
+            Lança ValueError se a tiver inf ou nan.
         '''
 
-        self.a = np.array(a).astype(float)
-        self.pivoting = pivoting
+        self.a = as_float_array(a, check_finite=check_finite)
+        self.overwrite_a = overwrite_a
+        self.strategy = get_strategy(pivoting)
+        self.pivoting = not isinstance(self.strategy, NoPivoting)
         self.debug = debug
         self.precision = precision
+        self.block_size = block_size
+        self.dtype = dtype
         self._setUp()
         self._execute()
 
+    @property
+    def teaching(self):
+        # modo didático: decomposição passo a passo.
+        return self.debug or self.precision is not None
+
+    @property
+    def _blocked(self):
+        # a decomposição em blocos só escolhe pivôs dentro de cada coluna.
+        return type(self.strategy) in (PartialPivoting, NoPivoting)
+
+    @property
+    def p(self):
+        # matriz de permutação densa, construída a partir do vetor perm.
+        return np.identity(self.N)[self.perm]
+
+    @property
+    def q(self):
+        # permutação das colunas: PAQ = LU.
+        cperm = np.arange(self.N) if self.cperm is None else self.cperm
+        return np.identity(self.N)[:, cperm]
+
+    @property
+    def growth(self):
+        '''Fator de crescimento max |u_ij| / max |a_ij| da eliminação.'''
+        return abs(np.triu(self.LU)).max() / (abs(self._original()).max() or 1)
+
     @property
     def det(self):
         if not hasattr(self, '_det'):
@@ -59,23 +149,71 @@ class LU(Decomposition):
         return self._det
 
     def solve(self, b):
-        b = np.array(b)
-        t = successive_substitutions(self.LU, self.p @ b, diag=False)
-        x = retroactive_substitutions(self.LU, t)
+        # b pode ser um vetor ou uma matriz n x k (k lados direitos).
+        b = np.asarray(b)
+        t = solve_triangular(self.LU, b[self.perm], lower=True,
+                             unit_diagonal=True, overwrite_b=True)
+        x = solve_triangular(self.LU, t, lower=False, overwrite_b=True)
+        if self.cperm is not None:
+            x[self.cperm] = x.copy()
+        return x
+
+    def solve_transposed(self, b):
+        # PAQ = LU, então Aᵀ = QUᵀLᵀP: resolve Uᵀw = Qᵀb, Lᵀv = w e Px = v.
+        b = np.asarray(b)
+        if self.cperm is not None:
+            b = b[self.cperm]
+        t = solve_triangular(self.LU.T, b, lower=True)
+        t = solve_triangular(self.LU.T, t, lower=False, unit_diagonal=True,
+                             overwrite_b=True)
+        x = np.empty_like(t)
+        x[self.perm] = t
         return x
 
-    def inv(self):
-        out = np.zeros_like(self.LU)
-        e = np.identity(self.N)
-        for i in range(self.N):
-            out[:, i] = self.solve(e[:, i])
-        return out
+    def update(self, u, v):
+        '''
+        Atualiza os fatores para a matriz A + u vᵀ sem refazer a decomposição
+        (algoritmo de Bennett, sem nova pivotação). u e v podem ser vetores
+        ou matrizes n x k, para uma modificação de posto k.
+
+        Complexidade: O(n²k)
+        '''
+        a = self._original()
+        u = np.asarray(u, dtype=float).reshape(self.N, -1)
+        v = np.asarray(v, dtype=float).reshape(self.N, -1)
+        LU = self.LU.copy()
+        if self.cperm is not None:
+            v = v[self.cperm]
+        for x, y in zip(u[self.perm].T, v.T):
+            self._rank_one_update(LU, x.copy(), y.copy())
+        self.LU = LU
+        self.a = a + u @ v.T
+        self._invalidate()
+
+    def downdate(self, u, v):
+        '''Atualiza os fatores para a matriz A - u vᵀ. Veja update.'''
+        self.update(-np.asarray(u, dtype=float), v)
+
+    def _rank_one_update(self, LU, x, y):
+        # LU + x yᵀ, uma coluna de L e uma linha de U por vez.
+        for k in range(self.N):
+            LU[k, k] += x[k] * y[k]
+            if LU[k, k] == 0:
+                raise ZeroDivisionError(
+                    '0 as a pivot found while updating the factors.')
+            beta = y[k] / LU[k, k]
+            LU[k, k + 1:] += x[k] * y[k + 1:]
+            x[k + 1:] -= x[k] * LU[k + 1:, k]
+            LU[k + 1:, k] += beta * x[k + 1:]
+            y[k + 1:] -= beta * LU[k, k + 1:]
 
     def _setUp(self):
-        # Cria as matrizes LU e p.
+        # Cria a matriz LU e o vetor de permutação.
         self.N = self.a.shape[0]
-        self.LU = self.a.copy()
-        self.p = np.identity(self.N)
+        self.LU = writable_array(self.a, self.dtype, self.overwrite_a)
+        self.a_overwritten = self.LU is self.a
+        self.perm = np.arange(self.N)
+        self.cperm = None
 
     def _swap_rows(self, matrix, i, j):
         # troca as linhas i e j de uma matriz qualquer.
@@ -108,11 +246,11 @@ class LU(Decomposition):
         return i, pivot
 
     def _swap(self, i, j):
-        # troca as linhas da matriz LU e da matriz p.
+        # troca as linhas da matriz LU e do vetor de permutação.
         if i != j:
             self.swap_count += 1
             self._swap_rows(self.LU, i, j)
-            self._swap_rows(self.p, i, j)
+            self._swap_rows(self.perm, i, j)
 
     def _show_steps(self, current_pivot):
         # imprime todas as linhas da matriz LU começando pela linha pivotal atual.
@@ -132,10 +270,8 @@ class LU(Decomposition):
         if self.precision is not None:
             self.LU = self.LU.round(self.precision)
 
-    def _execute(self):
-        # executa a decomposição
-        self.swap_count = 0
-        self._setUp()
+    def _execute_steps(self):
+        # decomposição passo a passo (modo didático)
         for pivot_line in range(self.N):
             i, pivot = self._pick_pivot(pivot_line)
             if pivot == 0:
@@ -146,3 +282,34 @@ class LU(Decomposition):
             self._show_steps(pivot_line)
             for cur_line in range(pivot_line + 1, self.N):
                 self._apply_pivot(pivot_line, cur_line)
+
+    def _update_trailing(self, k, kb):
+        # calcula o bloco U12 = L11⁻¹ A12 e faz a atualização de posto kb do
+        # restante da matriz: A22 -= L21 @ U12.
+        stop = k + kb
+        U12 = self.LU[k:stop, stop:]
+        L11 = self.LU[k:stop, k:stop]
+        for r in range(1, kb):
+            U12[r] -= L11[r, :r] @ U12[:r]
+        self.LU[stop:, stop:] -= self.LU[stop:, k:stop] @ U12
+
+    def _execute_blocked(self):
+        # decomposição em blocos (right-looking)
+        for k in range(0, self.N, self.block_size):
+            kb = min(self.block_size, self.N - k)
+            self.swap_count += lu_panel(self.LU, k, kb, self.perm,
+                                        self.pivoting)
+            if k + kb < self.N:
+                self._update_trailing(k, kb)
+
+    def _execute(self):
+        # executa a decomposição
+        self.swap_count = 0
+        if self.teaching:
+            self._execute_steps()
+        elif self._blocked:
+            self._execute_blocked()
+        else:
+            self.cperm = np.arange(self.N)
+            self.swap_count, self.monitor = eliminate(
+                self.LU, self.strategy, self.perm, self.cperm)
@@ -0,0 +1,95 @@
+from typing import Callable
+
+import numpy as np
+
+from src.typing import Array1D, Array2D
+
+
+def norm_p(x: Array1D, p: int, axis=-1):
+    '''
+    Norma p de x ao longo de axis. Um array (..., n) é tratado como um lote
+    de vetores e retorna um array (...) com a norma de cada um; axis=None
+    usa todos os elementos.
+    '''
+    return (abs(np.asarray(x))**p).sum(axis=axis)**(1 / p)
+
+
+def norm_inf(x: Array1D, axis=-1):
+    '''Maior valor absoluto de x ao longo de axis (veja norm_p).'''
+    return abs(np.asarray(x)).max(axis=axis)
+
+
+def matrix_norm_1(A: Array2D):
+    '''
+    Maior soma absoluta das linhas. Um array (..., m, n) é tratado como um
+    lote de matrizes.
+    '''
+    return abs(np.asarray(A)).sum(axis=-1).max(axis=-1)
+
+
+def matrix_norm_inf(A: Array2D):
+    '''Maior soma absoluta das colunas (aceita lotes, veja matrix_norm_1).'''
+    return abs(np.asarray(A)).sum(axis=-2).max(axis=-1)
+
+
+def matrix_norm_frobenius(A: Array2D):
+    '''Raiz da soma dos quadrados dos elementos (aceita lotes).'''
+    return (abs(np.asarray(A))**2).sum(axis=(-2, -1))**(1 / 2)
+
+
+def condition_number(A: Array2D, A_inv: Array2D, norm: Callable[[Array2D], float]):
+    return norm(A) * norm(A_inv)
+
+
+def _sign(x):
+    # como np.sign, mas com sinal 1 para os zeros.
+    return np.where(x >= 0, 1., -1.)
+
+
+def inv_norm_estimate(dec, max_iter: int = 5):
+    '''
+    Estima a norma 1 (maior soma absoluta das colunas) de A⁻¹ pelo método de
+    Hager, com a melhoria de Higham, usando apenas solve e solve_transposed
+    da decomposição dec. A inversa nunca é formada.
+
+    A estimativa nunca passa do valor exato e costuma acertá-lo ou errar por
+    pouco.
+
+    Complexidade: O(n²) por iteração (normalmente 2 ou 3 iterações).
+    '''
+    n = dec.a.shape[0]
+    x = np.full(n, 1 / n)
+    est = 0
+    for k in range(max_iter):
+        y = dec.solve(x)
+        new_est = norm_p(y, 1)
+        if k > 0 and new_est <= est:
+            break
+        est = new_est
+        z = dec.solve_transposed(_sign(y))
+        j = abs(z).argmax()
+        if k > 0 and abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n)
+        x[j] = 1
+    # vetor alternativo de Higham, para matrizes em que as iterações
+    # acima ficam presas em um máximo local.
+    alt = (-1)**np.arange(n) * (1 + np.arange(n) / max(n - 1, 1))
+    return max(est, 2 * norm_p(dec.solve(alt), 1) / (3 * n))
+
+
+def condition_estimate(dec, max_iter: int = 5):
+    '''
+    Estima o número de condição ‖A‖₁‖A⁻¹‖₁ (norma das colunas) reaproveitando
+    uma decomposição (LU, Cholesky, LDLt) já feita.
+
+    Uso:
+    >>> import numpy as np
+    >>> from src.linalg.lu import LU
+    >>> A = np.array([[1., 2.], [3., 4.]])
+    >>> round(float(condition_estimate(LU(A))), 6)
+    21.0
+
+    Complexidade: O(n²)
+    '''
+    return matrix_norm_inf(dec.a) * inv_norm_estimate(dec, max_iter)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.linalg.sparse import CSR
+
+
+class LinearOperator:
+    '''
+    Operador linear definido apenas pelo produto matriz-vetor, sem que a
+    matriz precise existir (matrix-free).
+
+    Uso:
+    >>> import numpy as np
+    >>> laplace = LinearOperator((3, 3), lambda x: 2 * x - np.roll(x, 1) - np.roll(x, -1))
+    >>> laplace @ np.array([1., 2., 3.])
+    array([-3.,  0.,  3.])
+    '''
+
+    def __init__(self, shape, matvec):
+        '''
+        Parâmetros:
+        shape: tuple
+            Formato (n, m) da matriz representada.
+        matvec: função
+            Recebe um vetor de tamanho m e retorna o produto, de tamanho n.
+        '''
+        self.shape = tuple(shape)
+        self.matvec = matvec
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+
+def aslinearoperator(a):
+    '''Retorna a (np.array 2d, CSR ou LinearOperator) como LinearOperator.'''
+    if isinstance(a, LinearOperator):
+        return a
+    if not isinstance(a, CSR):
+        a = np.asarray(a)
+    return LinearOperator(a.shape, a.__matmul__)
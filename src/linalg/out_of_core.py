@@ -0,0 +1,226 @@
+import os
+import tempfile
+import weakref
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from src.linalg.core import Decomposition
+from src.linalg.lu import lu_panel
+from src.linalg.triangular import solve_triangular
+
+
+_DEFAULT_PANEL_SIZE = 512
+
+
+def _open_matrix(a):
+    # um caminho para um arquivo .npy é aberto sem ser carregado na memória.
+    if isinstance(a, (str, os.PathLike)):
+        a = np.load(a, mmap_mode='r')
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError('a must be a square matrix.')
+    return a
+
+
+class OutOfCoreLU(Decomposition):
+    '''
+    Decomposição LU com pivotação parcial de uma matriz que não cabe na
+    memória. A matriz (um np.memmap ou o caminho de um arquivo .npy) é lida
+    em painéis de panel_size colunas e os fatores são escritos em um arquivo
+    .npy mapeado em memória (out, ou um arquivo temporário), de forma que
+    só alguns painéis n x panel_size ficam na memória ao mesmo tempo.
+
+    A decomposição é left-looking: cada painel recebe as atualizações de
+    todos os painéis anteriores, lidos do arquivo, e depois é fatorado com
+    lu_panel. Para que as trocas de linhas não precisem reescrever os
+    painéis já gravados, a linha r da matriz permutada fica guardada na
+    linha perm[r] do arquivo (a linha original).
+
+    Uso:
+    >>> import numpy as np
+    >>> A = np.array([[1., -3, 2], [-2, 8, -1], [4, -6, 5]])
+    >>> dec = OutOfCoreLU(A, panel_size=2)
+    >>> round(float(dec.det), 6)
+    -24.0
+    >>> dec.solve(A @ [1., 2, 3])
+    array([1., 2., 3.])
+
+    Complexidade: O(n³) operações e O(n³ / panel_size) elementos lidos.
+    '''
+
+    def __init__(self, a, out=None, panel_size=_DEFAULT_PANEL_SIZE,
+                 dtype=np.float64):
+        '''
+        Parâmetros:
+        a: np.memmap, np.array 2d ou caminho de um arquivo .npy
+            Matriz a ser decomposta. Não é copiada nem modificada.
+        out: caminho (padrão None)
+            Arquivo .npy onde os fatores são gravados. Se None, usa um
+            arquivo temporário, guardado em self.path e apagado quando o
+            objeto é liberado.
+        panel_size: int (padrão 512)
+            Número de colunas lidas e fatoradas de cada vez.
+        dtype: tipo dos fatores (padrão np.float64)
+        '''
+        self.a = _open_matrix(a)
+        self.n = self.a.shape[0]
+        self.panel_size = panel_size
+        self.dtype = dtype
+        self.out = out
+        self._setUp()
+        self._execute()
+
+    def _setUp(self):
+        self._open_factors()
+        self.perm = np.arange(self.n)
+        self.swap_count = 0
+
+    def _open_factors(self):
+        # arquivo .npy mapeado em memória que recebe os fatores. O arquivo
+        # temporário é apagado quando o objeto é liberado.
+        if self.out is not None:
+            self.path = self.out
+        elif not hasattr(self, '_cleanup'):
+            fd, self.path = tempfile.mkstemp(suffix='.npy')
+            os.close(fd)
+            self._cleanup = weakref.finalize(self, os.unlink, self.path)
+        self.F = open_memmap(self.path, mode='w+', dtype=self.dtype,
+                             shape=(self.n, self.n))
+
+    def _panels(self):
+        for c0 in range(0, self.n, self.panel_size):
+            yield c0, min(c0 + self.panel_size, self.n)
+
+    def _apply_previous(self, P, c0):
+        # aplica ao painel P os painéis já fatorados (colunas < c0).
+        for j0, j1 in self._panels():
+            if j0 >= c0:
+                break
+            L = self.F[self.perm[j0:], j0:j1]
+            P[j0:j1] = solve_triangular(L[:j1 - j0], P[j0:j1], lower=True,
+                                        unit_diagonal=True, overwrite_b=True)
+            P[j1:] -= L[j1 - j0:] @ P[j0:j1]
+
+    def _execute(self):
+        for c0, c1 in self._panels():
+            P = np.array(self.a[self.perm, c0:c1], dtype=self.dtype)
+            self._apply_previous(P, c0)
+            self.swap_count += lu_panel(P[c0:], 0, c1 - c0, self.perm[c0:])
+            self.F[self.perm, c0:c1] = P
+        self.F.flush()
+
+    @property
+    def det(self):
+        if not hasattr(self, '_det'):
+            diag = self.F[self.perm, np.arange(self.n)]
+            self._det = diag.prod() * (-1) ** self.swap_count
+        return self._det
+
+    def solve(self, b):
+        '''
+        Resolve Ax = b lendo os fatores do arquivo, um painel de colunas por
+        vez. b pode ser um vetor ou uma matriz n x k.
+        '''
+        x = np.array(np.asarray(b)[self.perm], dtype=float)
+        for j0, j1 in self._panels():
+            L = self.F[self.perm[j0:], j0:j1]
+            x[j0:j1] = solve_triangular(L[:j1 - j0], x[j0:j1], lower=True,
+                                        unit_diagonal=True, overwrite_b=True)
+            x[j1:] -= L[j1 - j0:] @ x[j0:j1]
+        for j0, j1 in reversed(list(self._panels())):
+            U = self.F[self.perm[:j1], j0:j1]
+            x[j0:j1] = solve_triangular(U[j0:], x[j0:j1], lower=False,
+                                        overwrite_b=True)
+            x[:j0] -= U[:j0] @ x[j0:j1]
+        return x
+
+    def solve_transposed(self, b):
+        '''
+        Resolve Aᵀx = b com os mesmos fatores: PA = LU, então Uᵀw = b,
+        Lᵀv = w e x = Pᵀv, lendo um painel de colunas por vez.
+        '''
+        x = np.array(b, dtype=float)
+        for j0, j1 in self._panels():
+            U = self.F[self.perm[:j1], j0:j1]
+            x[j0:j1] -= U[:j0].T @ x[:j0]
+            x[j0:j1] = solve_triangular(U[j0:].T, x[j0:j1], lower=True,
+                                        overwrite_b=True)
+        for j0, j1 in reversed(list(self._panels())):
+            L = self.F[self.perm[j0:], j0:j1]
+            x[j0:j1] -= L[j1 - j0:].T @ x[j1:]
+            x[j0:j1] = solve_triangular(L[:j1 - j0].T, x[j0:j1], lower=False,
+                                        unit_diagonal=True, overwrite_b=True)
+        y = np.empty_like(x)
+        y[self.perm] = x
+        return y
+
+
+class OutOfCoreCholesky(OutOfCoreLU):
+    '''
+    Decomposição de Cholesky de uma matriz simétrica definida positiva que
+    não cabe na memória, com a mesma organização em painéis de OutOfCoreLU.
+    Só a parte triangular inferior de a é lida, e o fator L é gravado no
+    arquivo sem permutação.
+
+    Como os fatores são gravados em um arquivo de números reais, uma matriz
+    que não é definida positiva gera um ValueError (Cholesky passaria a
+    usar números complexos).
+
+    Complexidade: O(n³/3) operações e O(n³ / panel_size) elementos lidos.
+    '''
+
+    def _setUp(self):
+        self._open_factors()
+
+    def _factor_panel(self, P, c0):
+        # P: colunas c0..c1 a partir da linha c0, já atualizadas.
+        for j in range(P.shape[1]):
+            row = P[j, :j]
+            d = P[j, j] - row @ row
+            if not d > 0:
+                raise ValueError(
+                    f'Matrix is not positive definite (pivot {c0 + j}).')
+            P[j, j] = d ** 0.5
+            P[j + 1:, j] -= P[j + 1:, :j] @ row
+            P[j + 1:, j] /= P[j, j]
+            P[j, j + 1:] = 0
+
+    def _execute(self):
+        for c0, c1 in self._panels():
+            P = np.array(self.a[c0:, c0:c1], dtype=self.dtype)
+            for j0, j1 in self._panels():
+                if j0 >= c0:
+                    break
+                L = self.F[c0:, j0:j1]
+                P -= L @ L[:c1 - c0].T
+            self._factor_panel(P, c0)
+            self.F[c0:, c0:c1] = P
+        self.F.flush()
+
+    @property
+    def det(self):
+        if not hasattr(self, '_det'):
+            self._det = self.F.diagonal().prod()**2
+        return self._det
+
+    def solve(self, b):
+        '''
+        Resolve Ax = b = LLᵀx lendo L do arquivo, um painel de colunas por
+        vez. b pode ser um vetor ou uma matriz n x k.
+        '''
+        x = np.array(b, dtype=float)
+        for j0, j1 in self._panels():
+            L = np.asarray(self.F[j0:, j0:j1])
+            x[j0:j1] = solve_triangular(L[:j1 - j0], x[j0:j1], lower=True,
+                                        overwrite_b=True)
+            x[j1:] -= L[j1 - j0:] @ x[j0:j1]
+        for j0, j1 in reversed(list(self._panels())):
+            L = np.asarray(self.F[j0:, j0:j1])
+            x[j0:j1] -= L[j1 - j0:].T @ x[j1:]
+            x[j0:j1] = solve_triangular(L[:j1 - j0].T, x[j0:j1], lower=False,
+                                        overwrite_b=True)
+        return x
+
+    def solve_transposed(self, b):
+        # A é simétrica.
+        return self.solve(b)
@@ -0,0 +1,172 @@
+import abc
+
+import numpy as np
+
+
+class GrowthMonitor:
+    '''
+    Acompanha o fator de crescimento da eliminação de Gauss,
+        ρ = max |u_ij| / max |a_ij|,
+    a partir das linhas de U à medida que ficam prontas (O(n) por passo).
+    Um ρ grande indica que a pivotação escolhida está perdendo precisão.
+    '''
+
+    def __init__(self, a):
+        self.max_a = abs(a).max() or 1.
+        self.max_u = 0.
+
+    def update(self, row):
+        if len(row):
+            self.max_u = max(self.max_u, abs(row).max())
+
+    @property
+    def growth(self):
+        return self.max_u / self.max_a
+
+
+class PivotingStrategy(abc.ABC):
+    '''
+    Estratégia de pivotação: choose(a, k, monitor) retorna a linha e a
+    coluna (i, j), com i, j >= k, do pivô do passo k da eliminação sobre a
+    submatriz ativa a[k:, k:]. column_pivoting indica se a estratégia pode
+    trocar colunas.
+    '''
+    column_pivoting = False
+
+    def reset(self):
+        # chamado no início de cada eliminação.
+        pass
+
+    @abc.abstractmethod
+    def choose(self, a, k, monitor=None):
+        pass
+
+
+class NoPivoting(PivotingStrategy):
+    def choose(self, a, k, monitor=None):
+        return k, k
+
+
+class PartialPivoting(PivotingStrategy):
+    '''Maior valor absoluto da coluna k. Complexidade: O(n) por passo.'''
+
+    def choose(self, a, k, monitor=None):
+        return k + int(abs(a[k:, k]).argmax()), k
+
+
+class RookPivoting(PivotingStrategy):
+    '''
+    Pivotação "torre": alterna buscas na coluna e na linha até achar um
+    elemento que seja o maior, em valor absoluto, da sua linha e da sua
+    coluna. Dá quase a estabilidade da pivotação completa; na prática cada
+    passo faz poucas buscas, O(n) cada.
+    '''
+    column_pivoting = True
+
+    def choose(self, a, k, monitor=None):
+        j = k
+        i = k + int(abs(a[k:, j]).argmax())
+        while True:
+            j_new = k + int(abs(a[i, k:]).argmax())
+            if abs(a[i, j_new]) <= abs(a[i, j]):
+                return i, j
+            j = j_new
+            i_new = k + int(abs(a[k:, j]).argmax())
+            if abs(a[i_new, j]) <= abs(a[i, j]):
+                return i, j
+            i = i_new
+
+
+class CompletePivoting(PivotingStrategy):
+    '''Maior valor absoluto de toda a submatriz ativa. O(n²) por passo.'''
+    column_pivoting = True
+
+    def choose(self, a, k, monitor=None):
+        sub = abs(a[k:, k:])
+        i, j = np.unravel_index(sub.argmax(), sub.shape)
+        return k + int(i), k + int(j)
+
+
+class AdaptivePivoting(PivotingStrategy):
+    '''
+    Começa com a estratégia first e passa para then (até o fim da
+    eliminação) assim que o fator de crescimento passar de threshold.
+    switched_at guarda o passo em que a troca aconteceu (ou None).
+    '''
+    column_pivoting = True
+
+    def __init__(self, first=None, then=None, threshold=1e3):
+        self.first = first or PartialPivoting()
+        self.then = then or RookPivoting()
+        self.threshold = threshold
+        self.switched_at = None
+
+    def reset(self):
+        self.switched_at = None
+
+    def choose(self, a, k, monitor=None):
+        if self.switched_at is None and monitor is not None and \
+                monitor.growth > self.threshold:
+            self.switched_at = k
+        strategy = self.first if self.switched_at is None else self.then
+        return strategy.choose(a, k, monitor)
+
+
+_STRATEGIES = {
+    'none': NoPivoting,
+    'partial': PartialPivoting,
+    'rook': RookPivoting,
+    'complete': CompletePivoting,
+    'adaptive': AdaptivePivoting,
+}
+
+
+def get_strategy(pivoting):
+    '''
+    Converte o parâmetro pivoting de gauss e LU em uma estratégia: True
+    (parcial), False (nenhuma), um dos nomes 'none', 'partial', 'rook',
+    'complete' e 'adaptive', ou uma PivotingStrategy, retornada como está.
+    '''
+    if isinstance(pivoting, PivotingStrategy):
+        return pivoting
+    if isinstance(pivoting, str):
+        if pivoting not in _STRATEGIES:
+            raise ValueError(f'Unknown pivoting strategy {pivoting!r}.')
+        return _STRATEGIES[pivoting]()
+    return PartialPivoting() if pivoting else NoPivoting()
+
+
+def eliminate(a, strategy, perm, cperm=None):
+    '''
+    Decomposição LU in-place da matriz quadrada a, com pivôs escolhidos por
+    strategy: os multiplicadores (L) ficam abaixo da diagonal e U no resto.
+    As trocas de linhas e colunas são registradas em perm e cperm (cperm é
+    obrigatório se a estratégia trocar colunas).
+
+    Retorna (número de trocas, GrowthMonitor).
+    Complexidade: O(n³)
+    '''
+    n = a.shape[0]
+    monitor = GrowthMonitor(a)
+    strategy.reset()
+    swaps = 0
+    for k in range(n):
+        i, j = strategy.choose(a, k, monitor)
+        if i != k:
+            a[[i, k]] = a[[k, i]]
+            perm[[i, k]] = perm[[k, i]]
+            swaps += 1
+        if j != k:
+            a[:, [j, k]] = a[:, [k, j]]
+            cperm[[j, k]] = cperm[[k, j]]
+            swaps += 1
+        monitor.update(a[k, k:])
+        pivot = a[k, k]
+        if pivot == 0:
+            if isinstance(strategy, NoPivoting):
+                raise ZeroDivisionError(
+                    '0 as a pivot found. Please try setting pivoting=True.')
+            continue
+        a[k + 1:, k] /= pivot
+        a[k + 1:, k + 1:] -= np.outer(a[k + 1:, k], a[k, k + 1:])
+    return swaps, monitor
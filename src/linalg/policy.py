@@ -0,0 +1,102 @@
+import contextlib
+
+import numpy as np
+
+
+class CopyCounter:
+    '''Bytes e número de cópias feitas enquanto o contador está ativo.'''
+
+    def __init__(self):
+        self.bytes = 0
+        self.copies = 0
+
+    def __repr__(self):
+        return f'CopyCounter(bytes={self.bytes}, copies={self.copies})'
+
+
+_active_counters = []
+
+
+@contextlib.contextmanager
+def count_copies():
+    '''
+    Conta as cópias de matrizes e vetores feitas pelos construtores e
+    métodos de src.linalg dentro do bloco with.
+
+    Uso:
+    >>> import numpy as np
+    >>> from src.linalg.lu import LU
+    >>> A = np.identity(100)
+    >>> with count_copies() as counter:
+    ...     dec = LU(A)
+    >>> counter.copies, counter.bytes
+    (1, 80000)
+    >>> with count_copies() as counter:
+    ...     dec = LU(A, overwrite_a=True)
+    >>> counter.copies
+    0
+    '''
+    counter = CopyCounter()
+    _active_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        _active_counters.remove(counter)
+
+
+def record_copy(nbytes):
+    '''
+    Registra nos contadores ativos uma cópia de nbytes, para rotinas que
+    montam a própria área de trabalho (como a matriz aumentada de gauss).
+    '''
+    for counter in _active_counters:
+        counter.bytes += nbytes
+        counter.copies += 1
+
+
+def _copy(a, dtype):
+    out = np.array(a, dtype=dtype, order='C')
+    record_copy(out.nbytes)
+    return out
+
+
+def check_finite_array(a):
+    '''Lança ValueError se a tiver inf ou nan.'''
+    if not np.isfinite(a).all():
+        raise ValueError('array must not contain infs or NaNs.')
+
+
+def as_float_array(a, dtype=None, check_finite=False):
+    '''
+    Retorna a como um array de ponto flutuante (ou complexo) para ser apenas
+    lido. Não faz cópia se a já for um array desse tipo; inteiros são
+    convertidos para dtype (padrão float64).
+
+    check_finite: se True, lança ValueError caso a tenha inf ou nan.
+    '''
+    a = np.asarray(a)
+    if dtype is None:
+        dtype = a.dtype if a.dtype.kind in 'fc' else np.float64
+    if a.dtype != dtype:
+        a = _copy(a, dtype)
+    if check_finite:
+        check_finite_array(a)
+    return a
+
+
+def writable_array(a, dtype=np.float64, overwrite=False, check_finite=False):
+    '''
+    Retorna um array C-contíguo de dtype que pode ser modificado, para ser
+    usado como área de trabalho de uma decomposição in-place.
+
+    Com overwrite=True, o próprio a é usado (e destruído) se já for
+    C-contíguo, gravável e do tipo dtype; caso contrário, ou com
+    overwrite=False, é feita uma cópia.
+    '''
+    a = np.asarray(a)
+    if not (overwrite and a.dtype == dtype and a.flags.c_contiguous
+            and a.flags.writeable):
+        a = _copy(a, dtype)
+    if check_finite:
+        check_finite_array(a)
+    return a
@@ -1,22 +1,122 @@
+import math
+
 import numpy as np
 
 from src.linalg.gauss_seidel import GaussSeidel
+from src.linalg.policy import record_copy
 
 
 class SOR(GaussSeidel):
     # metodo da sobre-relaxação sucessiva (successive over-relaxation)
 
-    def __init__(self, a: np.ndarray, omega, *args, **kwargs):
-        self.omega = omega
+    def __init__(self, a: np.ndarray, omega=None, *args, power_steps=30,
+                 tune_every=10, **kwargs):
+        '''
+        Parâmetros (além dos de GaussSeidel):
+        omega: float ou None (padrão None)
+            Fator de relaxação. Se None, usa o modo adaptativo: o raio
+            espectral ρ da matriz de iteração de Jacobi é estimado com
+            power_steps passos do método das potências e omega recebe o
+            valor ótimo 2 / (1 + √(1 - ρ²)). Durante solve, a cada
+            tune_every iterações a contração observada do erro corrige a
+            estimativa de ρ (e omega). predicted_iter guarda a previsão do
+            número de iterações para atingir max_err.
+
+            O valor ótimo supõe autovalores de Jacobi reais (matrizes
+            simétricas definidas positivas com ordenação consistente, como
+            as de diferenças finitas). Se ρ ≥ 1, o método não converge e o
+            construtor lança ValueError.
+        '''
+        self.adaptive = omega is None
+        self.omega = 1. if self.adaptive else omega
+        self.power_steps = power_steps
+        self.tune_every = tune_every
         super().__init__(a, *args, **kwargs)
+        if self.adaptive:
+            self.rho = self._estimate_radius()
+            if self.rho >= 1:
+                raise ValueError(
+                    f'Jacobi iteration matrix has spectral radius '
+                    f'{self.rho:.4g} >= 1; SOR would not converge.')
+            self._set_omega(self._optimal_omega(self.rho))
+            self.predicted_iter = self._predict(0, 1.)
 
     def _build_M(self):
-        self.M = self.a.copy().astype(float)
-        for i in range(self.n):
-            self.M[i] /= -self.a[i, i]
-            self.M[i] *= self.omega
-            self.M[i, i] = 0
+        if self.sparse:
+            d = self.a.diagonal()
+            self.M = self.a.without_diagonal().scale_rows(-self.omega / d)
+            record_copy(self.M.data.nbytes + self.M.indices.nbytes +
+                        self.M.indptr.nbytes)
+            return
+        self.M = self.a * (-self.omega / self.a.diagonal()[:, None])
+        np.fill_diagonal(self.M, 0)
+        record_copy(self.M.nbytes)
+
+    def _estimate_radius(self):
+        # método das potências na matriz de Jacobi M / omega. A razão de
+        # dois passos ||M²x|| / ||x|| converge para ρ² mesmo quando os
+        # autovalores dominantes são ±ρ, o que é comum nesse caso.
+        x = np.random.default_rng(0).standard_normal(self.n)
+        x /= np.linalg.norm(x)
+        norms = [0., 0.]
+        for _ in range(self.power_steps):
+            y = (self.M @ x) / self.omega
+            norms.append(np.linalg.norm(y))
+            if norms[-1] == 0:
+                return 0.
+            x = y / norms[-1]
+        return math.sqrt(norms[-1] * norms[-2])
+
+    @staticmethod
+    def _optimal_omega(rho):
+        return 2 / (1 + math.sqrt(1 - rho**2))
+
+    def _set_omega(self, omega):
+        # M é proporcional a omega: basta reescalá-la, in-place.
+        factor = omega / self.omega
+        if self.sparse:
+            self.M.data *= factor
+        else:
+            self.M *= factor
+        self.omega = omega
+        self._build_classes()
+
+    def _predict(self, start, err):
+        # com o omega ótimo, o erro cai pelo fator omega - 1 a cada iteração.
+        contraction = max(self.omega - 1, 1e-16)
+        steps = math.log(self.max_err / err) / math.log(contraction)
+        return start + max(0, math.ceil(steps))
+
+    def _tune(self):
+        if not self.adaptive:
+            return
+        if self.iter == 0:
+            self._errs = []
+        self._errs.append(self.err)
+        k = self.tune_every
+        if len(self._errs) <= 2 * k or self.iter % k or \
+                not all(self._errs[-1 - 2 * k::k]):
+            return
+        q = (self._errs[-1] / self._errs[-1 - k]) ** (1 / k)
+        last_q = (self._errs[-1 - k] / self._errs[-1 - 2 * k]) ** (1 / k)
+        if abs(q - last_q) > 0.1 * (1 - q) or \
+                not (self.omega - 1) ** 0.75 < q < 1:
+            # a contração ainda não se estabilizou, ou omega já é (quase)
+            # o ótimo (o erro cai pelo fator omega - 1).
+            return
+        # relação de Young entre um autovalor λ de SOR e um μ de Jacobi:
+        # (λ + ω - 1)² = λω²μ². Com λ = q (contração observada), o μ
+        # correspondente é uma estimativa melhor de ρ se for maior.
+        mu = (q + self.omega - 1) / (self.omega * math.sqrt(q))
+        if self.rho < mu < 1:
+            self.rho = mu
+            self._set_omega(self._optimal_omega(mu))
+            self.predicted_iter = self._predict(self.iter, self.err)
 
     def _calc_xi(self, i):
-        self.x[i] = self.M[i] @ self.x + self.b[i]
-        self.x[i] += (1 - self.omega) * self.x[i]
+        self.x[i] = (1 - self.omega) * self.x[i] + self._row_dot(i) + \
+            self.omega * self.b[i]
+
+    def _calc_block(self, idx, rows):
+        self.x[idx] = (1 - self.omega) * self.x[idx] + rows @ self.x + \
+            self.omega * self.b[idx]
@@ -0,0 +1,126 @@
+import numpy as np
+
+from src.typing import Array1D, Array2D
+
+
+class CSR:
+    '''
+    Matriz esparsa no formato CSR (compressed sparse row), guardada em três
+    arrays do NumPy:
+        data: valores não nulos, linha por linha
+        indices: coluna de cada valor em data
+        indptr: os valores da linha i estão em data[indptr[i]:indptr[i+1]]
+
+    Todas as operações custam O(nnz), onde nnz é o número de não nulos.
+
+    Uso:
+    >>> import numpy as np
+    >>> A = CSR.from_dense(np.array([[4, -1, 0], [-1, 4, -1], [0, -1, 4]]))
+    >>> A.nnz
+    7
+    >>> A @ np.array([1, 1, 1])
+    array([3., 2., 3.])
+    '''
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.shape = tuple(shape)
+        if len(self.indptr) != self.shape[0] + 1:
+            raise ValueError('indptr must have one entry per row plus one.')
+        if len(self.data) != len(self.indices) or \
+                len(self.data) != self.indptr[-1]:
+            raise ValueError('data and indices must have indptr[-1] entries.')
+
+    @classmethod
+    def from_coo(cls, rows, cols, data, shape):
+        '''
+        Monta a matriz a partir de triplas (linha, coluna, valor). Entradas
+        repetidas são somadas.
+        '''
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        data = np.asarray(data, dtype=float)
+        order = np.lexsort((cols, rows))
+        rows, cols, data = rows[order], cols[order], data[order]
+        if len(rows):
+            first = np.ones(len(rows), dtype=bool)
+            first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            data = np.bincount(np.cumsum(first) - 1, weights=data)
+            rows, cols = rows[first], cols[first]
+        indptr = np.zeros(shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(data, cols, indptr, shape)
+
+    @classmethod
+    def from_dense(cls, a: Array2D):
+        a = np.asarray(a)
+        rows, cols = np.nonzero(a)
+        return cls.from_coo(rows, cols, a[rows, cols], a.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def row_ids(self):
+        # linha de cada valor em data.
+        if not hasattr(self, '_row_ids'):
+            self._row_ids = np.repeat(np.arange(self.shape[0]),
+                                      np.diff(self.indptr))
+        return self._row_ids
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __matmul__(self, x):
+        x = np.asarray(x)
+        if x.ndim == 1:
+            return np.bincount(self.row_ids, weights=self.data * x[self.indices],
+                               minlength=self.shape[0])
+        return np.stack([self @ col for col in x.T], axis=1)
+
+    def row_dot(self, i: int, x: Array1D):
+        '''Produto da linha i pelo vetor x.'''
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return self.data[start:stop] @ x[self.indices[start:stop]]
+
+    def take_rows(self, rows):
+        '''Retorna uma nova matriz formada pelas linhas `rows`, nessa ordem.'''
+        rows = np.asarray(rows, dtype=np.intp)
+        starts, stops = self.indptr[rows], self.indptr[rows + 1]
+        lengths = stops - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = np.repeat(starts - indptr[:-1], lengths) + \
+            np.arange(indptr[-1])
+        return CSR(self.data[positions], self.indices[positions], indptr,
+                   (len(rows), self.shape[1]))
+
+    def diagonal(self):
+        out = np.zeros(min(self.shape))
+        mask = self.indices == self.row_ids
+        out[self.row_ids[mask]] = self.data[mask]
+        return out
+
+    def abs_row_sums(self):
+        '''Soma dos valores absolutos de cada linha.'''
+        return np.bincount(self.row_ids, weights=abs(self.data),
+                           minlength=self.shape[0])
+
+    def scale_rows(self, s: Array1D):
+        '''Retorna uma nova matriz com a linha i multiplicada por s[i].'''
+        return CSR(self.data * np.asarray(s)[self.row_ids], self.indices,
+                   self.indptr, self.shape)
+
+    def without_diagonal(self):
+        '''Retorna uma nova matriz sem os elementos da diagonal.'''
+        keep = self.indices != self.row_ids
+        return CSR.from_coo(self.row_ids[keep], self.indices[keep],
+                            self.data[keep], self.shape)
+
+    def toarray(self):
+        out = np.zeros(self.shape)
+        out[self.row_ids, self.indices] = self.data
+        return out
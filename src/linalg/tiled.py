@@ -0,0 +1,223 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from src.linalg.cholesky import Cholesky
+from src.linalg.lu import LU, lu_panel
+from src.linalg.triangular import solve_triangular
+
+
+_DEFAULT_TILE_SIZE = 128
+
+
+class TaskGraph:
+    '''
+    Grafo de tarefas com dependências (DAG), executado em um pool de threads.
+    Uma tarefa só começa quando todas as suas dependências terminaram; as
+    tarefas independentes rodam ao mesmo tempo. Como o produto de matrizes
+    do NumPy libera o GIL, as atualizações de blocos diferentes de uma
+    matriz rodam de fato em paralelo.
+
+    Uso:
+    >>> g = TaskGraph()
+    >>> out = []
+    >>> a = g.add(out.append, 1)
+    >>> b = g.add(out.append, 2, deps=[a])
+    >>> g.run(workers=2)
+    >>> out
+    [1, 2]
+    '''
+
+    def __init__(self):
+        self.tasks = []
+        self.waiting = []
+        self.children = []
+
+    def add(self, fn, *args, deps=()):
+        '''
+        Adiciona a tarefa fn(*args), que depende das tarefas deps (ids
+        retornados por add; None é ignorado). Retorna o id da tarefa.
+        '''
+        tid = len(self.tasks)
+        deps = {d for d in deps if d is not None}
+        self.tasks.append((fn, args))
+        self.waiting.append(len(deps))
+        self.children.append([])
+        for d in deps:
+            self.children[d].append(tid)
+        return tid
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def run(self, workers=1):
+        '''Executa todas as tarefas. Uma exceção em uma tarefa é relançada.'''
+        if workers == 1:
+            # as dependências sempre são adicionadas antes das dependentes.
+            for fn, args in self.tasks:
+                fn(*args)
+            return
+        waiting = list(self.waiting)
+        with ThreadPoolExecutor(workers) as pool:
+            running = {}
+
+            def submit(tid):
+                fn, args = self.tasks[tid]
+                running[pool.submit(fn, *args)] = tid
+
+            for tid in range(len(self.tasks)):
+                if waiting[tid] == 0:
+                    submit(tid)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tid = running.pop(future)
+                    future.result()
+                    for child in self.children[tid]:
+                        waiting[child] -= 1
+                        if waiting[child] == 0:
+                            submit(child)
+
+
+def _tiles(n, tile_size):
+    return [slice(k, min(k + tile_size, n)) for k in range(0, n, tile_size)]
+
+
+class TiledCholesky(Cholesky):
+    '''
+    Decomposição de Cholesky em blocos (tiles) de tile_size x tile_size,
+    feita por um TaskGraph com workers threads. As tarefas são:
+        POTRF: Cholesky de um bloco da diagonal
+        TRSM: L[i, k] = A[i, k] L[k, k]⁻ᵀ para os blocos abaixo dele
+        GEMM: A[i, j] -= L[i, k] L[j, k]ᵀ no restante da matriz
+
+    O resultado é o mesmo L de Cholesky, com os mesmos solve e det. A matriz
+    precisa ser definida positiva (os blocos são reais).
+
+    Complexidade: ~n³/3, dividido entre as threads.
+    '''
+
+    def __init__(self, a, tile_size=_DEFAULT_TILE_SIZE, workers=None,
+                 **kwargs):
+        '''
+        Parâmetros (além dos de Cholesky):
+        tile_size: int (padrão 128)
+            Tamanho dos blocos.
+        workers: int (padrão os.cpu_count())
+            Número de threads.
+        '''
+        self.tile_size = tile_size
+        self.workers = workers or os.cpu_count()
+        super().__init__(a, **kwargs)
+
+    def _potrf(self, k):
+        L = self.L[k, k]
+        dec = Cholesky(L, dtype=self.L.dtype)
+        if dec.L.dtype.kind == 'c':
+            raise ValueError('Matrix is not positive definite.')
+        L[...] = dec.L
+
+    def _trsm(self, i, k):
+        self.L[i, k] = solve_triangular(self.L[k, k], self.L[i, k].T,
+                                        lower=True).T
+
+    def _gemm(self, i, j, k):
+        self.L[i, j] -= self.L[i, k] @ self.L[j, k].T
+
+    def _execute(self):
+        if self.precision is not None:
+            return super()._execute()
+        tiles = _tiles(self.n, self.tile_size)
+        graph = TaskGraph()
+        last = {}
+        for k, tk in enumerate(tiles):
+            potrf = graph.add(self._potrf, tk, deps=[last.get((k, k))])
+            for i in range(k + 1, len(tiles)):
+                last[i, k] = graph.add(self._trsm, tiles[i], tk,
+                                       deps=[potrf, last.get((i, k))])
+            for i in range(k + 1, len(tiles)):
+                for j in range(k + 1, i + 1):
+                    last[i, j] = graph.add(
+                        self._gemm, tiles[i], tiles[j], tk,
+                        deps=[last[i, k], last[j, k], last.get((i, j))])
+        graph.run(self.workers)
+        self.L[np.triu_indices(self.n, 1)] = 0
+
+
+class TiledLU(LU):
+    '''
+    Decomposição LU com pivotação parcial em blocos de tile_size colunas,
+    feita por um TaskGraph com workers threads. Para cada bloco de colunas k:
+        GETRF: fatora o painel (todas as linhas abaixo da diagonal) com
+            lu_panel, escolhendo os pivôs
+        SWP + TRSM: aplica as trocas de linhas do painel a um bloco de
+            colunas à direita e calcula U[k, j] = L[k, k]⁻¹ A[k, j]
+        GEMM: A[i, j] -= L[i, k] U[k, j] em cada bloco restante
+
+    As trocas de linhas nos blocos à esquerda do painel são aplicadas no
+    final. O resultado tem os mesmos LU, perm, solve e det de LU.
+
+    Complexidade: ~2n³/3, dividido entre as threads.
+    '''
+
+    def __init__(self, a, tile_size=_DEFAULT_TILE_SIZE, workers=None,
+                 **kwargs):
+        '''
+        Parâmetros (além dos de LU):
+        tile_size: int (padrão 128)
+            Tamanho dos blocos.
+        workers: int (padrão os.cpu_count())
+            Número de threads.
+        '''
+        self.tile_size = tile_size
+        self.workers = workers or os.cpu_count()
+        super().__init__(a, **kwargs)
+
+    def _getrf(self, k, tk):
+        start = tk.start
+        old = self.perm[start:].copy()
+        self.swap_count += lu_panel(self.LU[start:, tk], 0, tk.stop - start,
+                                    self.perm[start:], self.pivoting)
+        # posição (a partir de start) de onde veio cada linha do painel.
+        pos = np.empty(self.N, dtype=np.intp)
+        pos[old] = np.arange(len(old))
+        self._swaps[k] = pos[self.perm[start:]]
+
+    def _swap_trsm(self, k, tk, tj):
+        start = tk.start
+        block = self.LU[start:, tj]
+        block[...] = block[self._swaps[k]]
+        self.LU[tk, tj] = solve_triangular(self.LU[tk, tk], self.LU[tk, tj],
+                                           lower=True, unit_diagonal=True)
+
+    def _gemm(self, ti, tj, tk):
+        self.LU[ti, tj] -= self.LU[ti, tk] @ self.LU[tk, tj]
+
+    def _execute_tiled(self):
+        tiles = _tiles(self.N, self.tile_size)
+        self._swaps = {}
+        graph = TaskGraph()
+        last = {}
+        for k, tk in enumerate(tiles):
+            getrf = graph.add(self._getrf, k, tk, deps=[
+                last.get((i, k)) for i in range(k, len(tiles))])
+            for j in range(k + 1, len(tiles)):
+                last[k, j] = graph.add(self._swap_trsm, k, tk, tiles[j], deps=[
+                    getrf, *(last.get((i, j)) for i in range(k, len(tiles)))])
+            for j in range(k + 1, len(tiles)):
+                for i in range(k + 1, len(tiles)):
+                    last[i, j] = graph.add(
+                        self._gemm, tiles[i], tiles[j], tk,
+                        deps=[getrf, last[k, j], last.get((i, j))])
+        graph.run(self.workers)
+        for k, tk in enumerate(tiles[1:], 1):
+            block = self.LU[tk.start:, :tk.start]
+            block[...] = block[self._swaps[k]]
+        del self._swaps
+
+    def _execute(self):
+        if self.teaching or not self._blocked:
+            return super()._execute()
+        self.swap_count = 0
+        self._execute_tiled()
@@ -0,0 +1,96 @@
+import numpy as np
+
+from src.linalg.policy import as_float_array, check_finite_array, \
+    writable_array
+from src.typing import Array1D, Array2D
+
+
+_DEFAULT_BLOCK_SIZE = 64
+
+
+def _output_buffer(b, dtype, out, overwrite_b):
+    # escolhe onde a solução será escrita: em `out`, no próprio `b` ou numa
+    # cópia de `b`, nessa ordem de preferência.
+    b = np.asarray(b)
+    if out is not None:
+        if out.shape != b.shape:
+            raise ValueError('out must have the same shape as b.')
+        if not np.can_cast(dtype, out.dtype):
+            raise ValueError(f'out must be able to hold {dtype} values.')
+        if out is not b:
+            np.copyto(out, b)
+        return out
+    return writable_array(b, dtype, overwrite_b)
+
+
+def _solve_lower(a, x, unit_diagonal, block_size):
+    n = a.shape[0]
+    for j0 in range(0, n, block_size):
+        j1 = min(j0 + block_size, n)
+        for j in range(j0, j1):
+            if not unit_diagonal:
+                x[j] /= a[j, j]
+            x[j + 1:j1] -= np.multiply.outer(a[j + 1:j1, j], x[j])
+        if j1 < n:
+            x[j1:] -= a[j1:, j0:j1] @ x[j0:j1]
+
+
+def _solve_upper(a, x, unit_diagonal, block_size):
+    n = a.shape[0]
+    for j1 in range(n, 0, -block_size):
+        j0 = max(j1 - block_size, 0)
+        for j in range(j1 - 1, j0 - 1, -1):
+            if not unit_diagonal:
+                x[j] /= a[j, j]
+            x[j0:j] -= np.multiply.outer(a[j0:j, j], x[j])
+        if j0 > 0:
+            x[:j0] -= a[:j0, j0:j1] @ x[j0:j1]
+
+
+def solve_triangular(a: Array2D, b: Array1D | Array2D, lower: bool = True,
+                     unit_diagonal: bool = False, out=None,
+                     overwrite_b: bool = False,
+                     block_size: int = _DEFAULT_BLOCK_SIZE,
+                     check_finite: bool = False):
+    '''
+    Resolve o sistema triangular ax = b por substituição orientada a colunas,
+    em blocos: cada bloco diagonal é resolvido coluna a coluna e o restante
+    do vetor é atualizado com um único produto de matrizes.
+
+    Apenas o triângulo pedido de `a` é lido, então `a` pode guardar outra
+    matriz no triângulo oposto (como a matriz LU).
+
+    Parâmetros:
+    a: np.array 2d quadrado
+        Matriz triangular.
+    b: np.array 1d ou 2d (n x k)
+        Lado direito; com k colunas, todas são resolvidas de uma só vez.
+    lower: bool (padrão True)
+        Se a é triangular inferior (substituições sucessivas) ou superior
+        (substituições retroativas).
+    unit_diagonal: bool (padrão False)
+        Considera a diagonal de a igual a 1, sem lê-la.
+    out: np.array (padrão None)
+        Buffer pré-alocado, do formato de b, onde a solução é escrita.
+    overwrite_b: bool (padrão False)
+        Permite escrever a solução sobre o próprio b quando ele já é um array
+        contíguo do tipo do resultado, evitando qualquer cópia.
+    block_size: int (padrão 64)
+        Tamanho dos blocos diagonais.
+    check_finite: bool (padrão False)
+        Lança ValueError se a ou b tiverem inf ou nan.
+
+    Complexidade: O(n²k)
+    '''
+    a = as_float_array(a, check_finite=check_finite)
+    dtype = np.result_type(a.dtype, np.asarray(b).dtype, np.float64)
+    x = _output_buffer(b, dtype, out, overwrite_b)
+    if check_finite:
+        check_finite_array(x)
+    if x.shape[0] != a.shape[0]:
+        raise ValueError('a and b must have the same number of rows.')
+    if lower:
+        _solve_lower(a, x, unit_diagonal, block_size)
+    else:
+        _solve_upper(a, x, unit_diagonal, block_size)
+    return x
@@ -0,0 +1,43 @@
+import numpy as np
+
+from src.linalg.lu import LU
+
+
+class Woodbury:
+    '''
+    Resolve sistemas com a matriz A + U Vᵀ reaproveitando uma decomposição de
+    A já feita (LU, Cholesky, LDLt, ...), pela fórmula de Sherman-Morrison-
+    Woodbury:
+
+        (A + U Vᵀ)⁻¹ = A⁻¹ - A⁻¹U (I + Vᵀ A⁻¹ U)⁻¹ Vᵀ A⁻¹
+
+    Útil quando atualizar os fatores de A não compensa. U e V são n x k; só
+    uma matriz k x k (a matriz de capacitância) é decomposta.
+
+    Complexidade: O(n²k) na construção e O(n² + nk) por solve.
+    '''
+
+    def __init__(self, dec, U, V):
+        n = dec.a.shape[0]
+        self.dec = dec
+        self.U = np.asarray(U, dtype=float).reshape(n, -1)
+        self.V = np.asarray(V, dtype=float).reshape(n, -1)
+        self.Z = dec.solve(self.U)
+        k = self.U.shape[1]
+        self.capacitance = LU(np.identity(k) + self.V.T @ self.Z)
+
+    @property
+    def det(self):
+        # lema do determinante: det(A + UVᵀ) = det(I + VᵀA⁻¹U) det(A)
+        return self.capacitance.det * self.dec.det
+
+    def solve(self, b):
+        y = self.dec.solve(b)
+        return y - self.Z @ self.capacitance.solve(self.V.T @ y)
+
+    def solve_transposed(self, b):
+        # (A + UVᵀ)ᵀ = Aᵀ + VUᵀ, com matriz de capacitância transposta.
+        if not hasattr(self, '_Zt'):
+            self._Zt = self.dec.solve_transposed(self.V)
+        y = self.dec.solve_transposed(b)
+        return y - self._Zt @ self.capacitance.solve_transposed(self.U.T @ y)
@@ -3,6 +3,11 @@ import unittest
 import numpy as np
 
 from src.eqroot.limits import Limits
+from src.eqroot import vectorized
+from src.eqroot.horner import horner, synthetic_division
+from src.eqroot.polyroots import aberth_ehrlich, polyroots
+from src.eqroot.systems import Broyden, NewtonSystem, column_groups, fd_jacobian
+from src.linalg.sparse import CSR
 from src.eqroot.core import briot_ruffini, bissection, secant, regula_falsi, pegasus, muller, wijngaarden_dekker_brent, newton, schroder
 
 
@@ -22,6 +27,11 @@ class EqRootTest(unittest.TestCase):
         q, r = briot_ruffini(p, 2)
         self.assertTrue((q == np.poly1d([1, -3])).all())
         assert r == 0
+        self.assertIsInstance(r, np.integer)
+        self.assertEqual(q.coeffs.dtype.kind, 'i')
+        q, r = briot_ruffini(p, 0.5)
+        self.assertIsInstance(r, np.floating)
+        self.assertEqual(r, p(0.5))
 
     def test_bissection(self):
         poly = np.poly1d([1, 0, -1])
@@ -64,3 +74,117 @@ class EqRootTest(unittest.TestCase):
         x, err = schroder(
             func, func.deriv(), x0=2, m=3, toler=1e-5)
         assert round(x, 5) == 1
+
+    def test_vectorized_bracketing(self):
+        def func(x): return 0.05 * x**3 - 0.4 * x ** 2 + 3 * np.sin(x) * x
+        c = np.linspace(1, 100, 1000).reshape(10, 100)
+        for method in (vectorized.bissection, vectorized.regula_falsi,
+                       vectorized.pegasus,
+                       vectorized.wijngaarden_dekker_brent):
+            x, err, iters = method(func, 10, 12, toler=1e-10)
+            self.assertAlmostEqual(float(x), 11.743931234468302, 8)
+            x, err, iters = method(lambda x, c: x**3 - c, 0, 5, args=(c,),
+                                   toler=1e-10)
+            self.assertEqual(x.shape, c.shape)
+            self.assertTrue(np.allclose(x, np.cbrt(c), atol=1e-8))
+            self.assertTrue((iters > 0).all())
+            with self.assertRaises(ValueError):
+                method(lambda x: x**2 + 1, [0, -1], [1, 1])
+
+    def test_vectorized_newton(self):
+        c = np.linspace(1, 100, 1000)
+        x, err, iters = vectorized.newton(
+            lambda x, c: (x**3 - c, 3 * x**2), 3., args=(c,), toler=1e-10)
+        self.assertTrue(np.allclose(x, np.cbrt(c)))
+        self.assertTrue((err < 1e-10).all())
+        # arctan: Newton puro diverge para |x0| > 1.39; com busca linear ou
+        # amortecimento, converge.
+        def f_and_df(x): return np.arctan(x), 1 / (1 + x**2)
+        x0 = np.array([0.5, 2., 5.])
+        x, err, iters = vectorized.newton(f_and_df, x0, line_search=True,
+                                          toler=1e-12)
+        self.assertTrue((abs(x) < 1e-12).all())
+        x, err, iters = vectorized.newton(f_and_df, x0, damping=[1, .5, .2],
+                                          toler=1e-12)
+        self.assertTrue((abs(x) < 1e-12).all())
+        self.assertLess(iters[0], iters[2])
+        x, err, iters = vectorized.newton(lambda x: (x**2 + 1, 2 * x), 0.)
+        self.assertEqual(err, np.inf)
+
+    def test_vectorized_schroder(self):
+        func = np.poly1d([1, 2, -12, 14, -5])
+        dfunc = func.deriv()
+        x, err, iters = vectorized.schroder(
+            lambda x: (func(x), dfunc(x)), [2., 0.5], 3, toler=1e-5)
+        self.assertTrue((x.round(5) == 1).all())
+        # a primeira pista cai em x = 1, onde f' = 0, depois de um passo.
+        x, err, iters = vectorized.schroder(
+            lambda x, c: ((x - 1)**2 + c, 2 * (x - 1)), [2., 3.], 1,
+            args=(np.array([1., -1.]),), toler=1e-10)
+        self.assertEqual(err[0], np.inf)
+        self.assertEqual(iters[0], 1)
+        self.assertTrue(np.isclose(x[1], 2))
+
+    def test_nonlinear_systems(self):
+        # função tridiagonal de Broyden, com jacobiano tridiagonal.
+        def func(x):
+            y = (3 - 2 * x) * x + 1
+            y[1:] -= x[:-1]
+            y[:-1] -= 2 * x[1:]
+            return y
+        n = 30
+        pattern = np.eye(n) + np.eye(n, k=1) + np.eye(n, k=-1)
+        x0 = -np.ones(n)
+        jac, count = fd_jacobian(func, x0, sparsity=pattern)
+        self.assertEqual(count, 3)
+        self.assertTrue(np.allclose(jac, fd_jacobian(func, x0)[0]))
+        self.assertEqual(len(set(column_groups(pattern))), 3)
+        sparse = CSR.from_dense(pattern)
+        self.assertTrue((column_groups(sparse) == column_groups(pattern)).all())
+        solvers = [NewtonSystem(func, sparsity=pattern, toler=1e-10),
+                   NewtonSystem(func, sparsity=pattern, refactor_every=4,
+                                toler=1e-10),
+                   Broyden(func, sparsity=pattern, toler=1e-10)]
+        for solver in solvers:
+            x = solver.solve(x0)
+            self.assertLess(abs(func(x)).max(), 1e-10)
+        newton, frozen, broyden = solvers
+        self.assertLess(frozen.factorizations, newton.factorizations)
+        self.assertEqual(broyden.factorizations, 1)
+
+    def test_polyroots(self):
+        roots = polyroots(np.poly1d([1, 2, -13, -14, 24]))
+        self.assertTrue(np.allclose(roots, [-4, -2, 1, 3]))
+        self.assertTrue(np.allclose(polyroots([1, 0, 1]), [-1j, 1j]))
+        self.assertTrue(np.allclose(polyroots([1, -3, 2, 0]), [0, 1, 2]))
+        coef = np.random.default_rng(0).standard_normal((200, 9))
+        roots, err, iters = aberth_ehrlich(coef)
+        self.assertEqual(roots.shape, (200, 8))
+        for c, r in zip(coef, roots):
+            distance = abs(r[:, None] - np.roots(c)[None, :])
+            self.assertLess(distance.min(axis=0).max(), 1e-8)
+            self.assertLess(distance.min(axis=1).max(), 1e-8)
+        with self.assertRaises(ValueError):
+            polyroots([0, 0])
+        with self.assertRaises(ValueError):
+            Limits(np.array([1., 0., 1.])).neg
+
+    def test_horner(self):
+        p = np.poly1d([2, -3, 0, 5, -1])
+        x = np.linspace(-2, 2, 12).reshape(3, 4)
+        values = horner(p.coeffs, x, derivatives=3)
+        self.assertEqual(values.shape, (4, 3, 4))
+        for k in range(4):
+            self.assertTrue(np.allclose(values[k], p.deriv(k)(x)))
+        coef = np.random.default_rng(0).standard_normal((5, 4))
+        x = np.random.default_rng(1).standard_normal((5, 7))
+        expected = [np.polyval(c, xi) for c, xi in zip(coef, x)]
+        self.assertTrue(np.allclose(horner(coef, x), expected))
+        q, r = synthetic_division(coef, x)
+        self.assertEqual(q.shape, (5, 7, 3))
+        self.assertTrue(np.allclose(r, expected))
+        i, j = 2, 5
+        quot, rem = np.polydiv(coef[i], [1, -x[i, j]])
+        self.assertTrue(np.allclose(q[i, j], quot))
+        with self.assertRaises(ValueError):
+            horner(coef, x[:3])
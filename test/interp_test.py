@@ -90,6 +90,13 @@ class InterpTest(unittest.TestCase):
         err = round(err, 4)
         assert err == 0.0096
 
+    def test_not_a_knot_spline_reproduces_cubic(self):
+        cubic = np.poly1d([1, -2, 1, -5])
+        x = np.array([1, 2, 4, 6, 7, 9])
+        spl = NotAKnotSpline(x, cubic(x))
+        for x_est in (1.5, 3.3, 6.5, 8.1):
+            assert round(spl(x_est) - cubic(x_est), 8) == 0
+
 
 if __name__ == '__main__':
     unittest.main()
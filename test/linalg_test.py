@@ -1,8 +1,11 @@
+import gc
+import os
+import tempfile
 import unittest
 
 import numpy as np
 
-from src.linalg.gauss_decomp import gauss
+from src.linalg.gauss_decomp import gauss, swap_pivot
 from src.linalg.lu import LU
 from src.linalg.cholesky import Cholesky
 from src.linalg.core import successive_substitutions, retroactive_substitutions, is_lower_trig, is_upper_trig, norm_p, norm_inf, matrix_norm_1, matrix_norm_inf, matrix_norm_frobenius
@@ -11,7 +14,37 @@ from src.linalg.jacobi import Jacobi
 from src.linalg.krylov import krylov_poly
 from src.linalg.ldlt import LDLt
 from src.linalg.sor import SOR
-
+from src.linalg.sparse import CSR
+from src.linalg.cache import FactorizationCache
+from src.linalg.woodbury import Woodbury
+from src.linalg.banded import Banded, BandedLU, thomas
+from src.linalg.coloring import greedy_coloring, is_valid_coloring
+from src.linalg.conjugate_gradient import ConjugateGradient
+from src.linalg.gmres import GMRES
+from src.linalg.norms import condition_estimate
+from src.linalg.batched import BatchedCholesky, BatchedLU, batched_gauss
+from src.linalg.out_of_core import OutOfCoreCholesky, OutOfCoreLU
+from src.linalg.tiled import TiledCholesky, TiledLU
+from src.linalg.eigen import Arnoldi, InverseIteration, Lanczos, PowerMethod
+from src.linalg.operator import LinearOperator
+from src.linalg.pivoting import AdaptivePivoting, get_strategy
+from src.linalg.policy import count_copies
+from src.linalg.preconditioners import JacobiPreconditioner, SSOR, IncompleteCholesky
+from src.linalg.triangular import solve_triangular
+
+
+def poisson_2d(m):
+    # matriz do laplaciano em uma grade m x m (5 pontos), no formato CSR.
+    entries = []
+    for i in range(m):
+        for j in range(m):
+            k = i * m + j
+            entries.append((k, k, 4.))
+            for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if 0 <= i + di < m and 0 <= j + dj < m:
+                    entries.append((k, (i + di) * m + j + dj, -1.))
+    rows, cols, values = zip(*entries)
+    return CSR.from_coo(rows, cols, values, (m * m, m * m))
 
 
 class LinalgTest(unittest.TestCase):
@@ -30,6 +63,21 @@ class LinalgTest(unittest.TestCase):
         x, det = gauss(self.A2, b)
         self.assertTrue((x == [1,0,-1]).all())
 
+    def test_gauss_pivot_by_absolute_value(self):
+        # o maior valor com sinal da coluna seria o pivô 0.
+        x, det = gauss(np.array([[0., 1.], [-2., 1.]]), np.array([1., 1.]))
+        self.assertTrue(np.allclose(x, [0, 1]))
+        self.assertEqual(det, 2)
+        m = np.array([[0., 1., 1.], [-2., 1., 1.]])
+        self.assertEqual(swap_pivot(m, 0), -1)
+        self.assertTrue((m[0] == [-2, 1, 1]).all())
+        self.assertEqual(swap_pivot(m, 1), 1)
+        rng = np.random.default_rng(9)
+        A, b = rng.standard_normal((40, 40)), rng.standard_normal(40)
+        x, det = gauss(A, b)
+        self.assertTrue(np.allclose(A @ x, b))
+        self.assertTrue(np.isclose(det, np.linalg.det(A)))
+
     def test_lu0(self):
         dec = LU(self.A)
         assert dec.det == 25
@@ -151,7 +199,9 @@ class LinalgTest(unittest.TestCase):
         self.assertTrue((x.round() == [0,-1,1]).all())
 
     def test_sor(self):
-        sor = SOR(self.A, omega=1.2)
+        # os autovalores de Jacobi são imaginários: SOR só converge com
+        # omega < 1 (com omega = 1.2, o raio espectral é 1.33).
+        sor = SOR(self.A, omega=0.8)
         b = np.array([-5, -15])
         x = sor.solve(b)
         self.assertFalse(sor.converges)
@@ -229,6 +279,500 @@ class LinalgTest(unittest.TestCase):
         ])  # a soma dos quadrados dá 4(3² + 4²) = 4*25 = 100
         assert matrix_norm_frobenius(A) == 10
 
+    def test_lu_blocked_matches_steps(self):
+        rng = np.random.default_rng(0)
+        A = rng.standard_normal((50, 50))
+        blocked = LU(A, block_size=8)
+        steps = LU(A, precision=20)
+        self.assertTrue((blocked.perm == steps.perm).all())
+        self.assertTrue(np.allclose(blocked.LU, steps.LU))
+        self.assertTrue(np.allclose(blocked.det, np.linalg.det(A)))
+
+    def test_lu_permutation(self):
+        A = np.array([[ 1, -3,  2],
+                      [-2,  8, -1],
+                      [ 4, -6,  5]])
+        dec = LU(A)
+        L = np.tril(dec.LU, -1) + np.identity(3)
+        U = np.triu(dec.LU)
+        self.assertTrue((dec.p == np.identity(3)[[2, 1, 0]]).all())
+        self.assertTrue(np.allclose(dec.p @ A, L @ U))
+
+    def test_multiple_rhs_solve(self):
+        B = np.array([[3, 1], [-5, 0], [-8, 2]])
+        for dec in (LU(self.A2), Cholesky(self.A2), LDLt(self.A2)):
+            X = dec.solve(B)
+            self.assertEqual(X.shape, (3, 2))
+            self.assertTrue(np.allclose(self.A2 @ X, B))
+            self.assertTrue(np.allclose(X[:, 0], dec.solve(B[:, 0])))
+
+    def test_solve_triangular_blocked(self):
+        rng = np.random.default_rng(2)
+        A = 0.1 * rng.standard_normal((100, 100)) + np.identity(100)
+        B = rng.standard_normal((100, 3))
+        X = solve_triangular(A, B, lower=True, block_size=16)
+        self.assertTrue(np.allclose(np.tril(A) @ X, B))
+        X = solve_triangular(A, B, lower=False, unit_diagonal=True,
+                             block_size=16)
+        U = np.triu(A, 1) + np.identity(100)
+        self.assertTrue(np.allclose(U @ X, B))
+
+    def test_solve_triangular_buffers(self):
+        b = np.array([1., 10.])
+        out = np.empty(2)
+        x = solve_triangular(self.L, b, out=out)
+        self.assertIs(x, out)
+        self.assertTrue((out == [1, 2]).all())
+        x = solve_triangular(self.L, b, overwrite_b=True)
+        self.assertIs(x, b)
+        self.assertTrue((b == [1, 2]).all())
+
+    def test_csr(self):
+        S = CSR.from_coo([0, 1, 1, 2, 0], [0, 1, 2, 2, 0], [1, 2, 3, 4, 1],
+                         (3, 3))
+        self.assertEqual(S.nnz, 4)
+        expected = np.array([[2, 0, 0], [0, 2, 3], [0, 0, 4]])
+        self.assertTrue((S.toarray() == expected).all())
+        self.assertTrue((S.diagonal() == [2, 2, 4]).all())
+        self.assertTrue((S @ np.array([1, 2, 3]) == expected @ [1, 2, 3]).all())
+
+    def test_sparse_iterative_methods(self):
+        b = np.array([3, -4, 6])
+        S = CSR.from_dense(self.A2)
+        for cls in (Jacobi, GaussSeidel):
+            dense, sparse = cls(self.A2), cls(S)
+            self.assertTrue(sparse.converges)
+            self.assertTrue(np.allclose(dense.solve(b), sparse.solve(b)))
+            self.assertEqual(dense.iter, sparse.iter)
+        dense, sparse = SOR(self.A, omega=0.8), SOR(CSR.from_dense(self.A), omega=0.8)
+        self.assertFalse(sparse.converges)
+        self.assertTrue(np.allclose(dense.solve([-5, -15]), sparse.solve([-5, -15])))
+
+    def test_conjugate_gradient(self):
+        A = poisson_2d(10)
+        b = np.ones(100)
+        cg = ConjugateGradient(A, max_err=1e-10)
+        x = cg.solve(b)
+        self.assertTrue(np.allclose(A @ x, b))
+        self.assertEqual(len(cg.residuals), cg.iter + 1)
+        self.assertLess(cg.err, 1e-10)
+
+    def test_preconditioned_conjugate_gradient(self):
+        A = poisson_2d(10)
+        D = A.toarray()
+        b = np.ones(100)
+        plain = ConjugateGradient(A, max_err=1e-10)
+        plain.solve(b)
+        for pc in (JacobiPreconditioner(A), SSOR.from_sor(SOR(D, omega=1.5)),
+                   SSOR.from_sor(SOR(A, omega=1.5)), IncompleteCholesky(D),
+                   IncompleteCholesky(A)):
+            cg = ConjugateGradient(A, pc, max_err=1e-10)
+            x = cg.solve(b)
+            self.assertTrue(np.allclose(D @ x, b))
+            self.assertLessEqual(cg.iter, plain.iter)
+
+    def test_sparse_preconditioners(self):
+        A = poisson_2d(6)
+        D = A.toarray()
+        r = np.random.default_rng(2).standard_normal(36)
+        sparse, dense = SSOR(A, omega=1.3), SSOR(D, omega=1.3)
+        self.assertIsInstance(sparse.lower, CSR)
+        self.assertTrue(np.allclose(sparse.solve(r), dense.solve(r)))
+        ic = IncompleteCholesky(A)
+        L = ic.L.toarray()
+        self.assertEqual(ic.L.nnz, (np.tril(D) != 0).sum())
+        # IC(0): LLᵀ coincide com A nas posições não nulas de A.
+        self.assertTrue(np.allclose((L @ L.T)[D != 0], D[D != 0]))
+        self.assertTrue(np.allclose(L @ L.T @ ic.solve(r), r))
+        with self.assertRaises(ValueError):
+            IncompleteCholesky(-D)
+
+    def test_gmres(self):
+        rng = np.random.default_rng(3)
+        A = rng.standard_normal((60, 60)) + 10 * np.identity(60)
+        b = rng.standard_normal(60)
+        op = LinearOperator(A.shape, lambda x: A @ x)
+        gmres = GMRES(op, restart=10, max_err=1e-10)
+        x = gmres.solve(b)
+        self.assertTrue(np.allclose(A @ x, b))
+        self.assertLess(gmres.err, 1e-10)
+        # uma entrada por iteração, mais a inicial e a de cada reinício.
+        cycles = -(-gmres.iter // 10)
+        self.assertEqual(len(gmres.residuals), gmres.iter + 1 + cycles)
+        self.assertEqual(gmres.residuals[-1], gmres.err)
+        pc = JacobiPreconditioner(A)
+        self.assertIs(GMRES(A, preconditioner=pc).preconditioner, pc)
+        with self.assertRaises(TypeError):
+            GMRES(A, 10)
+
+    def test_greedy_coloring(self):
+        A = poisson_2d(6)
+        colors = greedy_coloring(A)
+        self.assertTrue(is_valid_coloring(A, colors))
+        self.assertEqual(len(set(colors)), 2)
+
+    def test_multicolor_gauss_seidel(self):
+        A = poisson_2d(8)
+        b = np.ones(64)
+        expected = np.linalg.solve(A.toarray(), b)
+        for kwargs in ({'ordering': 'red-black', 'grid': (8, 8)},
+                       {'ordering': 'greedy', 'workers': 2, 'chunk_size': 8}):
+            gs = GaussSeidel(A, max_err=1e-10, max_iter=1000, **kwargs)
+            self.assertTrue(np.allclose(gs.solve(b), expected))
+        dense = GaussSeidel(A.toarray(), ordering='red-black', grid=(8, 8),
+                            max_err=1e-10, max_iter=1000)
+        self.assertTrue(np.allclose(dense.solve(b), expected))
+        with self.assertRaises(ValueError):
+            GaussSeidel(A, ordering='red-black')
+
+    def test_cholesky_dtype(self):
+        dec = Cholesky(self.A2)
+        self.assertEqual(dec.L.dtype, np.float64)
+        self.assertTrue(np.allclose(dec.L @ dec.L.T, self.A2))
+        indefinite = np.array([[1, 2], [2, 1]])
+        dec = Cholesky(indefinite)
+        self.assertEqual(dec.L.dtype, np.complex128)
+        self.assertTrue(np.allclose(dec.L @ dec.L.T, indefinite))
+
+    def test_thomas(self):
+        x = thomas([1, 1], [4, 4, 4], [2, 2], [6, 7, 5])
+        self.assertTrue(np.allclose(x, [1, 1, 1]))
+
+    def test_banded_lu(self):
+        rng = np.random.default_rng(4)
+        A = np.triu(np.tril(rng.standard_normal((10, 10)), 2), -1)
+        A += 5 * np.identity(10)
+        m = Banded.from_dense(A, 1, 2)
+        self.assertTrue((m.toarray() == A).all())
+        b = rng.standard_normal(10)
+        dec = BandedLU(m)
+        self.assertTrue(np.allclose(A @ dec.solve(b), b))
+        self.assertTrue(np.allclose(dec.det, np.linalg.det(A)))
+        self.assertTrue(np.allclose(A.T @ dec.solve_transposed(b), b))
+        self.assertTrue(np.isclose(dec.cond(), LU(A).cond()))
+
+    def test_factorization_cache(self):
+        cache = FactorizationCache(max_entries=2)
+        lu = cache.get(LU, self.A2)
+        self.assertIs(cache.get(LU, self.A2.copy()).LU, lu.LU)
+        self.assertIsNot(cache.get(LU, self.A2, pivoting=False).LU, lu.LU)
+        cache.get(LDLt, self.A2)
+        self.assertEqual(cache.stats['hits'], 1)
+        self.assertEqual(cache.stats['misses'], 3)
+        self.assertEqual(cache.stats['evictions'], 1)
+        self.assertIsNot(cache.get(LU, self.A2).LU, lu.LU)
+        cache.invalidate(self.A2)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats['nbytes'], 0)
+
+    def test_factorization_cache_update(self):
+        # atualizar uma decomposição obtida do cache não altera a entrada.
+        cache = FactorizationCache()
+        A = self.A2.astype(float)
+        b = np.array([1., 2., 3.])
+        u, v = np.ones(3), np.array([1., 0., 0.])
+        cache.get(LU, A).update(u, v)
+        self.assertTrue(np.allclose(A @ cache.get(LU, A).solve(b), b))
+        self.assertTrue(np.allclose(cache.get(LU, A).a, A))
+
+    def test_factorization_cache_owns_matrix(self):
+        # modificar a matriz depois de uma falha não estraga a entrada.
+        cache = FactorizationCache()
+        A = self.A2.astype(float)
+        original = A.copy()
+        cache.get(LU, A)
+        A[0, 0] += 10
+        dec = cache.get(LU, original)
+        self.assertEqual(cache.stats['hits'], 1)
+        self.assertTrue((dec.a == original).all())
+        b = original @ [1., 2., 3.]
+        self.assertTrue(np.allclose(dec.refine(b, tol=1e-14), [1, 2, 3]))
+
+    def test_factorization_cache_max_bytes(self):
+        # a decomposição LU de A2 guarda 3 x 3 + 3 x 3 floats e 3 inteiros
+        cache = FactorizationCache(max_bytes=200)
+        cache.get(LU, self.A2)
+        cache.get(LU, self.A)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats['evictions'], 1)
+
+    def test_lu_update(self):
+        u, v = np.array([1, 0, 2]), np.array([0, 1, -1])
+        B = self.A2 + np.outer(u, v)
+        dec = LU(self.A2)
+        dec.det
+        dec.update(u, v)
+        self.assertTrue(np.allclose(dec.det, np.linalg.det(B)))
+        self.assertTrue(np.allclose(B @ dec.solve([1, 2, 3]), [1, 2, 3]))
+        dec.downdate(u, v)
+        self.assertTrue(np.allclose(dec.det, np.linalg.det(self.A2)))
+
+    def test_cholesky_update(self):
+        X = np.array([[1, 0], [2, 1], [0, 1]])
+        dec = Cholesky(self.A2)
+        dec.update(X)
+        self.assertTrue(np.allclose(dec.L @ dec.L.T, self.A2 + X @ X.T))
+        dec.downdate(X)
+        self.assertTrue(np.allclose(dec.L @ dec.L.T, self.A2))
+        with self.assertRaises(ValueError):
+            dec.downdate([10, 0, 0])
+
+    def test_woodbury(self):
+        U = np.array([[1, 0], [2, 1], [0, 1]])
+        V = np.array([[0, 1], [1, 0], [-1, 1]])
+        B = self.A2 + U @ V.T
+        w = Woodbury(LU(self.A2), U, V)
+        self.assertTrue(np.allclose(B @ w.solve([1, 2, 3]), [1, 2, 3]))
+        self.assertTrue(np.allclose(w.det, np.linalg.det(B)))
+        self.assertTrue(np.allclose(B.T @ w.solve_transposed([1, 2, 3]),
+                                    [1, 2, 3]))
+
+    def test_mixed_precision_refine(self):
+        rng = np.random.default_rng(5)
+        A = rng.standard_normal((50, 50))
+        x = rng.standard_normal(50)
+        dec = LU(A, dtype=np.float32)
+        self.assertEqual(dec.LU.dtype, np.float32)
+        y = dec.refine(A @ x, tol=1e-14, residual_dtype=np.longdouble)
+        self.assertTrue(np.allclose(y, x, rtol=0, atol=1e-12))
+        self.assertLess(dec.refine_iter, 10)
+        self.assertEqual(dec.dtype, np.float32)
+
+    def test_mixed_precision_refine_fallback(self):
+        H = 1 / (np.arange(9)[:, None] + np.arange(9) + 1)  # Hilbert
+        dec = Cholesky(H, dtype=np.float32)
+        y = dec.refine(H @ np.ones(9), tol=1e-12, max_iter=50)
+        self.assertEqual(dec.dtype, np.float64)
+        self.assertTrue(np.allclose(y, np.ones(9), atol=1e-4))
+
+    def test_banded_refine(self):
+        A = np.triu(np.tril(self.A2 + 5 * np.identity(3), 1), -1)
+        dec = BandedLU(Banded.from_dense(A, 1, 1))
+        b = A @ [1., 2., 3.]
+        x = dec.refine(b, np.ones(3), tol=1e-14)
+        self.assertTrue(np.allclose(x, [1, 2, 3], rtol=0, atol=1e-12))
+        self.assertGreater(dec.refine_iter, 0)
+
+    def test_refine_edge_cases(self):
+        dec = LU(self.A2)
+        b = np.array([3, -5, -8])
+        x = dec.refine(b, max_iter=0)
+        self.assertEqual(dec.refine_iter, 0)
+        self.assertEqual(dec.refine_err, np.inf)
+        self.assertTrue(np.allclose(x, [1, 0, -1]))
+        z = np.array([1 + 2j, -1j, 3])
+        x0 = z + 1e-3
+        y = dec.refine(np.asarray(self.A2) @ z, x0, tol=1e-14)
+        self.assertTrue(np.iscomplexobj(y))
+        self.assertTrue(np.allclose(y, z, rtol=0, atol=1e-12))
+
+    def test_batched_norms(self):
+        X = np.array([[1, -2, 3], [0, 4, 3]])
+        self.assertTrue((norm_p(X, 1) == [6, 7]).all())
+        self.assertTrue((norm_inf(X, axis=0) == [1, 4, 3]).all())
+        A = np.array([[[1, 5, -1], [3, -7, 0], [0, 1, 0]], np.identity(3)])
+        self.assertTrue((matrix_norm_1(A) == [10, 1]).all())
+        self.assertTrue((matrix_norm_inf(A) == [13, 1]).all())
+
+    def test_condition_estimate(self):
+        rng = np.random.default_rng(3)
+        A = rng.standard_normal((40, 40))
+        exact = np.linalg.cond(A, 1)
+        est = condition_estimate(LU(A))
+        self.assertLessEqual(est, exact * (1 + 1e-10))
+        self.assertGreater(est, exact / 3)
+        B = A @ A.T + np.identity(40)
+        est = Cholesky(B).cond()
+        self.assertLessEqual(est, np.linalg.cond(B, 1) * (1 + 1e-10))
+        self.assertGreater(est, np.linalg.cond(B, 1) / 3)
+
+    def test_batched_lu(self):
+        rng = np.random.default_rng(4)
+        A = rng.standard_normal((200, 6, 6))
+        A[7] = 0
+        b = rng.standard_normal((200, 6, 2))
+        dec = BatchedLU(A)
+        x = dec.solve(b)
+        self.assertEqual(dec.singular.nonzero()[0].tolist(), [7])
+        self.assertTrue(np.isnan(x[7]).all())
+        ok = ~dec.singular
+        self.assertTrue(np.allclose(A[ok] @ x[ok], b[ok]))
+        self.assertTrue(np.allclose(dec.det, np.linalg.det(A)))
+        with self.assertRaisesRegex(ValueError, r'\(200, 6\)'):
+            dec.solve(rng.standard_normal((200, 5)))
+        with self.assertRaisesRegex(ValueError, r'\(200, 6, k\)'):
+            dec.solve(rng.standard_normal((4, 6, 2)))
+
+    def test_batched_cholesky_and_gauss(self):
+        A = np.array([self.A2 @ self.A2.T, -np.identity(3)])
+        b = np.array([[1, 2, 3], [1, 1, 1]])
+        dec = BatchedCholesky(A)
+        self.assertEqual(dec.singular.tolist(), [False, True])
+        self.assertTrue(np.allclose(A[0] @ dec.solve(b)[0], b[0]))
+        x, det, singular = batched_gauss(A, b)
+        self.assertFalse(singular.any())
+        self.assertTrue(np.allclose(x[1], -1))
+        self.assertTrue(np.allclose(det, np.linalg.det(A)))
+
+    def test_out_of_core(self):
+        rng = np.random.default_rng(6)
+        A = rng.standard_normal((60, 60))
+        S = A @ A.T + np.identity(60)
+        b = rng.standard_normal(60)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'a.npy')
+            np.save(path, A)
+            lu = OutOfCoreLU(path, out=os.path.join(tmp, 'lu.npy'),
+                             panel_size=16)
+            self.assertTrue(np.allclose(A @ lu.solve(b), b))
+            self.assertTrue(np.isclose(lu.det, np.linalg.det(A)))
+            ch = OutOfCoreCholesky(S, out=os.path.join(tmp, 'l.npy'),
+                                   panel_size=16)
+            self.assertTrue(np.allclose(ch.F, np.linalg.cholesky(S)))
+            self.assertTrue(np.allclose(S @ ch.solve(b), b))
+
+    def test_out_of_core_transposed(self):
+        rng = np.random.default_rng(6)
+        A = rng.standard_normal((40, 40))
+        b = rng.standard_normal(40)
+        lu = OutOfCoreLU(A, panel_size=16)
+        self.assertTrue(np.allclose(A.T @ lu.solve_transposed(b), b))
+        self.assertTrue(np.isclose(lu.cond(), LU(A).cond()))
+        path = lu.path
+        self.assertTrue(os.path.exists(path))
+        del lu
+        gc.collect()
+        self.assertFalse(os.path.exists(path))
+
+    def test_tiled(self):
+        rng = np.random.default_rng(7)
+        A = rng.standard_normal((70, 70))
+        S = A @ A.T + np.identity(70)
+        for workers in (1, 3):
+            lu = TiledLU(A, tile_size=16, workers=workers)
+            ref = LU(A, block_size=16)
+            self.assertTrue((lu.perm == ref.perm).all())
+            self.assertTrue(np.allclose(lu.LU, ref.LU))
+            self.assertTrue(np.isclose(lu.det, ref.det))
+            ch = TiledCholesky(S, tile_size=16, workers=workers)
+            self.assertTrue(np.allclose(ch.L, np.linalg.cholesky(S)))
+
+    def test_power_and_inverse_iteration(self):
+        S = self.A2 @ self.A2.T
+        values = np.linalg.eigvalsh(S)
+        pm = PowerMethod(LinearOperator(S.shape, lambda x: S @ x))
+        self.assertTrue(np.isclose(pm.solve(), values[-1]))
+        ii = InverseIteration(S, shift=values[0] + 0.1)
+        self.assertTrue(np.isclose(ii.solve(), values[0]))
+        self.assertTrue(np.allclose(S @ ii.vector, values[0] * ii.vector,
+                                    atol=1e-6))
+
+    def test_lanczos_and_arnoldi(self):
+        A = np.random.default_rng(8).standard_normal((80, 80))
+        S = A + A.T
+        values = np.linalg.eigvalsh(S)
+        lanczos = Lanczos(S, k=3, which='SA')
+        self.assertTrue(np.allclose(lanczos.solve(), values[:3]))
+        warm = Lanczos(S, k=3, which='SA')
+        warm.solve(lanczos.vectors)
+        self.assertLess(warm.iter, lanczos.iter)
+        arnoldi = Arnoldi(A, k=3)
+        found = arnoldi.solve()
+        expected = np.linalg.eigvals(A)
+        expected = expected[np.argsort(-abs(expected))][:3]
+        self.assertTrue(np.allclose(np.sort_complex(found),
+                                    np.sort_complex(expected)))
+
+    def test_sor_fixed_point(self):
+        A = poisson_2d(6)
+        b = np.ones(36)
+        x = SOR(A, omega=1.5, max_err=1e-10).solve(b)
+        self.assertTrue(np.allclose(A @ x, b))
+
+    def test_adaptive_sor(self):
+        A = poisson_2d(20)
+        b = np.ones(400)
+        gs = GaussSeidel(A, ordering='red-black', grid=(20, 20), max_err=1e-8,
+                         max_iter=5000)
+        gs.solve(b)
+        sor = SOR(A, ordering='red-black', grid=(20, 20), max_err=1e-8,
+                  max_iter=5000)
+        self.assertTrue(1 < sor.omega < 2)
+        x = sor.solve(b)
+        self.assertTrue(np.allclose(A @ x, b, atol=1e-5))
+        self.assertLess(sor.iter, gs.iter / 4)
+        self.assertLess(abs(sor.predicted_iter - sor.iter), sor.iter / 2)
+        with self.assertRaises(ValueError):
+            SOR(np.array([[1, 3], [3, 1]]))
+
+    def test_copy_policy(self):
+        A = self.A2.astype(float)
+        b = np.array([1., 2., 3.])
+        with count_copies() as counter:
+            LU(A)
+            Jacobi(A)
+        self.assertEqual(counter.copies, 2)
+        self.assertEqual(counter.bytes, 2 * A.nbytes)
+        with count_copies() as counter:
+            SOR(A, omega=1.2)
+        self.assertEqual(counter.bytes, A.nbytes)
+        dec = LDLt(A @ A.T, dtype=np.float32)
+        self.assertEqual(dec.ldlt.dtype, np.float32)
+        self.assertTrue(np.allclose(dec.refine(b, tol=1e-14),
+                                    np.linalg.solve(A @ A.T, b)))
+        work = A.copy()
+        with count_copies() as counter:
+            dec = LU(work, overwrite_a=True)
+        self.assertEqual(counter.bytes, 0)
+        self.assertIs(dec.LU, work)
+        self.assertTrue(np.allclose(A @ dec.solve(b), b))
+        for method in (dec.cond, lambda: dec.refine(b),
+                       lambda: dec.update(b, b)):
+            with self.assertRaisesRegex(ValueError, 'overwrite_a'):
+                method()
+        dec = Cholesky(self.X.astype(float), overwrite_a=True)
+        with self.assertRaisesRegex(ValueError, 'overwrite_a'):
+            dec.update([1., 0.])
+        self.assertFalse(
+            LU(A, dtype=np.float32, overwrite_a=True).a_overwritten)
+        x, _ = gauss(A, b)
+        self.assertTrue((A == self.A2).all())
+        with self.assertRaises(ValueError):
+            Cholesky(np.array([[1, np.nan], [np.nan, 1]]), check_finite=True)
+
+    def test_pivoting_strategies(self):
+        rng = np.random.default_rng(5)
+        A = rng.standard_normal((30, 30))
+        b = rng.standard_normal(30)
+        for pivoting in ('rook', 'complete', 'adaptive'):
+            dec = LU(A, pivoting=pivoting)
+            L = np.tril(dec.LU, -1) + np.identity(30)
+            self.assertTrue(np.allclose(dec.p @ A @ dec.q, L @ np.triu(dec.LU)))
+            self.assertTrue(np.allclose(A @ dec.solve(b), b))
+            self.assertTrue(np.allclose(A.T @ dec.solve_transposed(b), b))
+            self.assertAlmostEqual(dec.det / np.linalg.det(A), 1)
+            x, det = gauss(A, b, pivoting=pivoting)
+            self.assertTrue(np.allclose(A @ x, b))
+            self.assertAlmostEqual(det / np.linalg.det(A), 1)
+        with self.assertRaises(ValueError):
+            get_strategy('bad')
+
+    def test_pivoting_growth(self):
+        # matriz de Wilkinson: com pivotação parcial, o fator de crescimento
+        # é 2^(n-1); com pivotação completa (ou rook), fica pequeno.
+        n = 40
+        W = np.identity(n) - np.tril(np.ones((n, n)), -1)
+        W[:, -1] = 1
+        self.assertEqual(LU(W).growth, 2. ** (n - 1))
+        self.assertLess(LU(W, pivoting='complete').growth, 10)
+        self.assertLess(LU(W, pivoting='rook').growth, 10)
+        strategy = AdaptivePivoting(threshold=100)
+        dec = LU(W, pivoting=strategy)
+        self.assertEqual(strategy.switched_at, 8)
+        self.assertLess(dec.growth, 1000)
+        b = W @ np.ones(n)
+        self.assertTrue(np.allclose(dec.solve(b), 1))
+
 
 if __name__ == '__main__':
     unittest.main()
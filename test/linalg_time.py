@@ -1,94 +1,296 @@
-from time import clock
-from statistics import mean
+'''
+Benchmark dos métodos de src.linalg (LU, Cholesky, LDLt, gauss, Jacobi,
+GaussSeidel e SOR) em matrizes densas, simétricas definidas positivas,
+diagonalmente dominantes e esparsas (laplaciano 2d, em CSR).
+
+Para cada caso são medidos o tempo (melhor de repeat execuções), o pico de
+memória alocada (tracemalloc, em uma execução à parte), a taxa de flops
+(estimada pela contagem nominal de operações) e o erro regressivo
+||b - Ax|| / (||A|| ||x|| + ||b||), na norma infinito.
+
+Uso:
+    python -m test.linalg_time run [-o resultados.json] [--sizes 10 100 ...]
+        [--methods LU SOR ...] [--kinds dense spd ...] [--repeat 3]
+    python -m test.linalg_time compare base.json novo.json [--time-tol 0.1]
+        [--memory-tol 0.1] [--residual-factor 10]
+
+compare lista os casos que ficaram mais lentos, usaram mais memória ou
+perderam precisão e termina com código 1 se houver alguma regressão.
+'''
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import tracemalloc
+from time import perf_counter
 
 import numpy as np
-import pandas as pd
-
-from src.numerico.linalg import LU, Cholesky, LDLt, Jacobi, GaussSeidel, SOR
-
-TOLER = 1e-3
-
-np.seterr(divide='raise', invalid='raise')
-pd.set_option('precision', 8)
-
-general = [LU, Jacobi, GaussSeidel]
-simmetrical = [Cholesky, LDLt]
-special = [SOR]
-
-def get_random_matrices(n=3):
-    a = np.random.randint(-n**2, n**2, (n,n))
-    for i in range(n):
-        a[i][i] = abs(a[i]).sum()
-    x = np.random.randint(0,10, n)
-    b = a @ x
-    return a, b, x
-
-def get_random_simmetrical_matrices(n=3):
-    a = np.random.randint(-n**2, n**2, (n,n))
-    a = a @ a.T
-    for i in range(n):
-        a[i][i] = abs(a[i]).sum()
-    x = np.random.randint(0,10, n)
-    b = a @ x
-    return a, b, x
-
-def test_solve_method(dec, a, b, x_exp, *args, **kwargs):
-    start = clock()
-    x = dec(a, *args, **kwargs).solve(b)
-    stop = clock()
-    time = stop - start
-    err = max(abs((x - x_exp) / x_exp))
-    return time, err
-
-def test_non_simmetrical_methods(n=None):
-    averages = {m.__name__: {'time':[], 'err':[], 'err_count': 0} for m in general}
-
-    for i in range(30):
-        a, b, x = get_random_matrices(n=n)
-        for dec in general:
-            while True:
-                try:
-                    time, err = test_solve_method(dec, a, b, x)
-                    break
-                except FloatingPointError:
-                    a, b, x = get_random_matrices(n=n)
-            averages[dec.__name__]['time'].append(time)
-            averages[dec.__name__]['err'].append(err)
-            if err > TOLER: averages[dec.__name__]['err_count'] += 1
-    for method in averages.keys():
-        averages[method]['time'] = mean(averages[method]['time'])
-        averages[method]['err'] = mean(averages[method]['err'])
-    return pd.DataFrame(averages).transpose()
-
-def test_simmetrical_methods(n=None):
-    averages = {m.__name__: {'time':[], 'err':[], 'err_count': 0} for m in general + simmetrical}
-    for i in range(30):
-        a, b, x = get_random_simmetrical_matrices(n=n)
-        for dec in general + simmetrical:
-            while True:
-                try:
-                    time, err = test_solve_method(dec, a, b, x)
-                    break
-                except FloatingPointError:
-                    a, b, x = get_random_simmetrical_matrices(n=n)
-            averages[dec.__name__]['time'].append(time)
-            averages[dec.__name__]['err'].append(err)
-            if err > TOLER: averages[dec.__name__]['err_count'] += 1
-    for method in averages.keys():
-        averages[method]['time'] = mean(averages[method]['time'])
-        averages[method]['err'] = mean(averages[method]['err'])
-    return pd.DataFrame(averages).transpose()
-
-for i in (2, 3, 5, 10, 20, 30):
-    print(f'Valores para matrizes quaisquer NxN com N = {i}')
-    df = test_non_simmetrical_methods(i)
-    df.sort_values(by=['time'], inplace=True)
-    print(df)
-    print()
-
-for i in (2, 3, 5, 10, 20, 30):
-    print(f'Valores para matrizes simétricas NxN com N = {i}')
-    df = test_simmetrical_methods(i)
-    df.sort_values(by=['time'], inplace=True)
-    print(df)
-    print()
\ No newline at end of file
+
+from src.linalg.cholesky import Cholesky
+from src.linalg.gauss_decomp import gauss
+from src.linalg.gauss_seidel import GaussSeidel
+from src.linalg.jacobi import Jacobi
+from src.linalg.ldlt import LDLt
+from src.linalg.lu import LU
+from src.linalg.norms import norm_inf
+from src.linalg.sor import SOR
+from src.linalg.sparse import CSR
+
+
+SIZES = (10, 30, 100, 300, 1000, 3000, 5000)
+ITERATIVE = {'max_iter': 30000, 'max_err': 1e-10}
+
+
+# matrizes de teste: cada função retorna (a, grid), em que grid é o formato
+# da grade para a ordenação red-black (ou None).
+
+def dense(n, rng):
+    return rng.standard_normal((n, n)), None
+
+
+def spd(n, rng):
+    a = rng.standard_normal((n, n))
+    return a @ a.T + n * np.identity(n), None
+
+
+def diag_dominant(n, rng):
+    a = rng.standard_normal((n, n))
+    np.fill_diagonal(a, abs(a).sum(axis=1) + 1)
+    return a, None
+
+
+def sparse(n, rng):
+    # laplaciano de 5 pontos em uma grade m x m, com m² ≈ n.
+    m = max(2, round(math.sqrt(n)))
+    k = np.arange(m * m).reshape(m, m)
+    rows, cols = [k.ravel()], [k.ravel()]
+    for a, b in ((k[1:], k[:-1]), (k[:, 1:], k[:, :-1])):
+        rows += [a.ravel(), b.ravel()]
+        cols += [b.ravel(), a.ravel()]
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    values = np.where(rows == cols, 4., -1.)
+    return CSR.from_coo(rows, cols, values, (m * m, m * m)), (m, m)
+
+
+KINDS = {
+    'dense': dense,
+    'spd': spd,
+    'diag_dominant': diag_dominant,
+    'sparse': sparse,
+}
+
+
+# métodos: (função que resolve o sistema e retorna (x, iterações), flops
+# nominais, tipos de matriz, maior n). gauss elimina uma linha por vez em
+# Python, então fica limitado a n = 1000.
+
+def _decomposition(cls):
+    def run(a, b, grid):
+        return cls(a).solve(b), None
+    return run
+
+
+def _gauss(a, b, grid):
+    return gauss(a, b)[0], None
+
+
+def _iterative(cls):
+    def run(a, b, grid):
+        kwargs = dict(ITERATIVE)
+        if grid is not None and cls is not Jacobi:
+            kwargs.update(ordering='red-black', grid=grid)
+        solver = cls(a, **kwargs)
+        return solver.solve(b), solver.iter + 1
+    return run
+
+
+def _lu_flops(n, nnz, iters):
+    return 2 * n**3 / 3 + 2 * n**2
+
+
+def _cholesky_flops(n, nnz, iters):
+    return n**3 / 3 + 2 * n**2
+
+
+def _iterative_flops(n, nnz, iters):
+    return iters * (2 * nnz + 3 * n)
+
+
+METHODS = {
+    'LU': (_decomposition(LU), _lu_flops,
+           ('dense', 'spd', 'diag_dominant'), None),
+    'Cholesky': (_decomposition(Cholesky), _cholesky_flops, ('spd',), None),
+    'LDLt': (_decomposition(LDLt), _cholesky_flops, ('spd',), None),
+    'gauss': (_gauss, _lu_flops, ('dense', 'spd', 'diag_dominant'), 1000),
+    'Jacobi': (_iterative(Jacobi), _iterative_flops,
+               ('diag_dominant', 'sparse'), None),
+    'GaussSeidel': (_iterative(GaussSeidel), _iterative_flops,
+                    ('diag_dominant', 'sparse'), None),
+    'SOR': (_iterative(SOR), _iterative_flops, ('sparse',), None),
+}
+
+
+def _abs_row_sums(a):
+    return a.abs_row_sums() if isinstance(a, CSR) else abs(a).sum(axis=1)
+
+
+def backward_error(a, x, b):
+    '''Erro regressivo normwise de x, na norma infinito.'''
+    r = norm_inf(b - a @ x)
+    return r / (_abs_row_sums(a).max() * norm_inf(x) + norm_inf(b))
+
+
+def measure(run, a, b, grid, repeat=3):
+    '''Retorna (x, iterações, melhor tempo, pico de memória em bytes).'''
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        x, iters = run(a, b, grid)
+        times.append(perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run(a, b, grid)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return x, iters, min(times), peak
+
+
+def run_case(method, kind, n, repeat=3):
+    run, flops, _, _ = METHODS[method]
+    rng = np.random.default_rng(n)
+    a, grid = KINDS[kind](n, rng)
+    n = a.shape[0]
+    b = a @ rng.standard_normal(n)
+    nnz = a.nnz if isinstance(a, CSR) else n * n
+    x, iters, time, peak = measure(run, a, b, grid, repeat)
+    count = flops(n, nnz, iters)
+    return {
+        'method': method,
+        'kind': kind,
+        'n': n,
+        'nnz': nnz,
+        'time': time,
+        'peak_memory': peak,
+        'flops': count,
+        'flops_per_s': count / time if time > 0 else None,
+        'residual': float(backward_error(a, x, b)),
+        'iterations': iters,
+        'converged': iters is None or iters <= ITERATIVE['max_iter'],
+    }
+
+
+def run_benchmarks(sizes=SIZES, methods=None, kinds=None, repeat=3,
+                   log=sys.stdout):
+    methods = methods or list(METHODS)
+    kinds = kinds or list(KINDS)
+    results = []
+    for kind in kinds:
+        for n in sizes:
+            for method in methods:
+                _, _, method_kinds, max_n = METHODS[method]
+                if kind not in method_kinds or (max_n and n > max_n):
+                    continue
+                result = run_case(method, kind, n, repeat)
+                results.append(result)
+                if log is not None:
+                    print(_format(result), file=log, flush=True)
+    return results
+
+
+def _format(result):
+    return '\t'.join([
+        f'{result["method"]:<12}', f'{result["kind"]:<14}',
+        f'{result["n"]:>6}', f'{result["time"]:10.4g} s',
+        f'{result["peak_memory"] / 2**20:9.3f} MiB',
+        f'{(result["flops_per_s"] or 0) / 1e9:8.3f} GFlop/s',
+        f'{result["residual"]:9.2e}',
+    ])
+
+
+def metadata():
+    return {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save(results, path):
+    with open(path, 'w') as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(base, new, time_tol=0.1, memory_tol=0.1, residual_factor=10.,
+            min_time=1e-3):
+    '''
+    Compara duas listas de resultados, caso a caso (método, tipo e n).
+    Retorna uma lista de (caso, métrica, valor antigo, valor novo) com as
+    regressões: tempo ou memória maiores que (1 + tol) vezes o anterior (em
+    tempo, só para diferenças acima de min_time segundos) e erro regressivo
+    maior que residual_factor vezes o anterior.
+    '''
+    eps = np.finfo(float).eps
+    old = {(r['method'], r['kind'], r['n']): r for r in base}
+    regressions = []
+    for r in new:
+        key = (r['method'], r['kind'], r['n'])
+        if key not in old:
+            continue
+        o = old[key]
+        if r['time'] > (1 + time_tol) * o['time'] and \
+                r['time'] - o['time'] > min_time:
+            regressions.append((key, 'time', o['time'], r['time']))
+        if r['peak_memory'] > (1 + memory_tol) * o['peak_memory']:
+            regressions.append(
+                (key, 'peak_memory', o['peak_memory'], r['peak_memory']))
+        if r['residual'] > residual_factor * max(o['residual'], eps):
+            regressions.append((key, 'residual', o['residual'], r['residual']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m test.linalg_time')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='executa o benchmark')
+    run.add_argument('-o', '--output', default='linalg_time.json')
+    run.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    run.add_argument('--methods', nargs='+', choices=list(METHODS))
+    run.add_argument('--kinds', nargs='+', choices=list(KINDS))
+    run.add_argument('--repeat', type=int, default=3)
+    cmp = commands.add_parser('compare', help='compara dois resultados')
+    cmp.add_argument('base')
+    cmp.add_argument('new')
+    cmp.add_argument('--time-tol', type=float, default=0.1)
+    cmp.add_argument('--memory-tol', type=float, default=0.1)
+    cmp.add_argument('--residual-factor', type=float, default=10.)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_benchmarks(args.sizes, args.methods, args.kinds,
+                                 args.repeat)
+        save(results, args.output)
+        return 0
+
+    regressions = compare(load(args.base), load(args.new), args.time_tol,
+                          args.memory_tol, args.residual_factor)
+    for (method, kind, n), metric, old, new in regressions:
+        print(f'{method:<12}\t{kind:<14}\t{n:>6}\t{metric:<12}\t'
+              f'{old:10.4g} -> {new:10.4g}\t({new / (old or 1):.2f}x)')
+    if not regressions:
+        print('Nenhuma regressão.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
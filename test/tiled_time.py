@@ -0,0 +1,41 @@
+'''
+Mede o tempo de TiledLU e TiledCholesky com 1, 2, ..., N threads.
+
+Uso: python -m test.tiled_time [n] [tile_size] [N]
+'''
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from src.linalg.tiled import TiledCholesky, TiledLU
+
+
+def best_time(dec, a, repeat=3, **kwargs):
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        dec(a, **kwargs)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main(n=2000, tile_size=256, max_workers=os.cpu_count()):
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((n, n))
+    s = a @ a.T + n * np.identity(n)
+    print(f'n = {n}, tile_size = {tile_size}')
+    print('threads', 'método', 'tempo (s)', 'speedup', sep='\t')
+    for dec, matrix in ((TiledLU, a), (TiledCholesky, s)):
+        base = None
+        for workers in range(1, max_workers + 1):
+            time = best_time(dec, matrix, tile_size=tile_size,
+                             workers=workers)
+            base = base or time
+            print(workers, dec.__name__, f'{time:.3f}', f'{base / time:.2f}',
+                  sep='\t')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))